@@ -0,0 +1,80 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+
+import numpy as np
+import torch
+
+from ultralytics.utils.metrics import ConfusionMatrix, box_iou
+
+
+def process_batch_loop(matrix, detections, gt_bboxes, gt_cls, nc, conf=0.25, iou_thres=0.45):
+    """ConfusionMatrix.process_batch() before the vectorized update, used as reference."""
+    if gt_cls.shape[0] == 0:
+        if detections is not None:
+            detections = detections[detections[:, 4] > conf]
+            for dc in detections[:, 5].int():
+                matrix[dc, nc] += 1  # false positives
+        return
+    if detections is None:
+        for gc in gt_cls.int():
+            matrix[nc, gc] += 1  # background FN
+        return
+
+    detections = detections[detections[:, 4] > conf]
+    gt_classes = gt_cls.int()
+    detection_classes = detections[:, 5].int()
+    iou = box_iou(gt_bboxes, detections[:, :4])
+    x = torch.where(iou > iou_thres)
+    if x[0].shape[0]:
+        matches = torch.cat((torch.stack(x, 1), iou[x[0], x[1]][:, None]), 1).cpu().numpy()
+        if x[0].shape[0] > 1:
+            matches = matches[matches[:, 2].argsort()[::-1]]
+            matches = matches[np.unique(matches[:, 1], return_index=True)[1]]
+            matches = matches[matches[:, 2].argsort()[::-1]]
+            matches = matches[np.unique(matches[:, 0], return_index=True)[1]]
+    else:
+        matches = np.zeros((0, 3))
+
+    n = matches.shape[0] > 0
+    m0, m1, _ = matches.transpose().astype(int)
+    for i, gc in enumerate(gt_classes):
+        j = m0 == i
+        if n and sum(j) == 1:
+            matrix[detection_classes[m1[j]], gc] += 1  # correct
+        else:
+            matrix[nc, gc] += 1  # true background
+    if n:
+        for i, dc in enumerate(detection_classes):
+            if not any(m1 == i):
+                matrix[dc, nc] += 1  # predicted background
+
+
+def random_boxes(rng, n, duplicates):
+    """Random xyxy boxes on a 100x100 grid of integer coordinates, with duplicated boxes if `duplicates`."""
+    xy = rng.integers(0, 80, (n, 2))
+    boxes = np.concatenate([xy, xy + rng.integers(5, 20, (n, 2))], 1).astype(np.float32)
+    if duplicates and n:
+        boxes[rng.integers(0, n, n // 2)] = boxes[rng.integers(0, n, n // 2)]
+    return torch.from_numpy(boxes)
+
+
+def test_confusion_matrix_process_batch():
+    """Test that the confusion matrix equals the per-gt and per-detection loop, including tied IoUs."""
+    rng = np.random.default_rng(0)
+    nc = 5
+    cm, matrix = ConfusionMatrix(nc=nc), np.zeros((nc + 1, nc + 1))
+    for k in range(1000):
+        m, n = rng.integers(0, 30), rng.integers(0, 60)
+        gt_bboxes, gt_cls = random_boxes(rng, m, k % 2), torch.from_numpy(rng.integers(0, nc, m)).float()
+        detections = torch.cat(
+            [
+                random_boxes(rng, n, k % 2),
+                torch.from_numpy(rng.random((n, 1), dtype=np.float32)),
+                torch.from_numpy(rng.integers(0, nc, (n, 1))).float(),
+            ],
+            1,
+        )
+        if k % 10 == 0:
+            detections = None
+        cm.process_batch(detections, gt_bboxes, gt_cls)
+        process_batch_loop(matrix, detections, gt_bboxes, gt_cls, nc)
+        assert np.array_equal(cm.matrix, matrix)
@@ -0,0 +1,33 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+
+import ast
+import subprocess
+import sys
+
+from ultralytics.nn.registry import BACKBONES, EXTRA_MODULES
+from ultralytics.utils import ROOT
+
+
+def exported_names(path):
+    """Return the `__all__` literal of a Python source file, or None if it does not define one."""
+    for node in ast.parse(path.read_text(encoding="utf-8")).body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "__all__" for t in node.targets):
+            return tuple(ast.literal_eval(node.value))
+
+
+def test_registry_tables():
+    """Test that the registry tables list exactly the `__all__` names of each extra module and backbone."""
+    for package, modules in (("extra_modules", EXTRA_MODULES), ("backbone", BACKBONES)):
+        for m, names in modules.items():
+            exported = exported_names(ROOT / "nn" / package / f"{m}.py")
+            assert exported is None or exported == names, f"{package}.{m}"
+
+
+def test_import_is_lazy():
+    """Test that importing ultralytics, the trainer and the exporter does not import extra modules, backbones or timm."""
+    code = (
+        "import sys, ultralytics, ultralytics.engine.exporter, ultralytics.engine.trainer\n"
+        "lazy = ('ultralytics.nn.extra_modules.', 'ultralytics.nn.backbone.', 'timm')\n"
+        "assert not [m for m in sys.modules if m.startswith(lazy)], [m for m in sys.modules if m.startswith(lazy)]"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)  # fresh interpreter, other tests may import them
@@ -0,0 +1,57 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+
+import numpy as np
+import torch
+
+from ultralytics.models.yolo.detect import DetectionValidator
+
+
+def match_predictions_loop(pred_classes, true_classes, iou, iouv):
+    """Greedy matching loop of BaseValidator.match_predictions() before the single pass, used as reference."""
+    correct = np.zeros((pred_classes.shape[0], iouv.shape[0])).astype(bool)
+    correct_class = true_classes[:, None] == pred_classes
+    iou = (iou * correct_class).cpu().numpy()
+    for i, threshold in enumerate(iouv.cpu().tolist()):
+        matches = np.nonzero(iou >= threshold)
+        matches = np.array(matches).T
+        if matches.shape[0]:
+            if matches.shape[0] > 1:
+                matches = matches[iou[matches[:, 0], matches[:, 1]].argsort()[::-1]]
+                matches = matches[np.unique(matches[:, 1], return_index=True)[1]]
+                matches = matches[np.unique(matches[:, 0], return_index=True)[1]]
+            correct[matches[:, 1].astype(int), i] = True
+    return torch.tensor(correct, dtype=torch.bool)
+
+
+def random_case(rng, tied):
+    """Random labels, detections and IoU matrix, with tied IoUs and duplicate labels if `tied`."""
+    n, d, nc = rng.integers(1, 30), rng.integers(1, 300), rng.integers(1, 100)
+    true_classes, pred_classes = rng.integers(0, nc, n), rng.integers(0, nc, d)
+    iou = rng.random((n, d), dtype=np.float32)
+    if tied:
+        iou = np.round(iou * 10) / 10  # few distinct values
+        dup = rng.integers(0, n, n // 2)  # duplicate labels share class and IoUs
+        iou[dup], true_classes[dup] = iou[dup[::-1]], true_classes[dup[::-1]]
+    return torch.from_numpy(pred_classes), torch.from_numpy(true_classes), torch.from_numpy(iou)
+
+
+def test_match_predictions_greedy(tmp_path):
+    """Test that greedy matching equals the per-threshold loop, with and without tied IoUs."""
+    validator = DetectionValidator(save_dir=tmp_path)
+    rng = np.random.default_rng(0)
+    for k in range(1000):
+        pred_classes, true_classes, iou = random_case(rng, tied=k % 2)
+        correct = validator.match_predictions(pred_classes, true_classes, iou)
+        assert torch.equal(correct, match_predictions_loop(pred_classes, true_classes, iou, validator.iouv))
+
+
+def test_match_predictions_identical_labels(tmp_path):
+    """Test greedy matching with identical ground truth boxes, where every detection has tied best labels."""
+    validator = DetectionValidator(save_dir=tmp_path)
+    rng = np.random.default_rng(1)
+    for _ in range(100):
+        d = rng.integers(1, 300)
+        iou = torch.from_numpy(rng.random((1, d), dtype=np.float32)).repeat(3, 1)
+        true_classes, pred_classes = torch.zeros(3, dtype=torch.long), torch.zeros(d, dtype=torch.long)
+        correct = validator.match_predictions(pred_classes, true_classes, iou)
+        assert torch.equal(correct, match_predictions_loop(pred_classes, true_classes, iou, validator.iouv))
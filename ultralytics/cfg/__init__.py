@@ -89,6 +89,7 @@ CLI_HELP_MSG = f"""
         yolo settings
         yolo copy-cfg
         yolo cfg
+        yolo tune-runtime model=yolov8n.pt imgsz=640
 
     Docs: https://docs.ultralytics.com
     Community: https://community.ultralytics.com
@@ -96,7 +97,7 @@ CLI_HELP_MSG = f"""
     """
 
 # Define keys for arg type checks
-CFG_FLOAT_KEYS = "warmup_epochs", "box", "cls", "dfl", "degrees", "shear", "time"
+CFG_FLOAT_KEYS = "warmup_epochs", "box", "cls", "dfl", "degrees", "shear", "time", "stream_max_age"
 CFG_FRACTION_KEYS = (
     "dropout",
     "iou",
@@ -121,6 +122,8 @@ CFG_FRACTION_KEYS = (
     "conf",
     "iou",
     "fraction",
+    "slice_overlap",
+    "int8_drop",
 )  # fraction floats 0.0 - 1.0
 CFG_INT_KEYS = (
     "epochs",
@@ -132,9 +135,16 @@ CFG_INT_KEYS = (
     "mask_ratio",
     "max_det",
     "vid_stride",
+    "pipeline_depth",
+    "ort_threads",
+    "ort_inter_threads",
+    "ort_sessions",
+    "int8_images",
+    "slice",
     "line_width",
     "workspace",
     "nbs",
+    "tal_chunk",
     "save_period",
 )
 CFG_BOOL_KEYS = (
@@ -151,6 +161,8 @@ CFG_BOOL_KEYS = (
     "save_hybrid",
     "half",
     "dnn",
+    "ort_parallel",
+    "ort_iobinding",
     "plots",
     "show",
     "save_txt",
@@ -162,6 +174,9 @@ CFG_BOOL_KEYS = (
     "visualize",
     "augment",
     "agnostic_nms",
+    "batch_nms",
+    "stream_metrics",
+    "pipeline",
     "retina_masks",
     "show_boxes",
     "keras",
@@ -170,6 +185,7 @@ CFG_BOOL_KEYS = (
     "dynamic",
     "simplify",
     "nms",
+    "end2end",
     "profile",
     "multi_scale",
 )
@@ -403,6 +419,33 @@ def handle_explorer():
     subprocess.run(["streamlit", "run", ROOT / "data/explorer/gui/dash.py", "--server.maxMessageSize", "2048"])
 
 
+def handle_yolo_tune_runtime(args: List[str]) -> None:
+    """
+    Handle the YOLO CPU runtime tuning command-line interface (CLI) command.
+
+    This function sweeps CPU inference batch sizes and thread counts for a model and saves the best configuration next
+    to its weights, see `ultralytics.utils.autobatch.autotune_runtime`.
+
+    Args:
+        args (List[str]): A list of 'key=value' arguments, i.e. model, imgsz, batch, threads, n and max_latency.
+
+    Example:
+        ```bash
+        yolo tune-runtime model=yolov8n.pt imgsz=640 batch=1,2,4,8 threads=1,2,4 max_latency=200
+        ```
+    """
+    from ultralytics.utils.autobatch import autotune_runtime
+
+    new = dict(parse_key_value_pair(a) for a in merge_equals_args(args))
+    check_dict_alignment(dict(model=0, imgsz=0, batch=0, threads=0, n=0, max_latency=0, save=0), new)
+    weights = new.pop("model", DEFAULT_CFG.model or "yolov8n.pt")
+    for k, name in (("batch", "batch_sizes"), ("threads", "threads")):
+        if k in new:
+            v = new.pop(k)
+            new[name] = (v,) if isinstance(v, int) else tuple(v)
+    autotune_runtime(weights, **new)
+
+
 def parse_key_value_pair(pair):
     """Parse one 'key=value' pair and return key and value."""
     k, v = pair.split("=", 1)  # split on first '=' sign
@@ -456,6 +499,7 @@ def entrypoint(debug=""):
         "login": lambda: handle_yolo_hub(args),
         "copy-cfg": copy_default_cfg,
         "explorer": lambda: handle_explorer(),
+        "tune-runtime": lambda: handle_yolo_tune_runtime(args[1:]),
     }
     full_args_dict = {**DEFAULT_CFG_DICT, **{k: None for k in TASKS}, **{k: None for k in MODES}, **special}
 
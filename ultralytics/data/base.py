@@ -14,8 +14,8 @@ import numpy as np
 import psutil
 from torch.utils.data import Dataset
 
-from ultralytics.utils import DEFAULT_CFG, LOCAL_RANK, LOGGER, NUM_THREADS, TQDM
-from .utils import HELP_URL, IMG_FORMATS
+from ultralytics.utils import DEFAULT_CFG, LOCAL_RANK, LOGGER, NUM_THREADS, TQDM, is_dir_writeable
+from .utils import HELP_URL, IMG_FORMATS, get_hash
 
 
 class BaseDataset(Dataset):
@@ -25,7 +25,8 @@ class BaseDataset(Dataset):
     Args:
         img_path (str): Path to the folder containing images.
         imgsz (int, optional): Image size. Defaults to 640.
-        cache (bool, optional): Cache images to RAM or disk during training. Defaults to False.
+        cache (bool | str, optional): Cache images to RAM ('ram' or True), disk ('disk') or a single memory-mapped file
+            shared by all dataloader workers ('mmap') during training. Defaults to False.
         augment (bool, optional): If True, data augmentation is applied. Defaults to True.
         hyp (dict, optional): Hyperparameters to apply data augmentation. Defaults to None.
         prefix (str, optional): Prefix to print in log messages. Defaults to ''.
@@ -43,6 +44,8 @@ class BaseDataset(Dataset):
         ni (int): Number of images in the dataset.
         ims (list): List of loaded images.
         npy_files (list): List of numpy file paths.
+        mmap_file (Path): Packed memory-mapped image cache file, if cache='mmap'.
+        mmap_index (np.ndarray): (offset, h, w, h0, w0) of every image in mmap_file, if cache='mmap'.
         transforms (callable): Image transformation function.
     """
 
@@ -91,6 +94,7 @@ class BaseDataset(Dataset):
             cache = False
         self.ims, self.im_hw0, self.im_hw = [None] * self.ni, [None] * self.ni, [None] * self.ni
         self.npy_files = [Path(f).with_suffix(".npy") for f in self.im_files]
+        self.mmap_file, self.mmap_index, self.mmap = None, None, None
         if cache:
             self.cache_images(cache)
 
@@ -146,7 +150,9 @@ class BaseDataset(Dataset):
         """Loads 1 image from dataset index 'i', returns (im, resized hw)."""
         im, f, fn = self.ims[i], self.im_files[i], self.npy_files[i]
         if im is None:  # not cached in RAM
-            if fn.exists():  # load npy
+            if self.mmap_index is not None:  # load from packed memory-mapped cache, already resized
+                im, (h0, w0) = self.load_mmap_image(i)
+            elif fn.exists():  # load npy
                 try:
                     im = np.load(fn)
                 except Exception as e:
@@ -158,13 +164,14 @@ class BaseDataset(Dataset):
             if im is None:
                 raise FileNotFoundError(f"Image Not Found {f}")
 
-            h0, w0 = im.shape[:2]  # orig hw
+            if self.mmap_index is None:
+                h0, w0 = im.shape[:2]  # orig hw
             if rect_mode:  # resize long side to imgsz while maintaining aspect ratio
                 r = self.imgsz / max(h0, w0)  # ratio
-                if r != 1:  # if sizes are not equal
-                    w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz))
+                w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz))
+                if im.shape[:2] != (h, w):  # if sizes are not equal
                     im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
-            elif not (h0 == w0 == self.imgsz):  # resize by stretching image to square imgsz
+            elif im.shape[:2] != (self.imgsz, self.imgsz):  # resize by stretching image to square imgsz
                 im = cv2.resize(im, (self.imgsz, self.imgsz), interpolation=cv2.INTER_LINEAR)
 
             # Add to buffer if training with augmentations
@@ -181,6 +188,8 @@ class BaseDataset(Dataset):
 
     def cache_images(self, cache):
         """Cache images to memory or disk."""
+        if cache == "mmap":
+            return self.cache_images_to_mmap()
         b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
         fcn = self.cache_images_to_disk if cache == "disk" else self.load_image
         with ThreadPool(NUM_THREADS) as pool:
@@ -201,6 +210,68 @@ class BaseDataset(Dataset):
         if not f.exists():
             np.save(f.as_posix(), cv2.imread(self.im_files[i]), allow_pickle=False)
 
+    def cache_images_to_mmap(self):
+        """
+        Cache resized images packed back to back into a single memory-mapped file with an offset/shape index.
+
+        The file is written once next to the image directory or image list file and is then only read, so all
+        dataloader workers share the same pages through the OS page cache instead of each holding a copy in RAM. The
+        index is keyed by image file and invalidated by get_hash() of the image files, like labels.cache. Images are
+        stored as returned by the load_image() of the dataset class, so it is part of the index too.
+        """
+        p = Path(self.img_path[0] if isinstance(self.img_path, list) else self.img_path)
+        path = p.parent / f"{p.stem}.{self.imgsz}.mmap"
+        index_path = path.with_suffix(".index.npy")
+        h = get_hash(sorted(self.im_files))
+        try:
+            index = np.load(index_path, allow_pickle=True).item()
+            assert index["hash"] == h and index["dataset"] == type(self).__name__
+            assert index["size"] == path.stat().st_size  # truncated or partially written
+        except (FileNotFoundError, AssertionError, AttributeError, KeyError, ValueError):
+            if not is_dir_writeable(path.parent):
+                LOGGER.warning(f"{self.prefix}WARNING ⚠️ Cache directory {path.parent} is not writeable, skipping")
+                return
+            index = self.write_mmap_cache(path, index_path, h)
+        rows = {f: j for j, f in enumerate(index["files"])}
+        self.mmap_index = index["index"][[rows[f] for f in self.im_files]]
+        self.mmap_file, self.mmap = path, None  # opened lazily in every process
+
+    def write_mmap_cache(self, path, index_path, h):
+        """Write the packed image file and its index for cache_images_to_mmap(), returns the index dictionary."""
+        b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
+        index = np.zeros((self.ni, 5), dtype=np.int64)  # offset, h, w, h0, w0
+        tmp = path.with_suffix(".mmap.tmp")
+        with open(tmp, "wb") as f, ThreadPool(NUM_THREADS) as pool:
+            results = pool.imap(self.load_image, range(self.ni))
+            pbar = TQDM(enumerate(results), total=self.ni, disable=LOCAL_RANK > 0)
+            for i, (im, hw0, hw) in pbar:
+                f.write(np.ascontiguousarray(im).tobytes())
+                index[i] = b, *hw, *hw0
+                b += im.nbytes
+                pbar.desc = f"{self.prefix}Caching images ({b / gb:.1f}GB mmap)"
+            pbar.close()
+        self.ims, self.im_hw0, self.im_hw = [None] * self.ni, [None] * self.ni, [None] * self.ni  # free buffer
+        self.buffer.clear()
+        tmp.replace(path)
+        x = dict(files=list(self.im_files), index=index, hash=h, dataset=type(self).__name__, size=b)
+        np.save(str(index_path), x)
+        LOGGER.info(f"{self.prefix}New cache created: {path}")
+        return x
+
+    def load_mmap_image(self, i):
+        """Returns image 'i' and its original hw from the packed memory-mapped cache."""
+        if self.mmap is None:
+            self.mmap = np.memmap(self.mmap_file, dtype=np.uint8, mode="r")
+        o, h, w, h0, w0 = self.mmap_index[i]
+        im = self.mmap[o : o + h * w * 3].reshape(h, w, 3)
+        return np.array(im), (int(h0), int(w0))  # copy, transforms may write to the image in place
+
+    def __getstate__(self):
+        """Drop the memory map when pickled, i.e. for spawned dataloader workers, each worker reopens it lazily."""
+        state = self.__dict__.copy()
+        state["mmap"] = None
+        return state
+
     def check_cache_ram(self, safety_margin=0.5):
         """Check image caching requirements vs available memory."""
         b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
@@ -150,7 +150,7 @@ def check_source(source):
     return source, webcam, screenshot, from_img, in_memory, tensor
 
 
-def load_inference_source(source=None, vid_stride=1, buffer=False):
+def load_inference_source(source=None, vid_stride=1, buffer=False, stream_policy=None, stream_max_age=0.5):
     """
     Loads an inference source for object detection and applies necessary transformations.
 
@@ -158,6 +158,8 @@ def load_inference_source(source=None, vid_stride=1, buffer=False):
         source (str, Path, Tensor, PIL.Image, np.ndarray): The input source for inference.
         vid_stride (int, optional): The frame interval for video sources. Default is 1.
         buffer (bool, optional): Determined whether stream frames will be buffered. Default is False.
+        stream_policy (str, optional): Stream scheduler frame policy, 'latest', 'fifo' or 'stale'. Default is None.
+        stream_max_age (float, optional): Maximum frame age in seconds for the 'stale' policy. Default is 0.5.
 
     Returns:
         dataset (Dataset): A dataset object for the specified input source.
@@ -171,7 +173,9 @@ def load_inference_source(source=None, vid_stride=1, buffer=False):
     elif in_memory:
         dataset = source
     elif webcam:
-        dataset = LoadStreams(source, vid_stride=vid_stride, buffer=buffer)
+        dataset = LoadStreams(
+            source, vid_stride=vid_stride, buffer=buffer, policy=stream_policy, max_age=stream_max_age
+        )
     elif screenshot:
         dataset = LoadScreenshots(source)
     elif from_img:
@@ -1,6 +1,7 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 import contextlib
 from itertools import repeat
+from multiprocessing import current_process, get_context
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
 
@@ -10,14 +11,23 @@ import torch
 import torchvision
 from PIL import Image
 
-from ultralytics.utils import LOCAL_RANK, NUM_THREADS, TQDM, colorstr, is_dir_writeable
+from ultralytics.utils import LINUX, LOCAL_RANK, NUM_THREADS, TQDM, colorstr, is_dir_writeable
 from ultralytics.utils.ops import resample_segments
 from .augment import Compose, Format, Instances, LetterBox, classify_augmentations, classify_transforms, v8_transforms
 from .base import BaseDataset
-from .utils import HELP_URL, LOGGER, get_hash, img2label_paths, verify_image, verify_image_label
+from .utils import (
+    HELP_URL,
+    LOGGER,
+    get_file_fingerprint,
+    get_hash,
+    img2label_paths,
+    verify_image,
+    verify_image_label,
+)
 
 # Ultralytics dataset *.cache version, >= 1.0.0 for YOLOv8
-DATASET_CACHE_VERSION = "1.0.3"
+DATASET_CACHE_VERSION = "1.0.4"
+MIN_PROCESS_POOL_FILES = 1000  # verify at least this many files in a process pool instead of a thread pool
 
 
 class YOLODataset(BaseDataset):
@@ -41,17 +51,22 @@ class YOLODataset(BaseDataset):
         assert not (self.use_segments and self.use_keypoints), "Can not use both segments and keypoints."
         super().__init__(*args, **kwargs)
 
-    def cache_labels(self, path=Path("./labels.cache")):
+    def cache_labels(self, path=Path("./labels.cache"), previous=None):
         """
         Cache dataset labels, check images and read shapes.
 
+        Every image-label pair is stored with a (size, mtime) fingerprint of both files, so that only new or changed
+        pairs are verified again when a previous cache is given. Large scans are verified in a forked process pool, as
+        PIL decoding and EXIF checks hold the GIL (fork only, spawned workers would re-run unguarded user scripts).
+
         Args:
             path (Path): Path where to save the cache file. Default is Path('./labels.cache').
+            previous (dict, optional): Previously cached labels to reuse unchanged entries from. Default is None.
 
         Returns:
             (dict): labels.
         """
-        x = {"labels": []}
+        x = {"labels": [], "files": {}}
         nm, nf, ne, nc, msgs = 0, 0, 0, 0, []  # number missing, found, empty, corrupt, messages
         desc = f"{self.prefix}Scanning {path.parent / path.stem}..."
         total = len(self.im_files)
@@ -61,28 +76,38 @@ class YOLODataset(BaseDataset):
                 "'kpt_shape' in data.yaml missing or incorrect. Should be a list with [number of "
                 "keypoints, number of dims (2 for x,y or 3 for x,y,visible)], i.e. 'kpt_shape: [17, 3]'"
             )
-        with ThreadPool(NUM_THREADS) as pool:
-            results = pool.imap(
+        cached = previous["files"] if previous else {}
+        fingerprints = [self.get_fingerprint(f, lb) for f, lb in zip(self.im_files, self.label_files)]
+        todo = [i for i, (f, fp) in enumerate(zip(self.im_files, fingerprints)) if cached.get(f, (None,))[0] != fp]
+        if len(todo) < total:
+            desc = f"{desc} {total - len(todo)} unchanged,"
+        use_processes = LINUX and len(todo) >= MIN_PROCESS_POOL_FILES and not current_process().daemon
+        with (get_context("fork").Pool if use_processes else ThreadPool)(NUM_THREADS) as pool:
+            verified = pool.imap(
                 func=verify_image_label,
-                iterable=zip(
-                    self.im_files,
-                    self.label_files,
-                    repeat(self.prefix),
-                    repeat(self.use_keypoints),
-                    repeat(len(self.data["names"])),
-                    repeat(nkpt),
-                    repeat(ndim),
+                iterable=(
+                    (
+                        self.im_files[i],
+                        self.label_files[i],
+                        self.prefix,
+                        self.use_keypoints,
+                        len(self.data["names"]),
+                        nkpt,
+                        ndim,
+                    )
+                    for i in todo
                 ),
+                chunksize=64 if use_processes else 1,
             )
+            todo = set(todo)
+            results = (next(verified) if i in todo else cached[f][1] for i, f in enumerate(self.im_files))
             pbar = TQDM(results, desc=desc, total=total)
-            for im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg in pbar:
-                nm += nm_f
-                nf += nf_f
-                ne += ne_f
-                nc += nc_f
-                if im_file:
-                    x["labels"].append(
-                        dict(
+            for f, fp, result in zip(self.im_files, fingerprints, pbar):
+                if len(result) == 10:  # verified, convert to cached (counts, msg, label) entry
+                    im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg = result
+                    label = None
+                    if im_file:
+                        label = dict(
                             im_file=im_file,
                             shape=shape,
                             cls=lb[:, 0:1],  # n, 1
@@ -92,7 +117,15 @@ class YOLODataset(BaseDataset):
                             normalized=True,
                             bbox_format="xywh",
                         )
-                    )
+                    result = (nm_f, nf_f, ne_f, nc_f), msg, label
+                (nm_f, nf_f, ne_f, nc_f), msg, label = result
+                x["files"][f] = fp, result
+                nm += nm_f
+                nf += nf_f
+                ne += ne_f
+                nc += nc_f
+                if label:
+                    x["labels"].append(label)
                 if msg:
                     msgs.append(msg)
                 pbar.desc = f"{desc} {nf} images, {nm + ne} backgrounds, {nc} corrupt"
@@ -102,22 +135,32 @@ class YOLODataset(BaseDataset):
             LOGGER.info("\n".join(msgs))
         if nf == 0:
             LOGGER.warning(f"{self.prefix}WARNING ⚠️ No labels found in {path}. {HELP_URL}")
-        x["hash"] = get_hash(self.label_files + self.im_files)
         x["results"] = nf, nm, ne, nc, len(self.im_files)
         x["msgs"] = msgs  # warnings
         save_dataset_cache_file(self.prefix, path, x)
         return x
 
+    @staticmethod
+    def get_fingerprint(im_file, lb_file):
+        """Returns the fingerprint of an image-label pair used to detect new or changed files in the labels cache."""
+        return get_file_fingerprint(im_file), get_file_fingerprint(lb_file)
+
     def get_labels(self):
         """Returns dictionary of labels for YOLO training."""
         self.label_files = img2label_paths(self.im_files)
         cache_path = Path(self.label_files[0]).parent.with_suffix(".cache")
+        previous = None
         try:
             cache, exists = load_dataset_cache_file(cache_path), True  # attempt to load a *.cache file
             assert cache["version"] == DATASET_CACHE_VERSION  # matches current version
-            assert cache["hash"] == get_hash(self.label_files + self.im_files)  # identical hash
+            previous = cache
+            assert len(cache["files"]) == len(self.im_files)  # identical files and fingerprints
+            assert all(
+                cache["files"].get(f, (None,))[0] == self.get_fingerprint(f, lb)
+                for f, lb in zip(self.im_files, self.label_files)
+            )
         except (FileNotFoundError, AssertionError, AttributeError):
-            cache, exists = self.cache_labels(cache_path), False  # run cache ops
+            cache, exists = self.cache_labels(cache_path, previous), False  # verify new or changed files only
 
         # Display cache
         nf, nm, ne, nc, n = cache.pop("results")  # found, missing, empty, corrupt, total
@@ -128,7 +171,7 @@ class YOLODataset(BaseDataset):
                 LOGGER.info("\n".join(cache["msgs"]))  # display warnings
 
         # Read cache
-        [cache.pop(k) for k in ("hash", "version", "msgs")]  # remove items
+        [cache.pop(k) for k in ("files", "version", "msgs")]  # remove items
         labels = cache["labels"]
         if not labels:
             LOGGER.warning(f"WARNING ⚠️ No images found in {cache_path}, training may not work correctly. {HELP_URL}")
@@ -247,12 +290,16 @@ class ClassificationDataset(torchvision.datasets.ImageFolder):
             root (str): Dataset path.
             args (Namespace): Argument parser containing dataset related settings.
             augment (bool, optional): True if dataset should be augmented, False otherwise. Defaults to False.
-            cache (bool | str | optional): Cache setting, can be True, False, 'ram' or 'disk'. Defaults to False.
+            cache (bool | str | optional): Cache setting, can be True, False, 'ram', 'disk' or 'mmap', which falls back
+                to 'disk'. Defaults to False.
         """
         super().__init__(root=root)
         if augment and args.fraction < 1.0:  # reduce training fraction
             self.samples = self.samples[: round(len(self.samples) * args.fraction)]
         self.prefix = colorstr(f"{prefix}: ") if prefix else ""
+        if cache == "mmap":  # packed cache of resized images, classification transforms need the originals
+            LOGGER.warning(f"{self.prefix}WARNING ⚠️ cache='mmap' not supported for classification, using cache='disk'")
+            cache = "disk"
         self.cache_ram = cache is True or cache == "ram"
         self.cache_disk = cache == "disk"
         self.samples = self.verify_images()  # filter out bad images
@@ -6,7 +6,7 @@ import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from threading import Thread
+from threading import Condition, Thread
 from urllib.parse import urlparse
 
 import cv2
@@ -40,6 +40,9 @@ class LoadStreams:
         sources (str): The source input paths or URLs for the video streams.
         vid_stride (int): Video frame-rate stride, defaults to 1.
         buffer (bool): Whether to buffer input streams, defaults to False.
+        policy (str, optional): Frame policy of the stream scheduler, 'latest', 'fifo' or 'stale'. If None (default)
+            every batch waits for one frame of each stream, otherwise batches are built from the streams that are ready.
+        max_age (float): Maximum frame age in seconds for the 'stale' policy, older frames are dropped.
         running (bool): Flag to indicate if the streaming thread is running.
         mode (str): Set to 'stream' indicating real-time capture.
         imgs (list): List of image frames for each stream.
@@ -48,24 +51,34 @@ class LoadStreams:
         threads (list): List of threads for each stream.
         shape (list): List of shapes for each stream.
         caps (list): List of cv2.VideoCapture objects for each stream.
+        timestamps (list): List of capture times for the buffered frames of each stream (stream scheduler only).
+        stats (list): Per stream counters of captured, dropped and emitted frames, reconnects and the mean and max
+            end-to-end latency in ms (stream scheduler only).
         bs (int): Batch size for processing.
 
     Methods:
         __init__: Initialize the stream loader.
         update: Read stream frames in daemon thread.
+        update_scheduled: Read stream frames in daemon thread for the stream scheduler, reconnecting in the background.
+        batch_streams: Return the stream indices of an emitted batch.
+        record_latency: Update the end-to-end latency counters of an emitted batch.
         close: Close stream loader and release resources.
         __iter__: Returns an iterator object for the class.
         __next__: Returns source paths, transformed, and original images for processing.
         __len__: Return the length of the sources object.
     """
 
-    def __init__(self, sources="file.streams", vid_stride=1, buffer=False):
+    def __init__(self, sources="file.streams", vid_stride=1, buffer=False, policy=None, max_age=0.5):
         """Initialize instance variables and check for consistent input stream shapes."""
         torch.backends.cudnn.benchmark = True  # faster for fixed-size inference
+        assert policy in {None, "latest", "fifo", "stale"}, f"Invalid stream policy '{policy}'"
         self.buffer = buffer  # buffer input streams
+        self.policy = policy  # stream scheduler frame policy
+        self.max_age = max_age  # seconds, 'stale' policy
         self.running = True  # running flag for Thread
         self.mode = "stream"
         self.vid_stride = vid_stride  # video frame-rate stride
+        self.lock = Condition()  # guards frame buffers, notified on new frames and on close (stream scheduler)
 
         sources = Path(sources).read_text().rsplit() if os.path.isfile(sources) else [sources]
         n = len(sources)
@@ -75,6 +88,11 @@ class LoadStreams:
         self.caps = [None] * n  # video capture objects
         self.imgs = [[] for _ in range(n)]  # images
         self.shape = [[] for _ in range(n)]  # image shapes
+        self.timestamps = [[] for _ in range(n)]  # capture times
+        self.stats = [
+            dict(captured=0, dropped=0, emitted=0, reconnects=0, latency=0.0, latency_max=0.0) for _ in range(n)
+        ]
+        self.meta = {}  # batch count: (stream indices, capture times) of the last emitted batches
         self.sources = [ops.clean_str(x) for x in sources]  # clean source names for later
         for i, s in enumerate(sources):  # index, source
             # Start thread to read frames from video stream
@@ -103,8 +121,10 @@ class LoadStreams:
             if not success or im is None:
                 raise ConnectionError(f"{st}Failed to read images from {s}")
             self.imgs[i].append(im)
+            self.timestamps[i].append(time.time())
             self.shape[i] = im.shape
-            self.threads[i] = Thread(target=self.update, args=([i, self.caps[i], s]), daemon=True)
+            update = self.update if policy is None else self.update_scheduled
+            self.threads[i] = Thread(target=update, args=([i, self.caps[i], s]), daemon=True)
             LOGGER.info(f"{st}Success ✅ ({self.frames[i]} frames of shape {w}x{h} at {self.fps[i]:.2f} FPS)")
             self.threads[i].start()
         LOGGER.info("")  # newline
@@ -132,9 +152,79 @@ class LoadStreams:
             else:
                 time.sleep(0.01)  # wait until the buffer is empty
 
+    def update_scheduled(self, i, cap, stream):
+        """
+        Read stream `i` frames in daemon thread for the stream scheduler.
+
+        Frames are stored with their capture time according to the frame policy: 'latest' and 'stale' keep only the
+        newest frame, 'fifo' keeps up to 30 frames and drops the oldest one when full. A stream that stops delivering
+        frames is re-opened with exponential backoff in this thread, so the other streams keep being batched meanwhile.
+        """
+        n, f, backoff = 0, self.frames[i], 0.5  # frame number, frame count, reconnect delay in seconds
+        while self.running and n < (f - 1):
+            if not cap.isOpened() or not cap.grab():
+                if math.isfinite(f):  # end of a video file
+                    break
+                LOGGER.warning(f"WARNING ⚠️ Stream {i} unresponsive, reconnecting in {backoff:.1f}s...")
+                cap.release()
+                with self.lock:
+                    self.lock.wait(backoff)  # returns early on close()
+                    self.stats[i]["reconnects"] += 1
+                cap.open(stream)
+                backoff = min(backoff * 2, 10.0)
+                continue
+            n += 1
+            if n % self.vid_stride:
+                continue
+            success, im = cap.retrieve()
+            if not success:
+                continue
+            backoff, t = 0.5, time.time()
+            with self.lock:
+                imgs, timestamps, stats = self.imgs[i], self.timestamps[i], self.stats[i]
+                if self.policy == "fifo":
+                    if len(imgs) >= 30:  # keep a <=30-image buffer
+                        del imgs[0], timestamps[0]
+                        stats["dropped"] += 1
+                else:  # 'latest' and 'stale' keep the newest frame only
+                    stats["dropped"] += len(imgs)
+                    imgs.clear()
+                    timestamps.clear()
+                imgs.append(im)
+                timestamps.append(t)
+                stats["captured"] += 1
+                self.lock.notify_all()
+
+    def batch_streams(self, count):
+        """Return the stream indices of the frames in emitted batch `count`, or None without the stream scheduler."""
+        meta = self.meta.get(count)
+        return meta[0] if meta else None
+
+    def record_latency(self, count):
+        """
+        Update the per stream end-to-end latency counters once the results of emitted batch `count` are written.
+
+        Returns:
+            (list | None): Capture to result latency in ms of every frame of the batch, or None without the scheduler.
+        """
+        meta = self.meta.get(count)  # kept, callbacks after the results are written still map batches to streams
+        if meta is None:
+            return None
+        now, latency = time.time(), []
+        for i, t in zip(*meta):
+            ms = (now - t) * 1e3
+            stats = self.stats[i]
+            stats["emitted"] += 1
+            stats["latency"] += (ms - stats["latency"]) / stats["emitted"]  # running mean
+            stats["latency_max"] = max(stats["latency_max"], ms)
+            latency.append(ms)
+        return latency
+
     def close(self):
         """Close stream loader and release resources."""
         self.running = False  # stop flag for Thread
+        with self.lock:
+            self.lock.notify_all()  # wake threads waiting to reconnect
         for thread in self.threads:
             if thread.is_alive():
                 thread.join(timeout=5)  # Add timeout
@@ -153,6 +243,8 @@ class LoadStreams:
     def __next__(self):
         """Returns source paths, transformed and original images for processing."""
         self.count += 1
+        if self.policy is not None:
+            return self.next_scheduled()
 
         images = []
         for i, x in enumerate(self.imgs):
@@ -177,6 +269,33 @@ class LoadStreams:
 
         return self.sources, images, None, ""
 
+    def next_scheduled(self):
+        """Returns a batch of the streams that have a frame ready, waiting only until at least one stream is ready."""
+        with self.lock:
+            while True:
+                if self.policy == "stale":  # drop frames older than max_age
+                    oldest = time.time() - self.max_age
+                    for imgs, timestamps, stats in zip(self.imgs, self.timestamps, self.stats):
+                        while timestamps and timestamps[0] < oldest:
+                            del imgs[0], timestamps[0]
+                            stats["dropped"] += 1
+                ready = [i for i, x in enumerate(self.imgs) if x]
+                if ready or not any(x.is_alive() for x in self.threads):
+                    break
+                self.lock.wait(timeout=1.0)  # notified on new frames
+            images, timestamps = [], []
+            for i in ready:  # oldest buffered frame first for 'fifo', the single newest frame otherwise
+                images.append(self.imgs[i].pop(0))
+                timestamps.append(self.timestamps[i].pop(0))
+
+        if not ready:  # all streams ended
+            self.close()
+            raise StopIteration
+        self.meta[self.count] = ready, timestamps
+        if len(self.meta) > 256:  # keep the last 256 batches, the pipelined predictor writes results behind the source
+            self.meta.pop(next(iter(self.meta)))
+        return [self.sources[i] for i in ready], images, None, ""
+
     def __len__(self):
         """Return the length of the sources object."""
         return len(self.sources)  # 1E12 frames = 32 streams at 30 FPS for 30 years
@@ -13,9 +13,6 @@ from tqdm import tqdm
 from ultralytics.data.utils import exif_size, img2label_paths
 from ultralytics.utils.checks import check_requirements
 
-check_requirements("shapely")
-from shapely.geometry import Polygon
-
 
 def bbox_iof(polygon1, bbox2, eps=1e-6):
     """
@@ -25,6 +22,9 @@ def bbox_iof(polygon1, bbox2, eps=1e-6):
         polygon1 (np.ndarray): Polygon coordinates, (n, 8).
         bbox2 (np.ndarray): Bounding boxes, (n ,4).
     """
+    check_requirements("shapely")  # scoped so that get_windows() can be imported without shapely
+    from shapely.geometry import Polygon
+
     polygon1 = polygon1.reshape(-1, 4, 2)
     lt_point = np.min(polygon1, axis=-2)
     rb_point = np.max(polygon1, axis=-2)
@@ -54,6 +54,15 @@ def get_hash(paths):
     return h.hexdigest()  # return hash
 
 
+def get_file_fingerprint(path):
+    """Returns the (size, mtime_ns) fingerprint of a file, or None if it does not exist."""
+    try:
+        s = os.stat(path)
+    except OSError:
+        return None
+    return s.st_size, s.st_mtime_ns
+
+
 def exif_size(img: Image.Image):
     """Returns exif-corrected PIL size."""
     s = img.size  # (width, height)
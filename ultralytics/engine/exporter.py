@@ -65,9 +65,8 @@ from ultralytics.cfg import get_cfg
 from ultralytics.data.dataset import YOLODataset
 from ultralytics.data.utils import check_det_dataset
 from ultralytics.nn.autobackend import check_class_names, default_class_names
-from ultralytics.nn.modules import C2f, Detect, RTDETRDecoder
-from ultralytics.nn.extra_modules.head import Detect_NMSFree
-from ultralytics.nn.tasks import DetectionModel, SegmentationModel
+from ultralytics.nn.modules import C2f, Detect, DFL, RTDETRDecoder
+from ultralytics.nn.tasks import MODULES, DetectionModel, SegmentationModel
 from ultralytics.utils import (
     ARM64,
     DEFAULT_CFG,
@@ -198,6 +197,14 @@ class Exporter:
         if self.args.optimize:
             assert not ncnn, "optimize=True not compatible with format='ncnn', i.e. use optimize=False"
             assert self.device.type == "cpu", "optimize=True not compatible with cuda devices, i.e. use device='cpu'"
+        if self.args.int8 and fmt in ("torchscript", "onnx"):
+            assert not self.args.half, "int8=True not compatible with half=True, i.e. use only one."
+            assert not self.args.optimize, "int8=True not compatible with optimize=True, i.e. use only one."
+            assert model.task != "classify", "ONNX/TorchScript INT8 calibration not supported for task='classify'"
+        if self.args.end2end:
+            assert onnx, "end2end=True only compatible with format='onnx', i.e. use end2end=False"
+            assert model.task in ("detect", "nmsfree"), f"end2end=True not supported for task='{model.task}'"
+            assert not self.args.opset or self.args.opset >= 11, "end2end=True requires opset>=11 for NonMaxSuppression"
         if edgetpu and not LINUX:
             raise SystemError("Edge TPU export only supported on Linux. See https://coral.ai/docs/edgetpu/compiler/")
 
@@ -221,7 +228,7 @@ class Exporter:
                 m.dynamic = self.args.dynamic
                 m.export = True
                 m.format = self.args.format
-                if isinstance(m, (Detect_NMSFree,)):
+                if isinstance(m, MODULES.peek("Detect_NMSFree")):  # only imported if the model uses it
                     m.max_det = self.args.max_det
             elif isinstance(m, C2f) and not any((saved_model, pb, tflite, edgetpu, tfjs)):
                 # EdgeTPU does not support FlexSplitV while split provides cleaner ONNX graph
@@ -264,6 +271,15 @@ class Exporter:
         }  # model metadata
         if model.task == "pose":
             self.metadata["kpt_shape"] = model.model[-1].kpt_shape
+        if self.args.dynamic and (onnx or xml):  # TensorRT profiles fix height and width, only the batch is dynamic
+            self.metadata["dynamic"] = True  # batch, height and width axes, i.e. batched and rect validation
+        if self.args.end2end:  # uint8 input, (batch, max_det, 6) xyxy, conf, cls output after NMS with these settings
+            self.metadata["end2end"] = {
+                "conf": 0.25 if self.args.conf is None else self.args.conf,
+                "iou": None if model.task == "nmsfree" else self.args.iou,  # one-to-one heads skip NMS
+                "max_det": self.args.max_det,
+                "agnostic_nms": self.args.agnostic_nms,
+            }
 
         LOGGER.info(
             f"\n{colorstr('PyTorch:')} starting from '{file}' with input shape {tuple(im.shape)} BCHW and "
@@ -331,6 +347,13 @@ class Exporter:
 
         ts = torch.jit.trace(self.model, self.im, strict=False)
         extra_files = {"config.txt": json.dumps(self.metadata)}  # torch._C.ExtraFilesMap()
+        if self.args.int8 and self.args.format.lower() == "torchscript":  # FP32 model kept for the accuracy check
+            ts.save(str(f), _extra_files=extra_files)
+            fq = self.file.with_name(f"{self.file.stem}_int8.torchscript")
+            ts = torch.jit.trace(self._quantize_fx(prefix), self.im.cpu(), strict=False)
+            ts.save(str(fq), _extra_files=extra_files)
+            self._int8_check(f, fq, prefix)
+            return fq, None
         if self.args.optimize:  # https://pytorch.org/tutorials/recipes/mobile_interpreter.html
             LOGGER.info(f"{prefix} optimizing for mobile...")
             from torch.utils.mobile_optimizer import optimize_for_mobile
@@ -350,6 +373,8 @@ class Exporter:
         import onnx  # noqa
 
         opset_version = self.args.opset or get_latest_opset()
+        if self.args.end2end:
+            opset_version = max(opset_version, 11)  # NonMaxSuppression and ScatterND require opset>=11
         LOGGER.info(f"\n{prefix} starting export with onnx {onnx.__version__} opset {opset_version}...")
         f = str(self.file.with_suffix(".onnx"))
 
@@ -362,10 +387,16 @@ class Exporter:
                 dynamic["output1"] = {0: "batch", 2: "mask_height", 3: "mask_width"}  # shape(1,32,160,160)
             elif isinstance(self.model, DetectionModel):
                 dynamic["output0"] = {0: "batch", 2: "anchors"}  # shape(1, 84, 8400)
+            if self.args.end2end:
+                dynamic["output0"] = {0: "batch"}  # shape(1, 300, 6)
 
+        model, im = self.model, self.im
+        if self.args.end2end:
+            model, im = NMSModel(self.model, self.args), self.im.to(torch.uint8)
+            LOGGER.info(f"{prefix} embedding uint8 input normalization and NMS with conf={model.conf}...")
         torch.onnx.export(
-            self.model.cpu() if dynamic else self.model,  # dynamic=True only compatible with cpu
-            self.im.cpu() if dynamic else self.im,
+            model.cpu() if dynamic else model,  # dynamic=True only compatible with cpu
+            im.cpu() if dynamic else im,
             f,
             verbose=False,
             opset_version=opset_version,
@@ -397,6 +428,10 @@ class Exporter:
             meta.key, meta.value = k, str(v)
 
         onnx.save(model_onnx, f)
+        if self.args.int8 and self.args.format.lower() == "onnx":  # FP32 model kept for the accuracy check
+            fq = self._quantize_onnx(f, prefix)
+            self._int8_check(f, fq, prefix)
+            return fq, None
         return f, model_onnx
 
     @try_export
@@ -1072,6 +1107,177 @@ class Exporter:
         LOGGER.info(f"{prefix} pipeline success")
         return model
 
+    def _int8_excluded(self, root="model"):
+        """Return the names of the DFL and final output convs of the head, which INT8 quantization keeps in FP32."""
+        modules = dict(self.model.model[-1].named_modules(prefix=f"{root}.{len(self.model.model) - 1}"))
+        excluded = []
+        for name, m in modules.items():
+            if isinstance(m, torch.nn.Conv2d) and "." in name:
+                parent = modules.get(name.rsplit(".", 1)[0])
+                if isinstance(parent, DFL) or getattr(parent, "conv", None) is not m:  # not the conv of a Conv block
+                    excluded.append(name)
+        return excluded
+
+    def _int8_calibration(self, prefix):
+        """Return uint8 INT8 calibration batches shaped like self.im, letterboxed from the 'data' train images."""
+        from ultralytics.data.augment import LetterBox
+
+        if not self.args.data:
+            self.args.data = DEFAULT_CFG.data or "coco128.yaml"
+            LOGGER.warning(
+                f"{prefix} WARNING ⚠️ INT8 export requires a missing 'data' arg for calibration. "
+                f"Using default 'data={self.args.data}'."
+            )
+        data = check_det_dataset(self.args.data)
+        dataset = YOLODataset(data.get("train") or data["val"], data=data, imgsz=max(self.imgsz), augment=False)
+        n = min(self.args.int8_images, len(dataset))
+        if n < 300:
+            LOGGER.warning(f"{prefix} WARNING ⚠️ >300 images recommended for INT8 calibration, using {n} images.")
+        LOGGER.info(f"{prefix} collecting {n} INT8 calibration images from 'data={self.args.data}'...")
+        letterbox = LetterBox(self.imgsz, auto=False)
+        images = []
+        for i in np.linspace(0, len(dataset) - 1, n).round().astype(int):  # spread over the whole split
+            im = letterbox(image=dataset.load_image(i)[0])[..., ::-1].transpose(2, 0, 1)  # HWC BGR to CHW RGB
+            images.append(torch.from_numpy(np.ascontiguousarray(im)))
+        b = self.im.shape[0]
+        assert n >= b, f"INT8 calibration requires at least batch={b} images, found {n}"
+        return [torch.stack(images[i : i + b]) for i in range(0, n - b + 1, b)]
+
+    def _quantize_onnx(self, f, prefix):
+        """Statically quantize the ONNX model 'f' to INT8 QDQ format with ONNX Runtime and return its path."""
+        check_requirements("onnxruntime")
+        import onnx  # noqa
+        from onnxruntime.quantization import (
+            CalibrationDataReader,
+            CalibrationMethod,
+            QuantFormat,
+            QuantType,
+            quantize_static,
+        )
+
+        fq = str(self.file.with_name(f"{self.file.stem}_int8.onnx"))
+        batches = self._int8_calibration(prefix)
+        uint8 = self.args.end2end  # end2end graphs normalize their uint8 input
+
+        class DataReader(CalibrationDataReader):
+            """Feed the calibration batches to the ONNX Runtime calibrator."""
+
+            def __init__(self):
+                """Initialize the reader with an iterator over the calibration batches."""
+                self.batches = iter(batches)
+
+            def get_next(self):
+                """Return the next input feed, or None when exhausted."""
+                x = next(self.batches, None)
+                return None if x is None else {"images": (x if uint8 else x.float() / 255).numpy()}
+
+        model_onnx = onnx.load(f)
+        root = "model.model" if self.args.end2end else "model"  # NMSModel wraps the exported model
+        weights = {f"{name}.weight" for name in self._int8_excluded(root)}
+        exclude = [x.name for x in model_onnx.graph.node if x.op_type == "Conv" and set(x.input) & weights]
+        if len(exclude) < len(weights):
+            raise RuntimeError(f"INT8 export found only {len(exclude)}/{len(weights)} head convs to keep in FP32")
+        LOGGER.info(f"{prefix} quantizing to INT8 QDQ with onnxruntime, keeping {len(exclude)} head convs in FP32...")
+        quantize_static(
+            f,
+            fq,
+            DataReader(),
+            quant_format=QuantFormat.QDQ,
+            op_types_to_quantize=["Conv", "MatMul"],  # box decoding and the output Concat stay in FP32
+            per_channel=True,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            nodes_to_exclude=exclude,
+            calibrate_method=CalibrationMethod.MinMax,
+        )
+
+        # Metadata
+        model_onnx = onnx.load(fq)
+        if not model_onnx.metadata_props:
+            for k, v in self.metadata.items():
+                meta = model_onnx.metadata_props.add()
+                meta.key, meta.value = k, str(v)
+            onnx.save(model_onnx, fq)
+        return fq
+
+    def _quantize_fx(self, prefix):
+        """
+        Return an INT8 copy of self.model from PyTorch FX post-training static quantization.
+
+        Every submodule that FX can trace is quantized on its own, modules with data-dependent control flow such as the
+        head are descended into, and the DFL and final output convs of the head are kept in FP32.
+        """
+        from torch.ao.quantization import get_default_qconfig_mapping
+        from torch.ao.quantization.fx.custom_config import ConvertCustomConfig, PrepareCustomConfig
+        from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+        engine = "x86" if "x86" in torch.backends.quantized.supported_engines else "fbgemm"
+        torch.backends.quantized.engine = engine
+        qconfig_mapping = get_default_qconfig_mapping(engine)
+        excluded = self._int8_excluded()
+        model = deepcopy(self.model).cpu()
+
+        # Record the example input of every module
+        inputs = {}
+        hooks = [m.register_forward_pre_hook(lambda m, x: inputs.setdefault(m, x) and None) for m in model.modules()]
+        model(self.im.cpu())
+        for h in hooks:
+            h.remove()
+
+        def prepare(module, name=""):
+            """Replace the traceable children of module with prepared modules observing their activations."""
+            for k, m in module.named_children():
+                path = f"{name}.{k}" if name else k
+                if path in excluded or not any(isinstance(x, torch.nn.Conv2d) for x in m.modules()):
+                    continue
+                if m in inputs and not any(x.startswith(f"{path}.") for x in excluded):
+                    m = TraceableModule(m)
+                    attrs = [x for x in ("f", "i", "type", "np") if hasattr(m, x)]
+                    config = PrepareCustomConfig().set_preserved_attributes(attrs)
+                    try:
+                        setattr(module, k, prepare_fx(m, qconfig_mapping, inputs[m.m], prepare_custom_config=config))
+                        prepared.append((module, k, attrs))
+                        continue
+                    except Exception:  # i.e. torch.fx.proxy.TraceError
+                        pass
+                prepare(getattr(module, k), path)
+
+        prepared = []
+        prepare(model)
+        LOGGER.info(f"{prefix} quantizing {len(prepared)} submodules to INT8 with torch.fx ({engine})...")
+        for x in self._int8_calibration(prefix):
+            model(x.float() / 255)
+        for module, k, attrs in prepared:
+            config = ConvertCustomConfig().set_preserved_attributes(attrs)
+            setattr(module, k, convert_fx(getattr(module, k), convert_custom_config=config))
+        return model
+
+    def _int8_check(self, f, fq, prefix):
+        """Validate FP32 'f' and INT8 'fq' on 'data', log the metric loss and latency gain and fail on a large drop."""
+        from ultralytics import YOLO
+        from ultralytics.cfg import TASK2METRIC
+
+        if self.imgsz[0] != self.imgsz[1]:
+            LOGGER.warning(f"{prefix} WARNING ⚠️ INT8 accuracy check requires square images, skipping it")
+            return
+        key, y = TASK2METRIC[self.model.task], []
+        for file in f, fq:
+            results = YOLO(file, task=self.model.task).val(
+                data=self.args.data, imgsz=self.imgsz[0], batch=1, device="cpu", plots=False, verbose=False
+            )  # CPU for both, FX quantized TorchScript only runs on CPU and latencies must be comparable
+            y.append((results.results_dict[key], results.speed["inference"], file_size(file)))
+        (m, t, s), (mq, tq, sq) = y
+        drop = m - mq
+        LOGGER.info(
+            f"{prefix} INT8 report on 'data={self.args.data}'\n"
+            f"{'':>6}{key:>22}{'inference (ms/im)':>20}{'size (MB)':>12}\n"
+            f"{'FP32':>6}{m:22.4f}{t:20.2f}{s:12.1f}\n"
+            f"{'INT8':>6}{mq:22.4f}{tq:20.2f}{sq:12.1f}\n"
+            f"{prefix} {key} drop {drop:.4f}, {t / max(tq, 1e-9):.2f}x faster, {s / max(sq, 1e-9):.2f}x smaller"
+        )
+        if self.args.int8_drop is not None and drop > self.args.int8_drop:
+            raise RuntimeError(f"INT8 {key} drop {drop:.4f} exceeds int8_drop={self.args.int8_drop}")
+
     def add_callback(self, event: str, callback):
         """Appends the given callback."""
         self.callbacks[event].append(callback)
@@ -1100,3 +1306,95 @@ class IOSDetectModel(torch.nn.Module):
         """Normalize predictions of object detection model with input size-dependent factors."""
         xywh, cls = self.model(x)[0].transpose(0, 1).split((4, self.nc), 1)
         return cls, xywh * self.normalize  # confidence (3780, 80), coordinates (3780, 4)
+
+
+class TraceableModule(torch.nn.Module):
+    """Wrap a module for torch.fx, which traces the forward method of the root class and not its instance's forward."""
+
+    def __init__(self, m):
+        """Initialize the TraceableModule class with a module, i.e. a fused Conv using forward_fuse()."""
+        super().__init__()
+        self.m = m
+        for k in ("f", "i", "type", "np"):  # parse_model() attributes used by BaseModel._predict_once()
+            if hasattr(m, k):
+                setattr(self, k, getattr(m, k))
+
+    def forward(self, x):
+        """Run the wrapped module."""
+        return self.m(x)
+
+
+class ONNXNMS(torch.autograd.Function):
+    """ONNX NonMaxSuppression op, evaluated with torchvision NMS during tracing and dry runs."""
+
+    @staticmethod
+    def forward(ctx, boxes, scores, max_output_boxes_per_class, iou_threshold, score_threshold):
+        """Return (n, 3) int64 (batch, class, box) indices of xyxy `boxes` (b, n, 4) kept per `scores` (b, nc, n)."""
+        import torchvision  # scope for faster 'import ultralytics'
+
+        selected = []
+        for b, (x, s) in enumerate(zip(boxes, scores)):
+            c, i = (s > score_threshold).nonzero(as_tuple=True)
+            keep = torchvision.ops.batched_nms(x[i], s[c, i], c, float(iou_threshold))
+            c, i = c[keep], i[keep]
+            rank = torch.nn.functional.one_hot(c, s.shape[0]).cumsum(0).gather(1, c[:, None]).squeeze(1)
+            c, i = c[rank <= max_output_boxes_per_class], i[rank <= max_output_boxes_per_class]  # per class limit
+            selected.append(torch.stack((torch.full_like(c, b), c, i), 1))
+        return torch.cat(selected).long()
+
+    @staticmethod
+    def symbolic(g, boxes, scores, max_output_boxes_per_class, iou_threshold, score_threshold):
+        """Emit the standard ONNX NonMaxSuppression op."""
+        return g.op("NonMaxSuppression", boxes, scores, max_output_boxes_per_class, iou_threshold, score_threshold)
+
+
+class NMSModel(torch.nn.Module):
+    """
+    Wrap an Ultralytics YOLO detection model for end-to-end ONNX export with normalization and NMS in the graph.
+
+    As in non_max_suppression() for prediction, each box keeps only its highest scoring class before NMS, whereas the
+    validator's multi_label=True NMS keeps every class above the threshold, so end2end mAP can be slightly lower.
+    Detections below the export `conf` are removed by the graph and cannot be recovered with a lower `conf` later.
+    """
+
+    def __init__(self, model, args):
+        """Initialize the NMSModel class with a YOLO detection model and the export arguments."""
+        super().__init__()
+        self.model = model
+        self.nc = len(model.names)  # number of classes
+        self.nmsfree = isinstance(model.model[-1], MODULES.peek("Detect_NMSFree"))  # one-to-one head, no NMS needed
+        self.conf = 0.25 if args.conf is None else args.conf
+        self.iou = args.iou
+        self.max_det = args.max_det
+        self.agnostic = args.agnostic_nms
+
+    def forward(self, x):
+        """
+        Return (b, max_det, 6) detections for uint8 (b, 3, h, w) letterboxed RGB images.
+
+        Rows are xyxy pixel boxes, confidence and class sorted by confidence, padding rows are all zeros.
+        """
+        p = next(self.model.parameters())
+        preds = self.model(x.to(p.dtype) / 255).float()
+        if self.nmsfree:  # (b, max_det, 6) xywh, confidence, class already top-k selected by Detect_NMSFree
+            xywh, conf, cls = preds[..., :4], preds[..., 4], preds[..., 5]
+            boxes = torch.cat((xywh[..., :2] - xywh[..., 2:] / 2, xywh[..., :2] + xywh[..., 2:] / 2), -1)
+        else:
+            xywh, scores = preds.transpose(1, 2).split((4, self.nc), 2)  # (b, n, 4), (b, n, nc)
+            boxes = torch.cat((xywh[..., :2] - xywh[..., 2:] / 2, xywh[..., :2] + xywh[..., 2:] / 2), -1)
+            scores, labels = scores.max(2)  # (b, n) best class only, i.e. multi_label=False
+            offset = 0 if self.agnostic else labels.unsqueeze(-1).to(boxes.dtype) * 7680  # max_wh class offsets
+            i = ONNXNMS.apply(
+                boxes + offset,
+                scores.unsqueeze(1),  # (b, 1, n) single class NMS on offset boxes
+                torch.tensor([self.max_det], dtype=torch.int64),
+                torch.tensor([self.iou], dtype=torch.float32),
+                torch.tensor([self.conf], dtype=torch.float32),
+            )
+            keep = torch.zeros_like(scores)
+            keep[i[:, 0], i[:, 2]] = 1.0  # ScatterND
+            conf, box = (scores * keep).topk(min(self.max_det, scores.shape[1]))
+            cls = labels.gather(1, box)
+            boxes = boxes.gather(1, box.unsqueeze(-1).expand(-1, -1, 4))
+        y = torch.cat((boxes, conf.unsqueeze(-1), cls.to(conf.dtype).unsqueeze(-1)), -1)
+        return y * (conf > self.conf).unsqueeze(-1).to(y.dtype)
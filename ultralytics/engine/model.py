@@ -331,6 +331,61 @@ class Model(nn.Module):
         self._check_is_pytorch_model()
         self.model.fuse()
 
+    def reparameterize(self, imgsz=640, rtol=1e-3, verbose=True):
+        """
+        Collapses re-parameterizable blocks into plain convolutions and verifies them against their unfused outputs.
+
+        Conv and BatchNorm pairs, RepConv and blocks with a deploy form such as DiverseBranchBlock, OREPA, RepVGG and
+        DilatedReparamBlock are fused in place, and each block's output, latency and parameters are compared before and
+        after on a random image.
+
+        Args:
+            imgsz (int): Size of the random input image. Defaults to 640.
+            rtol (float): Maximum error relative to the largest unfused output value of a block. Defaults to 1e-3.
+            verbose (bool): If True, logs a summary per block type. Defaults to True.
+
+        Returns:
+            (dict): Per block type count, parameters, latency in ms and largest relative error before and after.
+
+        Raises:
+            AssertionError: If the model is not a PyTorch model.
+        """
+        self._check_is_pytorch_model()
+        return self.model.reparameterize(imgsz=imgsz, rtol=rtol, verbose=verbose)
+
+    def prune(self, flops=0.5, latency=None, method="bn", step=0.05, epochs=0, **kwargs):
+        """
+        Removes the least important channels of a detection model and optionally fine-tunes it to recover accuracy.
+
+        Channels are ranked by BatchNorm scale or first-order Taylor importance and removed physically in rounds until
+        the model meets the FLOPs and latency budget, see `ultralytics.utils.prune`. The pruned model is fine-tuned by
+        the task's trainer like any other model and its checkpoints load with `YOLO('best.pt')`.
+
+        Args:
+            flops (float): Target GFLOPs as a fraction of the model's GFLOPs. Defaults to 0.5.
+            latency (float, optional): Target latency in ms of the fused model on one image. Defaults to None.
+            method (str): Channel importance, 'bn' or 'taylor'. Defaults to 'bn'.
+            step (float): Fraction of the prunable channels removed per round. Defaults to 0.05.
+            epochs (int): Number of fine-tuning epochs, 0 skips fine-tuning. Defaults to 0.
+            **kwargs (dict): Training arguments, 'data' and 'imgsz' are also used for pruning.
+
+        Returns:
+            (dict): Pruning summary with 'gflops', 'params' and 'latency' before and after, 'channels' per group and
+                the fine-tuning 'metrics' if `epochs` > 0.
+
+        Raises:
+            AssertionError: If the model is not a PyTorch detection model.
+        """
+        from ultralytics.utils.prune import prune
+
+        self._check_is_pytorch_model()
+        assert self.task == "detect", f"prune() supports 'detect' models only, not '{self.task}'."
+        data, imgsz = kwargs.get("data"), kwargs.get("imgsz", 640)
+        stats = prune(self.model, flops, latency, method, data=data, imgsz=imgsz, step=step)
+        if epochs:
+            stats["metrics"] = self.train(epochs=epochs, **kwargs)
+        return stats
+
     def embed(self, source=None, stream=False, **kwargs):
         """
         Generates image embeddings based on the provided source.
@@ -582,7 +637,8 @@ class Model(nn.Module):
 
         self.trainer = (trainer or self._smart_load("trainer"))(overrides=args, _callbacks=self.callbacks)
         if not args.get("resume"):  # manually set model only if not resuming
-            self.trainer.model = self.trainer.get_model(weights=self.model if self.ckpt else None, cfg=self.model.yaml)
+            weights = self.model if self.ckpt or getattr(self.model, "pruned", False) else None
+            self.trainer.model = self.trainer.get_model(weights=weights, cfg=self.model.yaml)
             self.model = self.trainer.model
 
             if SETTINGS["hub"] is True and not self.session:
@@ -28,20 +28,27 @@ Usage - formats:
                               yolov8n_paddle_model       # PaddlePaddle
 """
 import platform
+import queue
 import threading
+import time
 from pathlib import Path
 
 import cv2
 import numpy as np
 import torch
+import torchvision
 
 from ultralytics.cfg import get_cfg, get_save_dir
 from ultralytics.data import load_inference_source
 from ultralytics.data.augment import LetterBox, classify_transforms
+from ultralytics.data.split_dota import get_windows
+from ultralytics.engine.results import Results
 from ultralytics.nn.autobackend import AutoBackend
 from ultralytics.utils import DEFAULT_CFG, LOGGER, MACOS, WINDOWS, callbacks, colorstr, ops
+from ultralytics.utils.autobatch import apply_runtime
 from ultralytics.utils.checks import check_imgsz, check_imshow
 from ultralytics.utils.files import increment_path
+from ultralytics.utils.metrics import box_iou
 from ultralytics.utils.torch_utils import select_device, smart_inference_mode
 
 STREAM_WARNING = """
@@ -74,6 +81,8 @@ class BasePredictor:
         vid_path (str): Path to video file.
         vid_writer (cv2.VideoWriter): Video writer for saving video output.
         data_path (str): Path to data.
+        batch (tuple): (paths, original images, video capture, log string) of the batch being processed, per thread.
+        frame (int | None): Source frame of the batch being processed when the source runs ahead (pipeline), per thread.
     """
 
     def __init__(self, cfg=DEFAULT_CFG, overrides=None, _callbacks=None):
@@ -102,14 +111,37 @@ class BasePredictor:
         self.plotted_img = None
         self.data_path = None
         self.source_type = None
+        self._stage = threading.local()  # batch and frame of the pipeline stage running in each thread
+        self._shared = {}  # last batch and frame set by any thread, seen by threads that did not set their own
         self.batch = None
         self.results = None
         self.transforms = None
         self.callbacks = _callbacks or callbacks.get_default_callbacks()
         self.txt_path = None
+        self.frame = None
         self._lock = threading.Lock()  # for automatic thread-safe inference
         callbacks.add_integration_callbacks(self)
 
+    @property
+    def batch(self):
+        """Returns the batch being processed by the calling thread, or the last one set by any thread."""
+        return getattr(self._stage, "batch", self._shared.get("batch"))
+
+    @batch.setter
+    def batch(self, batch):
+        """Sets the batch of the calling thread, so that concurrent pipeline stages each see their own batch."""
+        self._stage.batch = self._shared["batch"] = batch
+
+    @property
+    def frame(self):
+        """Returns the source frame of the batch being processed when the source runs ahead (pipeline), else None."""
+        return getattr(self._stage, "frame", self._shared.get("frame"))
+
+    @frame.setter
+    def frame(self, frame):
+        """Sets the source frame of the batch of the calling thread."""
+        self._stage.frame = self._shared["frame"] = frame
+
     def preprocess(self, im):
         """
         Prepares input image before inference.
@@ -161,9 +193,7 @@ class BasePredictor:
             im = im[None]  # expand for batch dim
         if self.source_type.webcam or self.source_type.from_img or self.source_type.tensor:  # batch_size >= 1
             log_string += f"{idx}: "
-            frame = self.dataset.count
-        else:
-            frame = getattr(self.dataset, "frame", 0)
+        frame = self.source_frame() if self.frame is None else self.frame
         self.data_path = p
         self.txt_path = str(self.save_dir / "labels" / p.stem) + ("" if self.dataset.mode == "image" else f"_{frame}")
         log_string += "%gx%g " % im.shape[2:]  # print string
@@ -191,10 +221,133 @@ class BasePredictor:
 
         return log_string
 
+    def source_frame(self):
+        """Returns the current frame index of the source, used to name per-frame outputs."""
+        if self.source_type.webcam or self.source_type.from_img or self.source_type.tensor:
+            return self.dataset.count
+        return getattr(self.dataset, "frame", 0)
+
+    def batch_streams(self):
+        """Returns the source index of each image of the current batch, only the ready streams with stream_policy."""
+        frame = self.source_frame() if self.frame is None else self.frame
+        streams = getattr(self.dataset, "batch_streams", lambda _: None)(frame)
+        return list(range(len(self.batch[1]))) if streams is None else streams
+
     def postprocess(self, preds, img, orig_imgs):
         """Post-processes predictions for an image and returns them."""
         return preds
 
+    def slice_batch(self, batch):
+        """
+        Cut every image of a batch into overlapping tiles of args.slice pixels for sliced inference.
+
+        Tile windows come from get_windows() of the DOTA splitting tools with a gap of args.slice_overlap times the tile
+        size. Images larger than a tile also get their full image as a last tile, so objects larger than a tile are
+        still detected whole.
+
+        Args:
+            batch (tuple): (paths, original images, video capture, log string) as returned by the dataset.
+
+        Returns:
+            (tuple): Batch of tiles in the same format, with the path of its image repeated for every tile.
+            (list): Windows (n, 4) of every image in xyxy pixels, the tiles of an image follow each other in the batch.
+        """
+        path, im0s, vid_cap, s = batch
+        size = self.args.slice
+        gap = min(round(size * self.args.slice_overlap), size - 1)
+        paths, tiles, windows = [], [], []
+        for p, im0 in zip(path, im0s):
+            h, w = im0.shape[:2]
+            win = get_windows((h, w), crop_sizes=[size], gaps=[gap], im_rate_thr=0.0)
+            win[:, 2:] = np.minimum(win[:, 2:], (w, h))  # windows of images smaller than a tile
+            if len(win) > 1:
+                win = np.concatenate((win, [[0, 0, w, h]]))  # full image
+            tiles += [im0[y1:y2, x1:x2] for x1, y1, x2, y2 in win]
+            paths += [p] * len(win)
+            windows.append(win)
+        return (paths, tiles, vid_cap, s), windows
+
+    def merge_slices(self, results, batch, windows):
+        """
+        Merge the Results of the tiles of slice_batch() into one Results per image, in image coordinates.
+
+        Boxes are shifted by their window offsets, then duplicates from overlapping tiles are removed by class-aware NMS
+        at args.iou (args.slice_merge='nms') or fused into confidence-weighted averages of the boxes every kept box
+        suppresses ('fuse'). Only boxes are merged, other outputs of the tiles such as masks are dropped.
+
+        Args:
+            results (List[Results]): Results of every tile.
+            batch (tuple): The batch of images the tiles were cut from.
+            windows (list): Windows of every image as returned by slice_batch().
+
+        Returns:
+            (List[Results]): Results of every image.
+        """
+        path, im0s, _, _ = batch
+        merged, i = [], 0
+        for p, im0, win in zip(path, im0s, windows):
+            tiles, i = results[i : i + len(win)], i + len(win)
+            boxes = []
+            for r, (x1, y1, _, _) in zip(tiles, win):
+                if r.boxes is not None and len(r.boxes):
+                    b = r.boxes.data.clone()
+                    b[:, :4] += b.new_tensor([x1, y1, x1, y1])
+                    boxes.append(b)
+            boxes = torch.cat(boxes) if boxes else torch.zeros((0, 6), device=self.device)
+            boxes = self.merge_boxes(boxes) if len(win) > 1 else boxes  # a single tile has no duplicates
+            merged.append(Results(im0, path=p, names=self.model.names, boxes=boxes))
+        return merged
+
+    def merge_boxes(self, data):
+        """Merge (n, 6) boxes of overlapping tiles with class-aware NMS or box fusion, see merge_slices()."""
+        if not len(data):
+            return data
+        boxes, scores, cls = data[:, :4], data[:, 4], data[:, -1]
+        keep = torchvision.ops.batched_nms(boxes, scores, cls, self.args.iou)[: self.args.max_det]
+        if self.args.slice_merge != "fuse":
+            return data[keep]
+
+        # Every box belongs to the highest confidence kept box of its class it overlaps, kept boxes to themselves
+        member = (box_iou(boxes[keep], boxes) > self.args.iou) & (cls[keep, None] == cls)
+        member[torch.arange(len(keep), device=data.device), keep] = True
+        j = member.any(0)
+        owner, w = member[:, j].float().argmax(0), scores[j, None]
+        fused = torch.zeros_like(boxes[keep]).index_add_(0, owner, boxes[j] * w)
+        fused /= torch.zeros_like(scores[keep, None]).index_add_(0, owner, w)
+        data = data[keep].clone()
+        data[:, :4] = fused
+        return data
+
+    def postprocess_batch(self, preds, im, batch, sliced=None):
+        """
+        Post-process the predictions of a batch, merging the results of its tiles back into images if it was sliced.
+
+        Args:
+            preds (torch.Tensor | List[torch.Tensor]): Model outputs of the batch.
+            im (torch.Tensor): Preprocessed BCHW batch.
+            batch (tuple): (paths, original images, video capture, log string) as returned by the dataset.
+            sliced (tuple, optional): Tile batch and windows as returned by slice_batch().
+
+        Returns:
+            (List[Results]): Results of every image of the batch.
+        """
+        if sliced is None:
+            return self.postprocess(preds, im, batch[1])
+        tiles, windows = sliced
+        self.batch = tiles  # paths of the tiles for postprocess()
+        try:
+            results = self.postprocess(preds, im, tiles[1])
+        finally:
+            self.batch = batch
+        self.seen_tiles += len(tiles[1])
+        return self.merge_slices(results, batch, windows)
+
+    @staticmethod
+    def slice_speed(sliced, n, dt):
+        """Returns tiles per image and inference ms per tile of a sliced batch of n images inferred in dt seconds."""
+        nt = len(sliced[0][1])
+        return {"tiles": nt / n, "inference_tile": dt * 1e3 / nt}
+
     def __call__(self, source=None, model=None, stream=False, *args, **kwargs):
         """Performs inference on an image or stream."""
         self.stream = stream
@@ -226,7 +379,11 @@ class BasePredictor:
             else None
         )
         self.dataset = load_inference_source(
-            source=source, vid_stride=self.args.vid_stride, buffer=self.args.stream_buffer
+            source=source,
+            vid_stride=self.args.vid_stride,
+            buffer=self.args.stream_buffer,
+            stream_policy=self.args.stream_policy,
+            stream_max_age=self.args.stream_max_age,
         )
         self.source_type = self.dataset.source_type
         if not getattr(self, "stream", True) and (
@@ -235,9 +392,14 @@ class BasePredictor:
             or any(getattr(self.dataset, "video_flag", [False]))
         ):  # videos
             LOGGER.warning(STREAM_WARNING)
+        if self.device.type == "cpu":  # thread count tuned by autotune_runtime() for this batch size and imgsz
+            self.model.runtime = apply_runtime(self.args.model, self.imgsz, self.dataset.bs, self.args.verbose)
         self.vid_path = [None] * self.dataset.bs
         self.vid_writer = [None] * self.dataset.bs
         self.vid_frame = [None] * self.dataset.bs
+        if self.args.slice and (self.args.task != "detect" or self.source_type.tensor or self.args.embed):
+            LOGGER.warning("WARNING ⚠️ 'slice' is only supported for detection on image sources, disabling it.")
+            self.args.slice = 0
 
     @smart_inference_mode()
     def stream_inference(self, source=None, model=None, *args, **kwargs):
@@ -262,61 +424,55 @@ class BasePredictor:
                 self.model.warmup(imgsz=(1 if self.model.pt or self.model.triton else self.dataset.bs, 3, *self.imgsz))
                 self.done_warmup = True
 
-            self.seen, self.windows, self.batch = 0, [], None
+            self.seen, self.seen_tiles, self.windows, self.batch = 0, 0, [], None
             profilers = (
                 ops.Profile(device=self.device),
                 ops.Profile(device=self.device),
                 ops.Profile(device=self.device),
             )
             self.run_callbacks("on_predict_start")
-            for batch in self.dataset:
-                self.run_callbacks("on_predict_batch_start")
-                self.batch = batch
-                path, im0s, vid_cap, s = batch
-
-                # Preprocess
-                with profilers[0]:
-                    im = self.preprocess(im0s)
-
-                # Inference
-                with profilers[1]:
-                    preds = self.inference(im, *args, **kwargs)
-                    if self.args.embed:
-                        yield from [preds] if isinstance(preds, torch.Tensor) else preds  # yield embedding tensors
-                        continue
-
-                # Postprocess
-                with profilers[2]:
-                    self.results = self.postprocess(preds, im, im0s)
-
-                self.run_callbacks("on_predict_postprocess_end")
-                # Visualize, save, write results
-                n = len(im0s)
-                for i in range(n):
-                    self.seen += 1
-                    self.results[i].speed = {
+            if self.args.pipeline and not (self.args.embed or self.args.visualize):
+                im = yield from self._pipelined_inference(profilers, *args, **kwargs)
+            else:
+                for batch in self.dataset:
+                    self.batch = batch
+                    self.run_callbacks("on_predict_batch_start")
+                    path, im0s, vid_cap, s = batch
+
+                    # Preprocess
+                    with profilers[0]:
+                        sliced = self.slice_batch(batch) if self.args.slice else None
+                        im = self.preprocess(im0s if sliced is None else sliced[0][1])
+
+                    # Inference
+                    with profilers[1]:
+                        preds = self.inference(im, *args, **kwargs)
+                        if self.args.embed:
+                            yield from [preds] if isinstance(preds, torch.Tensor) else preds  # yield embedding tensors
+                            continue
+
+                    # Postprocess
+                    with profilers[2]:
+                        self.results = self.postprocess_batch(preds, im, batch, sliced)
+
+                    self.run_callbacks("on_predict_postprocess_end")
+                    # Visualize, save, write results
+                    n = len(im0s)
+                    speed = {
                         "preprocess": profilers[0].dt * 1e3 / n,
                         "inference": profilers[1].dt * 1e3 / n,
                         "postprocess": profilers[2].dt * 1e3 / n,
                     }
-                    p, im0 = path[i], None if self.source_type.tensor else im0s[i].copy()
-                    p = Path(p)
-
-                    if self.args.verbose or self.args.save or self.args.save_txt or self.args.show:
-                        s += self.write_results(i, self.results, (p, im, im0))
-                    if self.args.save or self.args.save_txt:
-                        self.results[i].save_dir = self.save_dir.__str__()
-                    if self.args.show and self.plotted_img is not None:
-                        self.show(p)
-                    if self.args.save and self.plotted_img is not None:
-                        self.save_preds(vid_cap, i, str(self.save_dir / p.name))
-
-                self.run_callbacks("on_predict_batch_end")
-                yield from self.results
-
-                # Print time (inference-only)
-                if self.args.verbose:
-                    LOGGER.info(f"{s}{profilers[1].dt * 1E3:.1f}ms")
+                    if sliced is not None:
+                        speed.update(self.slice_speed(sliced, n, profilers[1].dt))
+                    s = self.write_batch_results(batch, im, speed)
+
+                    self.run_callbacks("on_predict_batch_end")
+                    yield from self.results
+
+                    # Print time (inference-only)
+                    if self.args.verbose:
+                        LOGGER.info(f"{s}{profilers[1].dt * 1E3:.1f}ms")
 
         # Release assets
         if isinstance(self.vid_writer[-1], cv2.VideoWriter):
@@ -329,6 +485,11 @@ class BasePredictor:
                 f"Speed: %.1fms preprocess, %.1fms inference, %.1fms postprocess per image at shape "
                 f"{(1, 3, *im.shape[2:])}" % t
             )
+            if self.seen_tiles:
+                LOGGER.info(
+                    f"Sliced: {self.seen_tiles / self.seen:.1f} tiles per image, "
+                    f"{profilers[1].t / self.seen_tiles * 1e3:.1f}ms inference per tile"
+                )
         if self.args.save or self.args.save_txt or self.args.save_crop:
             nl = len(list(self.save_dir.glob("labels/*.txt")))  # number of labels
             s = f"\n{nl} label{'s' * (nl > 1)} saved to {self.save_dir / 'labels'}" if self.args.save_txt else ""
@@ -336,6 +497,175 @@ class BasePredictor:
 
         self.run_callbacks("on_predict_end")
 
+    def write_batch_results(self, batch, im, speed):
+        """
+        Set speeds on self.results, then visualize, save and write the results of a batch.
+
+        Args:
+            batch (tuple): (paths, original images, video capture, log string) as returned by the dataset.
+            im (torch.Tensor): Preprocessed BCHW batch.
+            speed (dict): Per image speeds in milliseconds, copied into every Results.speed.
+
+        Returns:
+            (str): The batch log string.
+        """
+        path, im0s, vid_cap, s = batch
+        frame = self.source_frame() if self.frame is None else self.frame
+        streams = getattr(self.dataset, "batch_streams", lambda _: None)(frame)  # stream scheduler batches
+        for i in range(len(im0s)):
+            self.seen += 1
+            self.results[i].speed = dict(speed)
+            p, im0 = path[i], None if self.source_type.tensor else im0s[i].copy()
+            p = Path(p)
+
+            if self.args.verbose or self.args.save or self.args.save_txt or self.args.show:
+                s += self.write_results(i, self.results, (p, im, im0))
+            if self.args.save or self.args.save_txt:
+                self.results[i].save_dir = self.save_dir.__str__()
+            if self.args.show and self.plotted_img is not None:
+                self.show(p)
+            if self.args.save and self.plotted_img is not None:
+                self.save_preds(vid_cap, i if streams is None else streams[i], str(self.save_dir / p.name))
+        if streams is not None:  # capture to result latency
+            for r, ms in zip(self.results, self.dataset.record_latency(frame)):
+                r.speed["latency"] = ms
+        return s
+
+    def _pipelined_inference(self, profilers, *args, **kwargs):
+        """
+        Pipelined body of stream_inference() that overlaps preprocess, inference and postprocess of consecutive batches.
+
+        Preprocessing runs in one worker thread and postprocessing (including writing, annotating and saving results) in
+        another, connected to the inference loop by queues bounded to 'pipeline_depth' batches, so the letterboxing of
+        batch N+1 and the annotation of batch N-1 overlap the forward pass of batch N. Stages handle one batch at a time
+        in source order, so Results are yielded in the same order as the serial loop. Results.speed additionally reports
+        for every stage the depth of its input queue ('*_queue', batches) and the time it waited for input ('*_stall',
+        ms per batch).
+
+        Each stage sets `batch` and `frame` for its own thread only, so methods and callbacks see their stage's batch:
+            - preprocess worker: `preprocess()` and `slice_batch()` see batch N+1, no callbacks run here.
+            - calling thread: 'on_predict_batch_start' and `inference()` see batch N, after it was preprocessed.
+            - postprocess worker: `postprocess()`, 'on_predict_postprocess_end', `write_results()` and
+              'on_predict_batch_end' see batch N-1 and its `results`.
+
+        Yields:
+            (Results): Results of every image, in source order.
+
+        Returns:
+            (torch.Tensor | None): The last preprocessed batch.
+        """
+        depth = max(self.args.pipeline_depth, 1)
+        q_pre, q_post, q_out = queue.Queue(depth), queue.Queue(depth), queue.Queue()
+        stop = threading.Event()
+        done = object()  # end of stream sentinel
+
+        def put(q, item):
+            """Put item on q, giving up once the pipeline is stopped."""
+            while not stop.is_set():
+                try:
+                    return q.put(item, timeout=0.1)
+                except queue.Full:
+                    pass
+
+        def get(q):
+            """Get an item from q, returning it with the queue depth before the get and the time waited in ms."""
+            n, t = q.qsize(), time.perf_counter()
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1), n, (time.perf_counter() - t) * 1e3
+                except queue.Empty:
+                    pass
+            return done, n, 0.0
+
+        def preprocess_worker():
+            try:
+                t = time.perf_counter()
+                for batch in self.dataset:
+                    stall = (time.perf_counter() - t) * 1e3  # waiting for the source
+                    if stop.is_set():
+                        break
+                    self.batch = batch
+                    with profilers[0]:
+                        sliced = self.slice_batch(batch) if self.args.slice else None
+                        im = self.preprocess(batch[1] if sliced is None else sliced[0][1])
+                    stats = {"preprocess": profilers[0].dt, "preprocess_stall": stall}
+                    put(q_pre, (batch, im, self.source_frame(), stats, sliced))
+                    t = time.perf_counter()
+                put(q_pre, done)
+            except Exception as e:
+                put(q_pre, e)
+
+        def postprocess_worker():
+            try:
+                while True:
+                    item, n, stall = get(q_post)
+                    if item is done or isinstance(item, Exception):
+                        return put(q_out, item)
+                    batch, im, frame, preds, stats, sliced = item
+                    self.batch, self.frame = batch, frame
+                    with profilers[2]:
+                        self.results = self.postprocess_batch(preds, im, batch, sliced)
+                    self.run_callbacks("on_predict_postprocess_end")
+                    stats.update(postprocess=profilers[2].dt, postprocess_queue=n, postprocess_stall=stall)
+                    nb = len(batch[1])
+                    speed = {k: v if k.endswith(("_queue", "_stall")) else v * 1e3 / nb for k, v in stats.items()}
+                    if sliced is not None:
+                        speed.update(self.slice_speed(sliced, nb, stats["inference"]))
+                    s = self.write_batch_results(batch, im, speed)
+                    self.run_callbacks("on_predict_batch_end")
+                    put(q_out, (self.results, s, stats["inference"]))
+            except Exception as e:
+                put(q_out, e)
+
+        def output(block):
+            """Yield finished results, waiting for the end of the stream if block=True."""
+            while block or not q_out.empty():
+                item = q_out.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                results, s, dt = item
+                yield from results
+                if self.args.verbose:
+                    LOGGER.info(f"{s}{dt * 1E3:.1f}ms")
+
+        workers = [
+            threading.Thread(target=self._run_in_inference_mode, args=(f,), daemon=True)
+            for f in (preprocess_worker, postprocess_worker)
+        ]
+        for w in workers:
+            w.start()
+        im = None
+        try:
+            while True:
+                item, n, stall = get(q_pre)
+                if item is done or isinstance(item, Exception):
+                    put(q_post, item)
+                    break
+                batch, im, frame, stats, sliced = item
+                self.batch, self.frame = batch, frame
+                self.run_callbacks("on_predict_batch_start")
+                with profilers[1]:
+                    preds = self.inference(im, *args, **kwargs)
+                if getattr(self.model, "ort_iobinding", False):  # outputs are overwritten by the next forward pass
+                    preds = [x.clone() for x in preds] if isinstance(preds, (list, tuple)) else preds.clone()
+                stats.update(inference=profilers[1].dt, inference_queue=n, inference_stall=stall)
+                put(q_post, (batch, im, frame, preds, stats, sliced))
+                yield from output(block=False)
+            yield from output(block=True)
+        finally:
+            stop.set()
+            for w in workers:
+                w.join()
+            self.frame = None
+        return im
+
+    @smart_inference_mode()
+    def _run_in_inference_mode(self, fn):
+        """Run fn in inference mode, which is thread-local and therefore not inherited by pipeline worker threads."""
+        fn()
+
     def setup_model(self, model, verbose=True):
         """Initialize YOLO model with given parameters and set it to evaluation mode."""
         self.model = AutoBackend(
@@ -346,6 +676,7 @@ class BasePredictor:
             fp16=self.args.half,
             fuse=True,
             verbose=verbose,
+            ort={k[4:]: v for k, v in vars(self.args).items() if k.startswith("ort_")},
         )
 
         self.device = self.model.device  # update device
@@ -48,7 +48,6 @@ from ultralytics.utils.torch_utils import (
     select_device,
     strip_optimizer,
 )
-from ultralytics.nn.extra_modules.kernel_warehouse import get_temperature
 
 
 class BaseTrainer:
@@ -372,6 +371,8 @@ class BaseTrainer:
                             x["momentum"] = np.interp(ni, xi, [self.args.warmup_momentum, self.args.momentum])
                 
                 if hasattr(self.model, 'net_update_temperature'):
+                    from ultralytics.nn.extra_modules.kernel_warehouse import get_temperature  # KW models only
+
                     temp = get_temperature(i + 1, epoch, len(self.train_loader), temp_epoch=20, temp_init_value=1.0)
                     self.model.net_update_temperature(temp)
                 
@@ -125,14 +125,18 @@ class BaseValidator:
                 dnn=self.args.dnn,
                 data=self.args.data,
                 fp16=self.args.half,
+                ort={k[4:]: v for k, v in vars(self.args).items() if k.startswith("ort_")},
             )
             # self.model = model
             self.device = model.device  # update device
             self.args.half = model.fp16  # update half
             stride, pt, jit, engine = model.stride, model.pt, model.jit, model.engine
             imgsz = check_imgsz(self.args.imgsz, stride=stride)
+            dynamic = model.dynamic and not model.dnn  # exported with dynamic=True, OpenCV DNN runs batch=1 only
             if engine:
                 self.args.batch = model.batch_size
+            elif dynamic and not pt and not jit:
+                LOGGER.info(f"Using batch={self.args.batch} inference for dynamic batch and image size models")
             elif not pt and not jit:
                 self.args.batch = 1  # export.py models default to batch-size 1
                 LOGGER.info(f"Forcing batch=1 square inference (1,3,{imgsz},{imgsz}) for non-PyTorch models")
@@ -146,7 +150,7 @@ class BaseValidator:
 
             if self.device.type in ("cpu", "mps"):
                 self.args.workers = 0  # faster CPU val as time dominated by inference, not dataloading
-            if not pt:
+            if not pt and (engine or not dynamic):  # TensorRT engines are at most batch-dynamic, i.e. fixed imgsz
                 self.args.rect = False
             self.stride = model.stride  # used in get_dataloader() for padding
             self.dataloader = self.dataloader or self.get_dataloader(self.data.get(self.args.split), self.args.batch)
@@ -227,11 +231,14 @@ class BaseValidator:
         Returns:
             (torch.Tensor): Correct tensor of shape(N,10) for 10 IoU thresholds.
         """
-        # Dx10 matrix, where D - detections, 10 - IoU thresholds
-        correct = np.zeros((pred_classes.shape[0], self.iouv.shape[0])).astype(bool)
         # LxD matrix where L - labels (rows), D - detections (columns)
         correct_class = true_classes[:, None] == pred_classes
         iou = iou * correct_class  # zero out the wrong classes
+        if not use_scipy and not self.has_tied_labels(iou):
+            return self.match_predictions_greedy(iou)
+
+        # Dx10 matrix, where D - detections, 10 - IoU thresholds
+        correct = np.zeros((pred_classes.shape[0], self.iouv.shape[0])).astype(bool)
         iou = iou.cpu().numpy()
         for i, threshold in enumerate(self.iouv.cpu().tolist()):
             if use_scipy:
@@ -256,6 +263,55 @@ class BaseValidator:
                     correct[matches[:, 1].astype(int), i] = True
         return torch.tensor(correct, dtype=torch.bool, device=pred_classes.device)
 
+    @staticmethod
+    def has_tied_labels(iou):
+        """
+        Check if a detection has its best IoU with several labels.
+
+        The greedy loop breaks such ties by the order of an unstable argsort over the matches of each threshold, so the
+        label a detection takes can change between thresholds and only the loop itself reproduces it.
+
+        Args:
+            iou (torch.Tensor): An LxD tensor of IoU values between labels and detections, zero for mismatched classes.
+
+        Returns:
+            (bool): True if any detection has a positive best IoU shared by more than one label.
+        """
+        if iou.shape[0] < 2 or iou.shape[1] == 0:
+            return False
+        return bool((((iou == iou.max(0)[0]) & (iou > 0)).sum(0) > 1).any())
+
+    def match_predictions_greedy(self, iou):
+        """
+        Greedy matching for all IoU thresholds in a single pass on the device of the inputs.
+
+        At every threshold each detection takes its highest IoU label, and each label keeps the first detection that
+        took it. Without tied labels (see has_tied_labels()) the best label of a detection does not depend on the
+        threshold, so a detection is correct at threshold t if its best IoU reaches t and it is the first such detection
+        of its label.
+
+        Args:
+            iou (torch.Tensor): An LxD tensor of IoU values between labels and detections, zero for mismatched classes.
+
+        Returns:
+            (torch.Tensor): Correct tensor of shape(D,10) for 10 IoU thresholds.
+        """
+        n, d = iou.shape
+        iouv = self.iouv.to(iou.device)
+        if n == 0 or d == 0:
+            return torch.zeros((d, iouv.shape[0]), dtype=torch.bool, device=iou.device)
+        best, label = iou.max(0)  # best IoU and label of every detection
+
+        # Detections grouped by label in index order, hits counted within each group
+        label, i = torch.sort(label, stable=True)
+        hits = (best[i, None] >= iouv).int()  # (D, 10)
+        count = hits.cumsum(0)
+        counts = torch.unique_consecutive(label, return_counts=True)[1]
+        start = (count - hits)[counts.cumsum(0) - counts]  # hits before each group
+        correct = torch.zeros_like(hits, dtype=torch.bool)
+        correct[i] = (hits > 0) & (count - start.repeat_interleave(counts, 0) == 1)
+        return correct
+
     def add_callback(self, event: str, callback):
         """Appends the given callback."""
         self.callbacks[event].append(callback)
@@ -2,11 +2,14 @@
 
 import math
 from itertools import product
+from multiprocessing.pool import ThreadPool
 from typing import Any, Generator, List, Tuple
 
 import numpy as np
 import torch
 
+from ultralytics.utils import NUM_THREADS
+
 
 def is_box_near_crop_edge(
     boxes: torch.Tensor, crop_box: List[int], orig_box: List[int], atol: float = 20.0
@@ -149,6 +152,69 @@ def remove_small_regions(mask: np.ndarray, area_thresh: float, mode: str) -> Tup
     return mask, True
 
 
+def batched_remove_small_regions(
+    masks: np.ndarray, area_thresh: float, mode: str, max_pixels: int = 1 << 22
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched version of `remove_small_regions` for an (N, H, W) stack of masks, returning the masks and a per-mask
+    modification indicator.
+
+    Masks are stacked vertically with one blank row between them so that a single connected-components pass labels a
+    whole chunk of at most `max_pixels` pixels, with every region belonging to exactly one mask. Chunks are labeled in a
+    thread pool and only modified masks are rewritten. Results are identical to calling `remove_small_regions` on every
+    mask.
+    """
+    import cv2  # type: ignore
+
+    assert mode in {"holes", "islands"}
+    correct_holes = mode == "holes"
+    n, h, w = masks.shape
+    masks = masks.astype(bool, copy=False)
+    changed = np.zeros(n, dtype=bool)
+    if area_thresh <= 0 or n == 0:
+        return masks, changed
+    out = masks.copy()
+
+    def process(i):
+        """Remove small regions from masks[i : i + step] in place, one labeling pass for the whole chunk."""
+        k = min(step, n - i)
+        working = np.zeros((k, h + 1, w), dtype=np.uint8)  # blank last row separates masks
+        working[:, :h] = correct_holes ^ masks[i : i + k]
+        _, regions, stats, _ = cv2.connectedComponentsWithStats(working.reshape(k * (h + 1), w), 8)
+        sizes = stats[1:, -1]  # Row 0 is background label
+        owner = stats[1:, cv2.CC_STAT_TOP] // (h + 1)  # mask index of each region
+        small = sizes < area_thresh
+        changed[i : i + k] = np.bincount(owner[small], minlength=k) > 0
+        ties = []
+        if correct_holes:
+            fill = np.concatenate(([True], small))  # label 0 is the mask itself
+        else:
+            fill = np.concatenate(([False], ~small))  # label 0 is the background
+            # If every region is below threshold, keep largest
+            none = changed[i : i + k] & (np.bincount(owner[~small], minlength=k) == 0)
+            if none.any():
+                largest = np.zeros(k, dtype=sizes.dtype)
+                np.maximum.at(largest, owner, sizes)
+                top = none[owner] & (sizes == largest[owner])
+                fill[1:][top] = True
+                # Equal-size largest regions are resolved by per-image label order, so defer those masks
+                ties = np.flatnonzero(np.bincount(owner[top], minlength=k) > 1)
+        regions = regions.reshape(k, h + 1, w)
+        for j in np.flatnonzero(changed[i : i + k]):
+            out[i + j] = fill[regions[j, :h]]
+        for j in ties:
+            out[i + j] = remove_small_regions(masks[i + j], area_thresh, mode)[0]
+
+    step = max(1, max_pixels // ((h + 1) * w))
+    chunks = range(0, n, step)
+    if len(chunks) == 1:
+        process(0)
+    else:
+        with ThreadPool(min(NUM_THREADS, len(chunks))) as pool:
+            pool.map(process, chunks)
+    return out, changed
+
+
 def batched_mask_to_box(masks: torch.Tensor) -> torch.Tensor:
     """
     Calculates boxes in XYXY format around masks.
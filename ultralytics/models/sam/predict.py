@@ -8,6 +8,10 @@ using SAM. It forms an integral part of the Ultralytics framework and is designe
 segmentation tasks.
 """
 
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+
 import numpy as np
 import torch
 import torch.nn.functional as F
@@ -21,17 +25,130 @@ from ultralytics.utils.torch_utils import select_device
 from .amg import (
     batch_iterator,
     batched_mask_to_box,
+    batched_remove_small_regions,
     build_all_layer_point_grids,
     calculate_stability_score,
     generate_crop_boxes,
     is_box_near_crop_edge,
-    remove_small_regions,
     uncrop_boxes_xyxy,
     uncrop_masks,
 )
 from .build import build_sam
 
 
+class EmbeddingCache:
+    """
+    LRU cache of SAM image embeddings keyed by a content hash of the source image.
+
+    Entries are evicted in least-recently-used order once either `max_items` or `max_bytes` is exceeded. If `spill_dir`
+    is given, evicted embeddings are written there as *.npy files and served from a memory map on later hits instead
+    of re-running the image encoder. The spill directory is bounded by `max_disk_bytes` with the same LRU policy.
+
+    Attributes:
+        max_items (int): Maximum number of embeddings held in memory, 0 for no limit.
+        max_bytes (int): Maximum total size in bytes of the embeddings held in memory, 0 for no limit.
+        spill_dir (Path | None): Directory for spilled embeddings, None to discard evicted entries.
+        max_disk_bytes (int): Maximum total size in bytes of the spilled embeddings, 0 for no limit.
+        hits (int): Number of lookups served from memory.
+        disk_hits (int): Number of lookups served from the spill directory.
+        misses (int): Number of lookups that required running the image encoder.
+        evictions (int): Number of entries evicted from memory.
+    """
+
+    def __init__(self, max_items=32, max_bytes=2 << 30, spill_dir=None, max_disk_bytes=0):
+        """Initialize an empty cache with the given memory and disk budgets."""
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()  # key -> tensor
+        self.disk = OrderedDict()  # key -> [file, nbytes, memmap or None until the first hit]
+        self.nbytes = 0
+        self.disk_nbytes = 0
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self):
+        """Return the number of cached embeddings in memory and on disk."""
+        return len(self.memory) + len(self.disk)
+
+    def __repr__(self):
+        """Return a one-line summary of cache usage and hit/miss counters."""
+        return (
+            f"{self.__class__.__name__}(items={len(self.memory)}, bytes={self.nbytes}, spilled={len(self.disk)}, "
+            f"hits={self.hits}, disk_hits={self.disk_hits}, misses={self.misses}, evictions={self.evictions})"
+        )
+
+    @staticmethod
+    def key(im0):
+        """Return a content hash of all source images, i.e. a list of HWC np.ndarray or a tensor batch."""
+        h = hashlib.blake2b(digest_size=16)
+        for x in im0 if isinstance(im0, (list, tuple)) else [im0]:  # every image, batches sharing one must not collide
+            if isinstance(x, torch.Tensor):
+                x = x.detach().cpu().numpy()
+            h.update(f"{x.shape}{x.dtype}".encode())
+            h.update(np.ascontiguousarray(x))
+        return h.hexdigest()
+
+    def get(self, key, device=None):
+        """Return the cached embedding for `key` on `device`, or None on a miss."""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return self.memory[key]
+        if key in self.disk:
+            self.disk.move_to_end(key)
+            entry = self.disk[key]
+            if entry[2] is None:
+                entry[2] = np.load(entry[0], mmap_mode="c")  # copy-on-write map, pages are read on access
+            self.disk_hits += 1
+            return torch.from_numpy(entry[2]).to(device)
+        self.misses += 1
+        return None
+
+    def put(self, key, x):
+        """Insert embedding `x` under `key`, evicting least-recently-used entries to stay within budget."""
+        if key in self.memory:
+            self.nbytes -= self.memory.pop(key).nbytes
+        if key in self.disk:  # the new embedding supersedes the spilled one, its file may still be mapped by a caller
+            f, nbytes = self.disk.pop(key)[:2]
+            self.disk_nbytes -= nbytes
+            f.unlink(missing_ok=True)
+        x = x.detach()
+        self.memory[key] = x
+        self.nbytes += x.nbytes
+        while len(self.memory) > 1 and (
+            (self.max_items and len(self.memory) > self.max_items) or (self.max_bytes and self.nbytes > self.max_bytes)
+        ):
+            k, v = self.memory.popitem(last=False)
+            self.nbytes -= v.nbytes
+            self.evictions += 1
+            if self.spill_dir:
+                self.spill(k, v)
+
+    def spill(self, key, x):
+        """Write an evicted embedding to the spill directory, dropping the oldest spilled entries if over budget."""
+        f = self.spill_dir / f"{key}_{self.evictions}.npy"  # fresh name, never overwrite a file that may be mapped
+        np.save(f, x.cpu().numpy())
+        self.disk[key] = [f, x.nbytes, None]
+        self.disk_nbytes += x.nbytes
+        while self.max_disk_bytes and self.disk_nbytes > self.max_disk_bytes and self.disk:
+            f, nbytes = self.disk.popitem(last=False)[1][:2]  # drops the memory map before unlinking
+            self.disk_nbytes -= nbytes
+            f.unlink(missing_ok=True)
+
+    def clear(self):
+        """Remove all cached embeddings, including spilled files, and reset the counters."""
+        files = [f for f, *_ in self.disk.values()]
+        self.memory.clear()
+        self.disk.clear()  # release the memory maps before removing their files
+        for f in files:
+            f.unlink(missing_ok=True)
+        self.nbytes = self.disk_nbytes = 0
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+
 class Predictor(BasePredictor):
     """
     Predictor class for the Segment Anything Model (SAM), extending BasePredictor.
@@ -50,6 +167,8 @@ class Predictor(BasePredictor):
         features (torch.Tensor): Extracted image features used for inference.
         prompts (dict): Collection of various prompt types, such as bounding boxes and points.
         segment_all (bool): Flag to control whether to segment all objects in the image or only specified ones.
+        embed_cache (EmbeddingCache | None): Optional image embedding cache, enabled with `set_cache`.
+        source_key (str | None): Content hash of the current source image, used to build embedding cache keys.
     """
 
     def __init__(self, cfg=DEFAULT_CFG, overrides=None, _callbacks=None):
@@ -73,6 +192,8 @@ class Predictor(BasePredictor):
         self.features = None
         self.prompts = {}
         self.segment_all = False
+        self.embed_cache = None
+        self.source_key = None
 
     def preprocess(self, im):
         """
@@ -90,6 +211,8 @@ class Predictor(BasePredictor):
         if self.im is not None:
             return self.im
         not_tensor = not isinstance(im, torch.Tensor)
+        if self.embed_cache is not None:
+            self.source_key = self.embed_cache.key(im)
         if not_tensor:
             im = np.stack(self.pre_transform(im))
             im = im[..., ::-1].transpose((0, 3, 1, 2))
@@ -149,7 +272,9 @@ class Predictor(BasePredictor):
 
         return self.prompt_inference(im, bboxes, points, labels, masks, multimask_output)
 
-    def prompt_inference(self, im, bboxes=None, points=None, labels=None, masks=None, multimask_output=False):
+    def prompt_inference(
+        self, im, bboxes=None, points=None, labels=None, masks=None, multimask_output=False, features=None
+    ):
         """
         Internal function for image segmentation inference based on cues like bounding boxes, points, and masks.
         Leverages SAM's specialized architecture for prompt-based, real-time segmentation.
@@ -161,6 +286,7 @@ class Predictor(BasePredictor):
             labels (np.ndarray | List, optional): Labels for point prompts, shape (N, ). 1 for foreground and 0 for background.
             masks (np.ndarray, optional): Low-resolution masks from previous predictions. Shape should be (N, H, W). For SAM, H=W=256.
             multimask_output (bool, optional): Flag to return multiple masks. Helpful for ambiguous prompts. Defaults to False.
+            features (torch.Tensor, optional): Precomputed image embeddings of `im`. Defaults to None.
 
         Returns:
             (tuple): Contains the following three elements.
@@ -168,7 +294,8 @@ class Predictor(BasePredictor):
                 - np.ndarray: An array of length C containing quality scores predicted by the model for each mask.
                 - np.ndarray: Low-resolution logits of shape CxHxW for subsequent inference, where H=W=256.
         """
-        features = self.model.image_encoder(im) if self.features is None else self.features
+        if features is None:
+            features = self.get_features(im) if self.features is None else self.features
 
         src_shape, dst_shape = self.batch[1][0].shape[:2], im.shape[2:]
         r = 1.0 if self.segment_all else min(dst_shape[0] / src_shape[0], dst_shape[1] / src_shape[1])
@@ -259,11 +386,14 @@ class Predictor(BasePredictor):
             points_scale = np.array([[w, h]])  # w, h
             # Crop image and interpolate to input size
             crop_im = F.interpolate(im[..., y1:y2, x1:x2], (ih, iw), mode="bilinear", align_corners=False)
+            features = self.get_features(crop_im, crop_region) if self.features is None else self.features
             # (num_points, 2)
             points_for_image = point_grids[layer_idx] * points_scale
             crop_masks, crop_scores, crop_bboxes = [], [], []
             for (points,) in batch_iterator(points_batch_size, points_for_image):
-                pred_mask, pred_score = self.prompt_inference(crop_im, points=points, multimask_output=True)
+                pred_mask, pred_score = self.prompt_inference(
+                    crop_im, points=points, multimask_output=True, features=features
+                )
                 # Interpolate predicted masks to input size
                 pred_mask = F.interpolate(pred_mask[None], (h, w), mode="bilinear", align_corners=False)[0]
                 idx = pred_score > conf_thres
@@ -334,6 +464,8 @@ class Predictor(BasePredictor):
         if model is None:
             model = build_sam(self.args.model)
         model.eval()
+        if self.embed_cache is not None:
+            self.embed_cache.clear()  # embeddings belong to the previous model
         self.model = model.to(device)
         self.device = device
         self.mean = torch.tensor([123.675, 116.28, 103.53]).view(-1, 1, 1).to(device)
@@ -418,10 +550,56 @@ class Predictor(BasePredictor):
         assert len(self.dataset) == 1, "`set_image` only supports setting one image!"
         for batch in self.dataset:
             im = self.preprocess(batch[1])
-            self.features = self.model.image_encoder(im)
+            self.features = self.get_features(im)
             self.im = im
             break
 
+    def get_features(self, im, crop_region=None):
+        """
+        Run the image encoder on a preprocessed image, reusing a cached embedding when one is available.
+
+        Cache keys combine the hash of the source image computed in `preprocess` with the input size and crop region,
+        so the preprocessed tensor itself is never copied back to the CPU for hashing.
+
+        Args:
+            im (torch.Tensor): The preprocessed input image in tensor format, with shape (N, C, H, W).
+            crop_region (List[int], optional): XYXY crop of the source image that `im` was resized from.
+
+        Returns:
+            (torch.Tensor): Image embeddings from `self.model.image_encoder`.
+        """
+        if self.embed_cache is None:
+            return self.model.image_encoder(im)
+        key = f"{self.source_key or self.embed_cache.key(im)}_{im.shape[2]}x{im.shape[3]}"
+        if crop_region is not None:
+            key += "_" + "_".join(str(int(x)) for x in crop_region)
+        features = self.embed_cache.get(key, self.device)
+        if features is None:
+            features = self.model.image_encoder(im)
+            self.embed_cache.put(key, features)
+        return features
+
+    def set_cache(self, max_items=32, max_bytes=2 << 30, spill_dir=None, max_disk_bytes=0):
+        """
+        Enable an LRU cache of image embeddings so that repeated prompts on the same images skip the image encoder.
+
+        Embeddings are keyed by a hash of the source image content, so the cache is shared across `set_image`,
+        prompted and segment-everything calls. Pass `max_items=0` to disable the cache.
+
+        Args:
+            max_items (int): Maximum number of embeddings held in memory, 0 disables caching.
+            max_bytes (int): Maximum total size in bytes of the embeddings held in memory, 0 for no limit.
+            spill_dir (str | Path, optional): Directory to spill evicted embeddings to as memory-mapped *.npy files.
+            max_disk_bytes (int): Maximum total size in bytes of the spilled embeddings, 0 for no limit.
+
+        Returns:
+            (EmbeddingCache | None): The new cache, or None if caching was disabled.
+        """
+        if self.embed_cache is not None:
+            self.embed_cache.clear()
+        self.embed_cache = EmbeddingCache(max_items, max_bytes, spill_dir, max_disk_bytes) if max_items else None
+        return self.embed_cache
+
     def set_prompts(self, prompts):
         """Set prompts in advance."""
         self.prompts = prompts
@@ -452,23 +630,16 @@ class Predictor(BasePredictor):
         if len(masks) == 0:
             return masks
 
-        # Filter small disconnected regions and holes
-        new_masks = []
-        scores = []
-        for mask in masks:
-            mask = mask.cpu().numpy().astype(np.uint8)
-            mask, changed = remove_small_regions(mask, min_area, mode="holes")
-            unchanged = not changed
-            mask, changed = remove_small_regions(mask, min_area, mode="islands")
-            unchanged = unchanged and not changed
-
-            new_masks.append(torch.as_tensor(mask).unsqueeze(0))
-            # Give score=0 to changed masks and 1 to unchanged masks so NMS prefers masks not needing postprocessing
-            scores.append(float(unchanged))
+        # Filter small disconnected regions and holes, all masks at once
+        new_masks = masks.cpu().numpy().astype(np.uint8)
+        new_masks, holes = batched_remove_small_regions(new_masks, min_area, mode="holes")
+        new_masks, islands = batched_remove_small_regions(new_masks, min_area, mode="islands")
+        new_masks = torch.from_numpy(new_masks).to(masks.device)
+        # Give score=0 to changed masks and 1 to unchanged masks so NMS prefers masks not needing postprocessing
+        scores = torch.from_numpy(~(holes | islands)).to(masks.device, torch.float32)
 
         # Recalculate boxes and remove any new duplicates
-        new_masks = torch.cat(new_masks, dim=0)
         boxes = batched_mask_to_box(new_masks)
-        keep = torchvision.ops.nms(boxes.float(), torch.as_tensor(scores), nms_thresh)
+        keep = torchvision.ops.nms(boxes.float(), scores, nms_thresh)
 
-        return new_masks[keep].to(device=masks.device, dtype=masks.dtype), keep
+        return new_masks[keep].to(dtype=masks.dtype), keep
@@ -3,6 +3,7 @@
 from ultralytics.engine.predictor import BasePredictor
 from ultralytics.engine.results import Results
 from ultralytics.utils import ops
+from ultralytics.utils.checks import check_end2end
 
 
 class DetectionPredictor(BasePredictor):
@@ -20,16 +21,27 @@ class DetectionPredictor(BasePredictor):
         ```
     """
 
+    def setup_model(self, model, verbose=True):
+        """Initialize the model and warn if an end2end export was exported with a higher conf than requested."""
+        super().setup_model(model, verbose)
+        check_end2end(getattr(self.model, "end2end", False), self.args.conf, self.args.iou)
+
     def postprocess(self, preds, img, orig_imgs):
         """Post-processes predictions and returns a list of Results objects."""
-        preds = ops.non_max_suppression(
-            preds,
-            self.args.conf,
-            self.args.iou,
-            agnostic=self.args.agnostic_nms,
-            max_det=self.args.max_det,
-            classes=self.args.classes,
-        )
+        if getattr(self.model, "end2end", False):  # NMS embedded in the exported graph
+            preds = ops.filter_end2end(preds, self.args.conf, self.args.classes, self.args.max_det)
+        else:
+            preds = ops.non_max_suppression(
+                preds,
+                self.args.conf,
+                self.args.iou,
+                agnostic=self.args.agnostic_nms,
+                max_det=self.args.max_det,
+                batched=self.args.batch_nms,
+                nms_mode=self.args.nms_mode,
+                nms_iou=self.args.nms_iou,
+                classes=self.args.classes,
+            )
 
         if not isinstance(orig_imgs, list):  # input images are a torch.Tensor, not a list
             orig_imgs = ops.convert_torch2numpy_batch(orig_imgs)
@@ -85,7 +85,11 @@ class DetectionTrainer(BaseTrainer):
         # TODO: self.model.class_weights = labels_to_class_weights(dataset.labels, nc).to(device) * nc
 
     def get_model(self, cfg=None, weights=None, verbose=True):
-        """Return a YOLO detection model."""
+        """Return a YOLO detection model, or a pruned model as is since its widths no longer follow its YAML."""
+        if getattr(weights, "pruned", False):
+            for p in weights.parameters():  # loaded checkpoints are frozen
+                p.requires_grad = True
+            return weights
         model = DetectionModel(cfg, nc=self.data["nc"], verbose=verbose and RANK == -1)
         if weights:
             model.load(weights)
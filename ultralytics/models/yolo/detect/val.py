@@ -9,8 +9,8 @@ import torch
 from ultralytics.data import build_dataloader, build_yolo_dataset, converter
 from ultralytics.engine.validator import BaseValidator
 from ultralytics.utils import LOGGER, ops
-from ultralytics.utils.checks import check_requirements
-from ultralytics.utils.metrics import ConfusionMatrix, DetMetrics, box_iou
+from ultralytics.utils.checks import check_end2end, check_requirements
+from ultralytics.utils.metrics import ConfusionMatrix, DetMetrics, StatsAccumulator, box_iou
 from ultralytics.utils.plotting import output_to_target, plot_images
 
 
@@ -70,12 +70,28 @@ class DetectionValidator(BaseValidator):
         self.args.save_json |= self.is_coco and not self.training  # run on final val if training COCO
         self.names = model.names
         self.nc = len(model.names)
+        self.end2end = getattr(model, "end2end", False)  # NMS embedded in the exported graph
+        check_end2end(self.end2end, self.args.conf, self.args.iou)  # warn if conf is below the export conf
         self.metrics.names = self.names
         self.metrics.plot = self.args.plots
         self.confusion_matrix = ConfusionMatrix(nc=self.nc, conf=self.args.conf)
         self.seen = 0
         self.jdict = []
-        self.stats = dict(tp=[], conf=[], pred_cls=[], target_cls=[])
+        self.stats = self.init_stats("tp")
+
+    def init_stats(self, *tp_keys):
+        """Returns empty per-image statistics lists, or a streaming StatsAccumulator if args.stream_metrics is set."""
+        if self.args.stream_metrics:
+            return StatsAccumulator(self.nc, self.niou, keys=tp_keys)
+        return dict(**{k: [] for k in tp_keys}, conf=[], pred_cls=[], target_cls=[])
+
+    def update_stats(self, stat):
+        """Adds the statistics of one image to self.stats."""
+        if isinstance(self.stats, StatsAccumulator):
+            self.stats.update(**stat)
+        else:
+            for k in self.stats.keys():
+                self.stats[k].append(stat[k])
 
     def get_desc(self):
         """Return a formatted string summarizing class metrics of YOLO model."""
@@ -83,6 +99,8 @@ class DetectionValidator(BaseValidator):
 
     def postprocess(self, preds):
         """Apply Non-maximum suppression to prediction outputs."""
+        if self.end2end:
+            return ops.filter_end2end(preds, self.args.conf, max_det=self.args.max_det)
         return ops.non_max_suppression(
             preds,
             self.args.conf,
@@ -91,6 +109,9 @@ class DetectionValidator(BaseValidator):
             multi_label=True,
             agnostic=self.args.single_cls,
             max_det=self.args.max_det,
+            batched=self.args.batch_nms,
+            nms_mode=self.args.nms_mode,
+            nms_iou=self.args.nms_iou,
         )
 
     def _prepare_batch(self, si, batch):
@@ -130,8 +151,7 @@ class DetectionValidator(BaseValidator):
             stat["target_cls"] = cls
             if npr == 0:
                 if nl:
-                    for k in self.stats.keys():
-                        self.stats[k].append(stat[k])
+                    self.update_stats(stat)
                     # TODO: obb has not supported confusion_matrix yet.
                     if self.args.plots and self.args.task != "obb":
                         self.confusion_matrix.process_batch(detections=None, gt_bboxes=bbox, gt_cls=cls)
@@ -150,8 +170,7 @@ class DetectionValidator(BaseValidator):
                 # TODO: obb has not supported confusion_matrix yet.
                 if self.args.plots and self.args.task != "obb":
                     self.confusion_matrix.process_batch(predn, bbox, cls)
-            for k in self.stats.keys():
-                self.stats[k].append(stat[k])
+            self.update_stats(stat)
 
             # Save
             if self.args.save_json:
@@ -167,7 +186,10 @@ class DetectionValidator(BaseValidator):
 
     def get_stats(self):
         """Returns metrics statistics and results dictionary."""
-        stats = {k: torch.cat(v, 0).cpu().numpy() for k, v in self.stats.items()}  # to numpy
+        if isinstance(self.stats, StatsAccumulator):
+            stats = self.stats.stats()  # compressed rows with npred predictions each
+        else:
+            stats = {k: torch.cat(v, 0).cpu().numpy() for k, v in self.stats.items()}  # to numpy
         if len(stats) and stats["tp"].any():
             self.metrics.process(**stats)
         self.nt_per_class = np.bincount(
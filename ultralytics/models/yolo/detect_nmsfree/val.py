@@ -136,6 +136,8 @@ class NMSFreeDetectionValidator(DetectionValidator):
 
         if isinstance(preds, (list, tuple)):
             preds = preds[0]
+        if self.end2end:  # (b, max_det, 6) xyxy, conf, cls from an end2end ONNX export
+            return ops.filter_end2end(preds, self.args.conf, max_det=self.args.max_det)
         
         preds = preds.transpose(-1, -2)
         boxes, scores, labels = ops.nmsfree_postprocess(preds, self.args.max_det, self.nc)
@@ -33,6 +33,9 @@ class SegmentationPredictor(DetectionPredictor):
             self.args.iou,
             agnostic=self.args.agnostic_nms,
             max_det=self.args.max_det,
+            batched=self.args.batch_nms,
+            nms_mode=self.args.nms_mode,
+            nms_iou=self.args.nms_iou,
             nc=len(self.model.names),
             classes=self.args.classes,
         )
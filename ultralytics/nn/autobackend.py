@@ -3,7 +3,11 @@
 import ast
 import contextlib
 import json
+import os
 import platform
+import queue
+import threading
+import time
 import zipfile
 from collections import OrderedDict, namedtuple
 from pathlib import Path
@@ -19,6 +23,9 @@ from ultralytics.utils.checks import check_requirements, check_suffix, check_ver
 from ultralytics.utils.downloads import attempt_download_asset, is_url
 
 
+ORT_DEFAULTS = dict(threads=0, inter_threads=0, opt="all", parallel=False, iobinding=False, sessions=1)
+
+
 def check_class_names(names):
     """
     Check class names.
@@ -50,6 +57,40 @@ def default_class_names(data=None):
     return {i: f"class{i}" for i in range(999)}  # return default if above errors
 
 
+def ort_session_options(onnxruntime, ort):
+    """
+    Build ONNX Runtime SessionOptions from the 'ort_*' settings.
+
+    Without an explicit thread count the CPU cores are split between the pooled sessions, which then also stop spinning
+    their idle threads so they do not compete for the cores.
+
+    Args:
+        onnxruntime (module): The imported onnxruntime package.
+        ort (dict): ONNX Runtime options as in ORT_DEFAULTS.
+
+    Returns:
+        (onnxruntime.SessionOptions): The session options.
+    """
+    levels = {
+        "disable": onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        "basic": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        "extended": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        "all": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    }
+    if ort["opt"] not in levels:
+        raise ValueError(f"Invalid ort_opt='{ort['opt']}'. Valid graph optimization levels are {tuple(levels)}")
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = levels[ort["opt"]]
+    mode = onnxruntime.ExecutionMode
+    options.execution_mode = mode.ORT_PARALLEL if ort["parallel"] else mode.ORT_SEQUENTIAL
+    n = max(ort["sessions"], 1)
+    options.intra_op_num_threads = ort["threads"] or (max((os.cpu_count() or 1) // n, 1) if n > 1 else 0)
+    options.inter_op_num_threads = ort["inter_threads"]
+    if n > 1:
+        options.add_session_config_entry("session.intra_op.allow_spinning", "0")
+    return options
+
+
 class AutoBackend(nn.Module):
     """
     Handles dynamic backend selection for running inference using Ultralytics YOLO models.
@@ -88,6 +129,7 @@ class AutoBackend(nn.Module):
         fp16=False,
         fuse=True,
         verbose=True,
+        ort=None,
     ):
         """
         Initialize the AutoBackend for inference.
@@ -100,6 +142,8 @@ class AutoBackend(nn.Module):
             fp16 (bool): Enable half-precision inference. Supported only on specific backends. Defaults to False.
             fuse (bool): Fuse Conv2D + BatchNorm layers for optimization. Defaults to True.
             verbose (bool): Enable verbose logging. Defaults to True.
+            ort (dict, optional): ONNX Runtime options, the 'ort_*' settings without prefix, i.e. {'threads': 4}.
+                Defaults to None for ORT_DEFAULTS.
         """
         super().__init__()
         w = str(weights[0] if isinstance(weights, list) else weights)
@@ -123,6 +167,8 @@ class AutoBackend(nn.Module):
         fp16 &= pt or jit or onnx or xml or engine or nn_module or triton  # FP16
         nhwc = coreml or saved_model or pb or tflite or edgetpu  # BHWC formats (vs torch BCWH)
         stride = 32  # default stride
+        end2end = False  # ONNX graph with uint8 input and NMS, i.e. exported with end2end=True
+        dynamic = False  # dynamic batch and image size axes, i.e. exported with dynamic=True
         model, metadata = None, None
 
         # Set device
@@ -175,9 +221,26 @@ class AutoBackend(nn.Module):
             import onnxruntime
 
             providers = ["CUDAExecutionProvider", "CPUExecutionProvider"] if cuda else ["CPUExecutionProvider"]
-            session = onnxruntime.InferenceSession(w, providers=providers)
+            ort = {**ORT_DEFAULTS, **(ort or {})}
+            if ort["iobinding"] and cuda:
+                LOGGER.warning("WARNING ⚠️ ort_iobinding=True only binds CPU outputs, i.e. use device=cpu")
+                ort["iobinding"] = False
+            options = ort_session_options(onnxruntime, ort)
+            sessions = [
+                onnxruntime.InferenceSession(w, sess_options=options, providers=providers)
+                for _ in range(max(ort["sessions"], 1))
+            ]
+            session = sessions[0]
             output_names = [x.name for x in session.get_outputs()]
             metadata = session.get_modelmeta().custom_metadata_map  # metadata
+            ort_pool = queue.Queue()  # indices of idle sessions
+            for i in range(len(sessions)):
+                ort_pool.put(i)
+            ort_bindings = [s.io_binding() for s in sessions] if ort["iobinding"] else None
+            ort_iobinding = ort["iobinding"]
+            ort_local = threading.local()  # per-thread output buffers, keyed by input shape
+            ort_lock = threading.Lock()
+            ort_stats = dict(calls=0, allocations=0, allocated_bytes=0, latency_ms=0.0, last_latency_ms=0.0)
         elif xml:  # OpenVINO
             LOGGER.info(f"Loading {w} for OpenVINO inference...")
             check_requirements("openvino>=2023.0")  # requires openvino-dev: https://pypi.org/project/openvino-dev/
@@ -338,7 +401,7 @@ class AutoBackend(nn.Module):
             for k, v in metadata.items():
                 if k in ("stride", "batch"):
                     metadata[k] = int(v)
-                elif k in ("imgsz", "names", "kpt_shape") and isinstance(v, str):
+                elif k in ("imgsz", "names", "kpt_shape", "end2end", "dynamic") and isinstance(v, str):
                     metadata[k] = eval(v)
             stride = metadata["stride"]
             task = metadata["task"]
@@ -346,6 +409,8 @@ class AutoBackend(nn.Module):
             imgsz = metadata["imgsz"]
             names = metadata["names"]
             kpt_shape = metadata.get("kpt_shape")
+            end2end = metadata.get("end2end", False)
+            dynamic = metadata.get("dynamic", dynamic)
         elif not (pt or triton or nn_module):
             LOGGER.warning(f"WARNING ⚠️ Metadata not found for 'model={weights}'")
 
@@ -389,8 +454,10 @@ class AutoBackend(nn.Module):
             self.net.setInput(im)
             y = self.net.forward()
         elif self.onnx:  # ONNX Runtime
+            if self.end2end:  # graph normalizes uint8 input
+                im = (im * 255).round().to(torch.uint8)
             im = im.cpu().numpy()  # torch to numpy
-            y = self.session.run(self.output_names, {self.session.get_inputs()[0].name: im})
+            y = self._ort_run(im)
         elif self.xml:  # OpenVINO
             im = im.cpu().numpy()  # FP32
             y = list(self.ov_compiled_model(im).values())
@@ -490,6 +557,49 @@ class AutoBackend(nn.Module):
         else:
             return self.from_numpy(y)
 
+    def _ort_run(self, im):
+        """
+        Run ONNX Runtime on an idle session of the pool and update the `ort_stats` counters.
+
+        With IOBinding the outputs are written into buffers allocated on the first call of each thread for each input
+        shape, and returned as tensors sharing them, i.e. they are only valid until the next call from the same thread.
+
+        Args:
+            im (np.ndarray): The input image batch.
+
+        Returns:
+            (List[np.ndarray] | List[torch.Tensor]): The model outputs.
+        """
+        i = self.ort_pool.get()
+        try:
+            session = self.sessions[i]
+            name = session.get_inputs()[0].name
+            buffers = self.ort_local.__dict__.setdefault("buffers", {}) if self.ort_iobinding else {}
+            y = buffers.get(im.shape)
+            t = time.perf_counter()
+            if y is None:  # ONNX Runtime allocates the outputs
+                y = session.run(self.output_names, {name: im})
+                allocated = sum(x.nbytes for x in y)
+                if self.ort_iobinding:
+                    buffers[im.shape] = y = [np.ascontiguousarray(x) for x in y]
+            else:  # bind the reused buffers
+                binding, allocated = self.ort_bindings[i], 0
+                binding.bind_cpu_input(name, np.ascontiguousarray(im))
+                for k, x in zip(self.output_names, y):
+                    binding.bind_output(k, "cpu", 0, x.dtype, x.shape, x.ctypes.data)
+                session.run_with_iobinding(binding)
+            dt = (time.perf_counter() - t) * 1e3
+        finally:
+            self.ort_pool.put(i)
+        with self.ort_lock:
+            s = self.ort_stats
+            s["calls"] += 1
+            s["allocations"] += len(y) if allocated else 0
+            s["allocated_bytes"] += allocated
+            s["latency_ms"] += dt
+            s["last_latency_ms"] = dt
+        return [torch.from_numpy(x) for x in y] if self.ort_iobinding else y
+
     def from_numpy(self, x):
         """
         Convert a numpy array to a tensor.
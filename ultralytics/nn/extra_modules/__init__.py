@@ -1,10 +1,14 @@
-from .afpn import *
-from .attention import *
-from .block import *
-from .head import *
-from .rep_block import *
-from .kernel_warehouse import *
-from .dynamic_snake_conv import *
-from .orepa import *
-from .RFAConv import *
-from .hcfnet import *
\ No newline at end of file
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""Extra model building blocks, imported lazily on first attribute access, see `ultralytics.nn.registry`."""
+
+from ultralytics.nn.registry import EXTRA_MODULES, ModuleRegistry, module_table
+
+MODULES = ModuleRegistry(module_table(__name__, EXTRA_MODULES))
+__all__ = tuple(MODULES.names)
+
+
+def __getattr__(name):
+    """Import the extra module providing `name` on first access."""
+    if name in MODULES:
+        return MODULES.get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
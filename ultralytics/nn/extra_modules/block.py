@@ -714,8 +714,9 @@ class OD_Attention(nn.Module):
         return self.func_channel(x), self.func_filter(x), self.func_spatial(x), self.func_kernel(x)
     
     def switch_to_deploy(self):
-        self.fc = fuse_conv_bn(self.fc, self.bn)
-        del self.bn
+        if hasattr(self, 'bn'):
+            self.fc = fuse_conv_bn(self.fc, self.bn)
+            del self.bn
 
 
 class ODConv2d(nn.Module):
@@ -3315,10 +3316,12 @@ class UniRepLKNetBlock(nn.Module):
     def switch_to_deploy(self):
         if hasattr(self.dwconv, 'switch_to_deploy'):
             self.dwconv.switch_to_deploy()
-        if hasattr(self.norm, 'running_var') and hasattr(self.dwconv, 'lk_origin'):
+        conv = getattr(self.dwconv, 'lk_origin', self.dwconv)  # merged DilatedReparamBlock or plain k=1/3/5 conv
+        if hasattr(self.norm, 'running_var') and isinstance(conv, nn.Conv2d):
             std = (self.norm.running_var + self.norm.eps).sqrt()
-            self.dwconv.lk_origin.weight.data *= (self.norm.weight / std).view(-1, 1, 1, 1)
-            self.dwconv.lk_origin.bias.data = self.norm.bias + (self.dwconv.lk_origin.bias - self.norm.running_mean) * self.norm.weight / std
+            bias = 0 if conv.bias is None else conv.bias.data
+            conv.weight.data *= (self.norm.weight / std).view(-1, 1, 1, 1)
+            conv.bias = nn.Parameter(self.norm.bias + (bias - self.norm.running_mean) * self.norm.weight / std)
             self.norm = nn.Identity()
         if self.gamma is not None:
             final_scale = self.gamma.data
@@ -150,6 +150,8 @@ class DEConv(nn.Module):
         return self.act(res)
     
     def switch_to_deploy(self):
+        if not hasattr(self, 'conv1_1'):
+            return
         w1, b1 = self.conv1_1.get_weight()
         w2, b2 = self.conv1_2.get_weight()
         w3, b3 = self.conv1_3.get_weight()
@@ -164,8 +166,9 @@ class DEConv(nn.Module):
         del self.conv1_3
         del self.conv1_4
         
-        # self.conv1_5 = fuse_conv_and_bn(self.conv1_5, self.bn)
-        # del self.bn
+        if isinstance(self.bn, nn.BatchNorm2d):  # DEConv_GN keeps its GroupNorm
+            self.conv1_5 = fuse_conv_and_bn(self.conv1_5, self.bn)
+            del self.bn
 
 if __name__ == '__main__':
     data = torch.randn((1, 128, 64, 64)).cuda()
@@ -301,7 +301,8 @@ class DetectAux(nn.Module):
             b[-1].bias.data[:m.nc] = math.log(5 / m.nc / (640 / s) ** 2)  # cls (.01 objects, 80 classes, 640 img)
     
     def switch_to_deploy(self):
-        del self.cv4, self.cv5, self.dfl_aux
+        if hasattr(self, 'dfl_aux'):
+            del self.cv4, self.cv5, self.dfl_aux
 
 class Detect_SEAM(nn.Module):
     """YOLOv8 Detect head for detection models."""
@@ -1340,7 +1341,8 @@ class Detect_NMSFree(nn.Module):
         return dist2bbox(self.dfl(bboxes), self.anchors.unsqueeze(0), xywh=True, dim=1) * self.strides
 
     def switch_to_deploy(self):
-        del self.cv2, self.cv3
+        if hasattr(self, 'cv2'):
+            del self.cv2, self.cv3
 
 class DEConv_GN(DEConv):
     """Standard convolution with args(ch_in, ch_out, kernel, stride, padding, groups, dilation, activation)."""
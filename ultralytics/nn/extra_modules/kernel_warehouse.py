@@ -104,6 +104,17 @@ class Attention(nn.Module):
             + self.temp_value * self.temp_bias.to(x.device).view(1, -1)
         return x.reshape(-1, self.kw_planes_per_mixture)[:, :-1]
 
+    @torch.no_grad()
+    def switch_to_deploy(self):
+        # fold norm1 into fc1, the warehouse cells are shared between layers so the dynamic kernels stay as they are
+        if isinstance(self.norm1, nn.BatchNorm1d):
+            std = (self.norm1.running_var + self.norm1.eps).sqrt()
+            bias = 0 if self.fc1.bias is None else self.fc1.bias
+            fc1 = nn.Linear(self.fc1.in_features, self.fc1.out_features, bias=True).to(self.fc1.weight.device)
+            fc1.weight.copy_(self.fc1.weight * (self.norm1.weight / std).view(-1, 1))
+            fc1.bias.copy_(self.norm1.bias + (bias - self.norm1.running_mean) * self.norm1.weight / std)
+            self.fc1, self.norm1 = fc1, nn.Identity()
+
 class KWconvNd(nn.Module):
     dimension = None
     permute = None
@@ -267,7 +267,7 @@ class OREPA(nn.Module):
         return transI_fusebn(self.weight_gen(), self.bn)
 
     def switch_to_deploy(self):
-        if hasattr(self, 'or1x1_reparam'):
+        if hasattr(self, 'orepa_reparam'):
             return
         kernel, bias = self.get_equivalent_kernel_bias()
         self.orepa_reparam = nn.Conv2d(in_channels=self.in_channels, out_channels=self.out_channels,
@@ -410,6 +410,8 @@ class ConvBN(nn.Module):
             return self.nonlinear(self.conv(x))
 
     def switch_to_deploy(self):
+        if not hasattr(self, 'bn'):
+            return
         kernel, bias = transI_fusebn(self.conv.weight, self.bn)
         conv = nn.Conv2d(in_channels=self.conv.in_channels, out_channels=self.conv.out_channels, kernel_size=self.conv.kernel_size,
                                       stride=self.conv.stride, padding=self.conv.padding, dilation=self.conv.dilation, groups=self.conv.groups, bias=True)
@@ -600,7 +602,8 @@ class RepVGGBlock_OREPA(nn.Module):
 
         else:
             self.rbr_identity = nn.BatchNorm2d(num_features=in_channels) if out_channels == in_channels and stride == 1 else None
-            self.rbr_dense = OREPA_3x3_RepVGG(in_channels=in_channels, out_channels=out_channels, kernel_size=kernel_size, stride=stride, padding=padding, groups=groups, dilation=1)
+            # the dense branch must stay linear, or it cannot be merged with the 1x1 and identity branches
+            self.rbr_dense = OREPA_3x3_RepVGG(in_channels=in_channels, out_channels=out_channels, kernel_size=kernel_size, stride=stride, padding=padding, groups=groups, dilation=1, act=False)
             self.rbr_1x1 = ConvBN(in_channels=in_channels, out_channels=out_channels, kernel_size=1, stride=stride, groups=groups, dilation=1)
 
     def forward(self, inputs):
@@ -0,0 +1,171 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""
+Lazy name-to-module registry for the optional model building blocks.
+
+The extra modules and backbones pull in timm, einops and compiled-op probes at import time. Instead of star-importing
+them, their exported names are listed in the `EXTRA_MODULES` and `BACKBONES` tables below and bound to the `Unloaded`
+placeholder, and a module is only imported once one of its names is resolved, i.e. by `parse_model` from a model YAML
+or by unpickling a checkpoint that uses it. A name added to a module's `__all__` must also be added to its table entry.
+
+Usage:
+    from ultralytics.nn.registry import ModuleRegistry
+
+    registry = ModuleRegistry({"C2f_Faster": "ultralytics.nn.extra_modules.block"}, namespace=globals())
+    C2f_Faster = registry.get("C2f_Faster")  # imports ultralytics.nn.extra_modules.block
+"""
+
+import importlib
+import sys
+
+# Names exported by each ultralytics.nn.extra_modules.<module>, in star-import order
+EXTRA_MODULES = {
+    "afpn": ("AFPN_P345", "AFPN_P345_Custom", "AFPN_P2345", "AFPN_P2345_Custom"),
+    "attention": (
+        "EMA", "SimAM", "SpatialGroupEnhance", "BiLevelRoutingAttention", "BiLevelRoutingAttention_nchw",
+        "TripletAttention", "CoordAtt", "BAMBlock", "EfficientAttention", "LSKBlock", "SEAttention", "CPCA", "MPCA",
+        "deformable_LKA", "EffectiveSEModule", "LSKA", "SegNext_Attention", "DAttention", "FocusedLinearAttention",
+        "MLCA", "TransNeXt_AggregatedAttention", "LocalWindowAttention", "ELA", "CAA",
+    ),
+    "block": (
+        "DyHeadBlock", "DyHeadBlockWithDCNV3", "Fusion", "C2f_Faster", "C3_Faster", "C3_ODConv", "C2f_ODConv",
+        "Partial_conv3", "C2f_Faster_EMA", "C3_Faster_EMA", "C2f_DBB", "GSConv", "GSConvns", "VoVGSCSP", "VoVGSCSPns",
+        "VoVGSCSPC", "C2f_CloAtt", "C3_CloAtt", "SCConv", "C3_SCConv", "C2f_SCConv", "ScConv", "C3_ScConv",
+        "C2f_ScConv", "LAWDS", "EMSConv", "EMSConvP", "C3_EMSC", "C3_EMSCP", "C2f_EMSC", "C2f_EMSCP", "RCSOSA", "C3_KW",
+        "C2f_KW", "C3_DySnakeConv", "C2f_DySnakeConv", "DCNv2", "C3_DCNv2", "C2f_DCNv2", "DCNV3_YOLO", "C3_DCNv3",
+        "C2f_DCNv3", "FocalModulation", "C3_OREPA", "C2f_OREPA", "C3_DBB", "C3_REPVGGOREPA", "C2f_REPVGGOREPA",
+        "C3_DCNv2_Dynamic", "C2f_DCNv2_Dynamic", "SimFusion_3in", "SimFusion_4in", "IFM", "InjectionMultiSum_Auto_pool",
+        "PyramidPoolAgg", "AdvPoolFusion", "TopBasicLayer", "C3_ContextGuided", "C2f_ContextGuided", "C3_MSBlock",
+        "C2f_MSBlock", "ContextGuidedBlock_Down", "C3_DLKA", "C2f_DLKA", "CSPStage", "SPDConv", "BiFusion", "RepBlock",
+        "C3_EMBC", "C2f_EMBC", "SPPF_LSKA", "C3_DAttention", "C2f_DAttention", "C3_Parc", "C2f_Parc", "C3_DWR",
+        "C2f_DWR", "C3_RFAConv", "C2f_RFAConv", "C3_RFCBAMConv", "C2f_RFCBAMConv", "C3_RFCAConv", "C2f_RFCAConv",
+        "Ghost_HGBlock", "Rep_HGBlock", "C3_FocusedLinearAttention", "C2f_FocusedLinearAttention", "C3_MLCA",
+        "C2f_MLCA", "AKConv", "C3_AKConv", "C2f_AKConv", "C3_UniRepLKNetBlock", "C2f_UniRepLKNetBlock", "C3_DRB",
+        "C2f_DRB", "C3_DWR_DRB", "C2f_DWR_DRB", "Zoom_cat", "ScalSeq", "DynamicScalSeq", "Add", "CSP_EDLAN",
+        "asf_attention_model", "C2f_AggregatedAtt", "C3_AggregatedAtt", "SDI", "DCNV4_YOLO", "C3_DCNv4", "C2f_DCNv4",
+        "DyHeadBlockWithDCNV4", "ChannelAttention_HSFPN", "Multiply", "DySample", "CARAFE", "HWD", "SEAM", "MultiSEAM",
+        "C2f_SWC", "C3_SWC", "C3_iRMB", "C2f_iRMB", "C3_iRMB_Cascaded", "C2f_iRMB_Cascaded", "C3_iRMB_DRB",
+        "C2f_iRMB_DRB", "C3_iRMB_SWC", "C2f_iRMB_SWC", "C3_VSS", "C2f_VSS", "C3_LVMB", "C2f_LVMB", "RepNCSPELAN4",
+        "DBBNCSPELAN4", "OREPANCSPELAN4", "DRBNCSPELAN4", "ADown", "V7DownSampling", "CBLinear", "CBFuse", "Silence",
+        "C3_DynamicConv", "C2f_DynamicConv", "C3_GhostDynamicConv", "C2f_GhostDynamicConv", "Dynamic_HGBlock", "C3_RVB",
+        "C2f_RVB", "C3_RVB_SE", "C2f_RVB_SE", "C3_RVB_EMA", "C2f_RVB_EMA", "DGCST", "C3_RetBlock", "C2f_RetBlock",
+        "ELA_HSFPN", "CA_HSFPN", "CAA_HSFPN", "C3_PKIModule", "C2f_PKIModule", "RepNCSPELAN4_CAA", "FocusFeature",
+        "C3_FADC", "C2f_FADC", "C3_PPA", "C2f_PPA", "CSMHSA", "SRFD", "DRFD", "CFC_CRB", "SFC_G2", "CGAFusion", "CAFM",
+        "CAFMFusion", "RGCSPELAN", "C3_Faster_CGLU", "C2f_Faster_CGLU", "SDFM", "PSFM", "C3_Star", "C2f_Star",
+        "C3_Star_CAA", "C2f_Star_CAA", "C3_KAN", "C2f_KAN", "EIEStem", "C3_EIEM", "C2f_EIEM",
+        "ContextGuideFusionModule", "C3_DEConv", "C2f_DEConv", "C3_SMPCGLU", "C2f_SMPCGLU", "C3_Heat", "C2f_Heat",
+        "PSA", "SBA",
+    ),
+    "head": (
+        "Detect_DyHead", "Detect_DyHeadWithDCNV3", "Detect_DyHeadWithDCNV4", "Detect_AFPN_P345",
+        "Detect_AFPN_P345_Custom", "Detect_AFPN_P2345", "Detect_AFPN_P2345_Custom", "Detect_Efficient", "DetectAux",
+        "Segment_Efficient", "Detect_SEAM", "Detect_MultiSEAM", "Detect_DyHead_Prune", "Detect_LSCD", "Segment_LSCD",
+        "Pose_LSCD", "OBB_LSCD", "Detect_TADDH", "Segment_TADDH", "Pose_TADDH", "OBB_TADDH", "Detect_LADH",
+        "Segment_LADH", "Pose_LADH", "OBB_LADH", "Detect_LSCSBD", "Segment_LSCSBD", "Pose_LSCSBD", "OBB_LSCSBD",
+        "Detect_NMSFree", "Detect_LSDECD", "Segment_LSDECD", "Pose_LSDECD", "OBB_LSDECD",
+    ),
+    "rep_block": ("DiverseBranchBlock",),
+    "kernel_warehouse": ("KWConv", "Warehouse_Manager"),
+    "dynamic_snake_conv": ("DySnakeConv",),
+    "orepa": ("OREPA", "OREPA_LargeConv", "RepVGGBlock_OREPA"),
+    "RFAConv": ("RFAConv", "RFCBAMConv", "RFCAConv"),
+    "hcfnet": ("PPA", "DASI"),
+}
+
+# Names exported by each ultralytics.nn.backbone.<module>, in star-import order
+BACKBONES = {
+    "convnextv2": (
+        "convnextv2_atto", "convnextv2_femto", "convnextv2_pico", "convnextv2_nano", "convnextv2_tiny",
+        "convnextv2_base", "convnextv2_large", "convnextv2_huge",
+    ),
+    "fasternet": ("fasternet_t0", "fasternet_t1", "fasternet_t2", "fasternet_s", "fasternet_m", "fasternet_l"),
+    "efficientViT": (
+        "EfficientViT_M0", "EfficientViT_M1", "EfficientViT_M2", "EfficientViT_M3", "EfficientViT_M4",
+        "EfficientViT_M5",
+    ),
+    "EfficientFormerV2": (
+        "efficientformerv2_s0", "efficientformerv2_s1", "efficientformerv2_s2", "efficientformerv2_l",
+    ),
+    "VanillaNet": (
+        "vanillanet_5", "vanillanet_6", "vanillanet_7", "vanillanet_8", "vanillanet_9", "vanillanet_10",
+        "vanillanet_11", "vanillanet_12", "vanillanet_13", "vanillanet_13_x1_5", "vanillanet_13_x1_5_ada_pool",
+    ),
+    "revcol": ("RevCol",),
+    "lsknet": ("lsknet_t", "lsknet_s"),
+    "SwinTransformer": ("SwinTransformer_Tiny",),
+    "repvit": ("repvit_m0_9", "repvit_m1_0", "repvit_m1_1", "repvit_m1_5", "repvit_m2_3"),
+    "CSwomTramsformer": ("CSWin_tiny", "CSWin_small", "CSWin_base", "CSWin_large"),
+    "UniRepLKNet": (
+        "unireplknet_a", "unireplknet_f", "unireplknet_p", "unireplknet_n", "unireplknet_t", "unireplknet_s",
+        "unireplknet_b", "unireplknet_l", "unireplknet_xl",
+    ),
+    "TransNext": (
+        "transnext_micro", "transnext_tiny", "transnext_small", "transnext_base", "AggregatedAttention",
+        "get_relative_position_cpb",
+    ),
+    "rmt": ("RMT_T", "RMT_S", "RMT_B", "RMT_L"),
+    "pkinet": ("PKINET_T", "PKINET_S", "PKINET_B"),
+    "mobilenetv4": (
+        "MobileNetV4ConvSmall", "MobileNetV4ConvMedium", "MobileNetV4ConvLarge", "MobileNetV4HybridMedium",
+        "MobileNetV4HybridLarge",
+    ),
+    "starnet": ("starnet_s050", "starnet_s100", "starnet_s150", "starnet_s1", "starnet_s2", "starnet_s3", "starnet_s4"),
+}
+
+
+def module_table(package, modules):
+    """Return the name to import path table of `modules`, a {module: names} dict of submodules of `package`."""
+    return {n: f"{package}.{m}" for m, names in modules.items() for n in names}
+
+
+class Unloaded:
+    """Placeholder bound to registry names whose module is not imported yet, it equals no module and no instance."""
+
+
+class ModuleRegistry:
+    """
+    Registry mapping exported names to the modules defining them, importing modules on first use.
+
+    Attributes:
+        modules (tuple): Absolute import paths of the registered modules.
+        names (dict): Exported name to the import path of the module providing it.
+        namespace (dict | None): Namespace, i.e. a module's globals(), kept in sync with the imported modules.
+        loaded (set): Modules whose names are bound in `namespace`.
+    """
+
+    def __init__(self, names, namespace=None):
+        """Register the exported name to module import path table `names` and bind placeholders in `namespace`."""
+        self.names = dict(names)
+        self.modules = tuple(dict.fromkeys(self.names.values()))
+        self.namespace = namespace
+        self.loaded = set()
+        if namespace is not None:
+            for n in self.names:
+                namespace.setdefault(n, Unloaded)
+        self.refresh()
+
+    def __contains__(self, name):
+        """Return True if `name` is provided by a registered module."""
+        return name in self.names
+
+    def get(self, name):
+        """Return the object registered under `name`, importing its module if needed, or raise KeyError."""
+        module = self.names[name]
+        importlib.import_module(module)
+        self.refresh()
+        return getattr(sys.modules[module], name)
+
+    def peek(self, name):
+        """Return the object registered under `name` if its module is already imported, else Unloaded."""
+        m = sys.modules.get(self.names[name])
+        return getattr(m, name, Unloaded) if m else Unloaded
+
+    def refresh(self):
+        """Bind the names of registered modules that have been imported since, i.e. by torch.load(), in `namespace`."""
+        if self.namespace is None:
+            return
+        for module in self.modules:
+            m = sys.modules.get(module)
+            if module not in self.loaded and m and not getattr(m.__spec__, "_initializing", False):
+                names = (n for n, x in self.names.items() if x == module and hasattr(m, n))
+                self.namespace.update({n: getattr(m, n) for n in names})
+                self.loaded.add(module)
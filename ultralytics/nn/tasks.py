@@ -4,12 +4,11 @@ import contextlib
 from copy import deepcopy
 from pathlib import Path
 
-import timm
 import torch
 import torch.nn as nn
 
 from ultralytics.nn.modules import *
-from ultralytics.nn.extra_modules import *
+from ultralytics.nn.registry import BACKBONES, EXTRA_MODULES, ModuleRegistry, Unloaded, module_table
 from ultralytics.utils import DEFAULT_CFG_DICT, DEFAULT_CFG_KEYS, LOGGER, colorstr, emojis, yaml_load
 from ultralytics.utils.checks import check_requirements, check_suffix, check_yaml
 from ultralytics.utils.loss import v8ClassificationLoss, v8DetectionLoss, v8OBBLoss, v8PoseLoss, v8SegmentationLoss, v8DetectionLossNMSFree
@@ -26,22 +25,14 @@ from ultralytics.utils.torch_utils import (
     get_num_params
 )
 
-from ultralytics.nn.backbone.convnextv2 import *
-from ultralytics.nn.backbone.fasternet import *
-from ultralytics.nn.backbone.efficientViT import *
-from ultralytics.nn.backbone.EfficientFormerV2 import *
-from ultralytics.nn.backbone.VanillaNet import *
-from ultralytics.nn.backbone.revcol import *
-from ultralytics.nn.backbone.lsknet import *
-from ultralytics.nn.backbone.SwinTransformer import *
-from ultralytics.nn.backbone.repvit import *
-from ultralytics.nn.backbone.CSwomTramsformer import *
-from ultralytics.nn.backbone.UniRepLKNet import *
-from ultralytics.nn.backbone.TransNext import *
-from ultralytics.nn.backbone.rmt import *
-from ultralytics.nn.backbone.pkinet import *
-from ultralytics.nn.backbone.mobilenetv4 import *
-from ultralytics.nn.backbone.starnet import *
+# Extra modules and backbones are imported on first use, their names are bound to Unloaded until then
+MODULES = ModuleRegistry(
+    {
+        **module_table("ultralytics.nn.extra_modules", EXTRA_MODULES),
+        **module_table("ultralytics.nn.backbone", BACKBONES),
+    },
+    namespace=globals(),
+)
 
 try:
     import thop
@@ -176,26 +167,121 @@ class BaseModel(nn.Module):
             (nn.Module): The fused model is returned.
         """
         if not self.is_fused():
-            for m in self.model.modules():
-                if isinstance(m, (Conv, Conv2, DWConv)) and hasattr(m, "bn"):
-                    if isinstance(m, Conv2):
-                        m.fuse_convs()
-                    m.conv = fuse_conv_and_bn(m.conv, m.bn)  # update conv
-                    delattr(m, "bn")  # remove batchnorm
-                    m.forward = m.forward_fuse  # update forward
-                if isinstance(m, ConvTranspose) and hasattr(m, "bn"):
-                    m.conv_transpose = fuse_deconv_and_bn(m.conv_transpose, m.bn)
-                    delattr(m, "bn")  # remove batchnorm
-                    m.forward = m.forward_fuse  # update forward
-                if isinstance(m, RepConv):
-                    m.fuse_convs()
-                    m.forward = m.forward_fuse  # update forward
-                if hasattr(m, 'switch_to_deploy'):
-                    m.switch_to_deploy()
+            self._fuse_modules()
             self.info(verbose=verbose)
 
         return self
 
+    def _fuse_modules(self):
+        """Fuse Conv and BatchNorm layers and switch every re-parameterizable block to its deploy form in place."""
+        for m in self.model.modules():
+            if isinstance(m, (Conv, Conv2, DWConv)) and hasattr(m, "bn"):
+                if isinstance(m, Conv2):
+                    m.fuse_convs()
+                m.conv = fuse_conv_and_bn(m.conv, m.bn)  # update conv
+                delattr(m, "bn")  # remove batchnorm
+                m.forward = m.forward_fuse  # update forward
+            if isinstance(m, ConvTranspose) and hasattr(m, "bn"):
+                m.conv_transpose = fuse_deconv_and_bn(m.conv_transpose, m.bn)
+                delattr(m, "bn")  # remove batchnorm
+                m.forward = m.forward_fuse  # update forward
+            if isinstance(m, RepConv):
+                m.fuse_convs()
+                m.forward = m.forward_fuse  # update forward
+            for name, child in m.named_children():  # children are visited next, so replacements are fused too
+                if hasattr(child, "fuse_self"):  # RepViT blocks return their fused module
+                    fused = child.fuse_self()
+                elif hasattr(child, "switch_to_deploy"):  # in place, or returns the fused module, i.e. Conv2d_BN
+                    fused = child.switch_to_deploy()
+                else:
+                    continue
+                if isinstance(fused, nn.Module):
+                    setattr(m, name, fused)
+
+    @torch.no_grad()
+    def reparameterize(self, imgsz=640, rtol=1e-3, n=10, verbose=True):
+        """
+        Collapse every re-parameterizable block into plain convolutions and verify each block against its unfused form.
+
+        Blocks are the outermost modules that `fuse()` rewrites, i.e. Conv and BatchNorm pairs, RepConv and modules
+        with `switch_to_deploy()` or `fuse_self()`. Each block is run on the input it receives in a forward pass of a
+        random image before and after fusing, and its outputs, latency and parameters are compared. Unlike `fuse()`,
+        this always runs, so already fused models are completed and verified as well.
+
+        Args:
+            imgsz (int): Size of the random input image. Defaults to 640.
+            rtol (float): Maximum error relative to the largest unfused output value of a block. Defaults to 1e-3.
+            n (int): Number of timed runs per block. Defaults to 10.
+            verbose (bool): Log a summary per block type if True. Defaults to True.
+
+        Returns:
+            (dict): Block type to the number of blocks `n`, `params` and `params_fused`, mean latency `ms` and
+                `ms_fused` and the largest relative `error`, plus a row for the whole model.
+        """
+        blocks = {}  # outermost re-parameterizable blocks
+        for name, m in self.model.named_modules():
+            if name and _is_fusable(m) and not any(name.startswith(f"{b}.") for b in blocks):
+                blocks[name] = m
+        inputs = {}
+
+        def hook(name):
+            def save_input(m, args):  # first call only, returns None to leave the input as is
+                if name not in inputs:
+                    inputs[name] = _clone(args)
+
+            return save_input
+
+        handles = [m.register_forward_pre_hook(hook(name)) for name, m in blocks.items()]
+        p = next(self.parameters())
+        im = torch.rand(1, getattr(self, "yaml", {}).get("ch", 3), imgsz, imgsz, device=p.device, dtype=p.dtype)
+        training = self.training
+        self.eval()
+        try:
+            y0, t0 = _run_timed(self.predict, (im,), n)
+        finally:
+            for h in handles:
+                h.remove()
+        before = {  # blocks not reached by the forward pass are fused but not verified
+            k: (type(m).__name__, get_num_params(m), *_run_timed(m, inputs[k], n)) for k, m in blocks.items() if k in inputs
+        }
+        params = get_num_params(self)
+
+        self._fuse_modules()
+        y1, t1 = _run_timed(self.predict, (im,), n)
+        stats, bad = {}, []
+        for k, (t, params_block, y, ms) in before.items():
+            m = self.model.get_submodule(k)
+            yf, msf = _run_timed(m, inputs[k], n)
+            e = _relative_error(y, yf)
+            s = stats.setdefault(t, dict(n=0, params=0, params_fused=0, ms=0.0, ms_fused=0.0, error=0.0))
+            s["n"] += 1
+            s["params"] += params_block
+            s["params_fused"] += get_num_params(m)
+            s["ms"] += ms
+            s["ms_fused"] += msf
+            s["error"] = max(s["error"], e)
+            if not e <= rtol:  # also catches nan, i.e. no output left to compare
+                bad.append(k)
+        stats = dict(sorted(stats.items(), key=lambda x: x[1]["ms_fused"] - x[1]["ms"]))  # largest speedup first
+        stats[type(self).__name__] = dict(
+            n=1, params=params, params_fused=get_num_params(self), ms=t0, ms_fused=t1, error=_relative_error(y0, y1)
+        )
+        self.train(training)
+
+        if verbose:
+            LOGGER.info(
+                f"{'block':>24s} {'n':>5s} {'params':>10s} {'fused':>10s} "
+                f"{'time (ms)':>10s} {'fused':>10s} {'error':>10s}"
+            )
+            for t, s in stats.items():
+                LOGGER.info(
+                    f"{t:>24s} {s['n']:5d} {s['params']:10.0f} {s['params_fused']:10.0f} {s['ms']:10.2f} "
+                    f"{s['ms_fused']:10.2f} {s['error']:10.2e}"
+                )
+        if bad:
+            LOGGER.warning(f"WARNING ⚠️ reparameterized outputs differ by more than rtol={rtol}: {', '.join(bad)}")
+        return stats
+
     def is_fused(self, thresh=10):
         """
         Check if the model has less than a certain threshold of BatchNorm layers.
@@ -231,6 +317,7 @@ class BaseModel(nn.Module):
             (BaseModel): An updated BaseModel object.
         """
         self = super()._apply(fn)
+        MODULES.refresh()  # model may have been unpickled outside torch_safe_load()
         m = self.model[-1]  # Detect()
         if isinstance(m, (Detect, Detect_DyHead, Detect_AFPN_P2345, Detect_AFPN_P2345_Custom, Detect_AFPN_P345, Detect_AFPN_P345_Custom, 
                           Detect_Efficient, DetectAux, Detect_SEAM, Detect_MultiSEAM, Detect_DyHeadWithDCNV3, Detect_DyHeadWithDCNV4, Detect_DyHead_Prune,
@@ -287,6 +374,7 @@ class DetectionModel(BaseModel):
         warehouse_manager_flag = self.yaml.get('Warehouse_Manager', False)
         self.warehouse_manager = None
         if warehouse_manager_flag:
+            Warehouse_Manager = MODULES.get("Warehouse_Manager")  # import kernel_warehouse on first use
             self.warehouse_manager = Warehouse_Manager(cell_num_ratio=self.yaml.get('Warehouse_Manager_Ratio', 1.0))
         
         # Define model
@@ -613,6 +701,51 @@ class Ensemble(nn.ModuleList):
 # Functions ------------------------------------------------------------------------------------------------------------
 
 
+def _is_fusable(m):
+    """Return True if `BaseModel._fuse_modules()` rewrites module `m`."""
+    if isinstance(m, (Conv, Conv2, DWConv, ConvTranspose)):
+        return hasattr(m, "bn")
+    if isinstance(m, RepConv):
+        return not hasattr(m, "conv")
+    return hasattr(m, "switch_to_deploy") or hasattr(m, "fuse_self")
+
+
+def _clone(x):
+    """Clone the tensors in a nested list, tuple or dict `x`."""
+    if isinstance(x, torch.Tensor):
+        return x.clone()
+    if isinstance(x, (list, tuple)):
+        return type(x)(_clone(xi) for xi in x)
+    return {k: _clone(v) for k, v in x.items()} if isinstance(x, dict) else x
+
+
+def _flatten(x, prefix=""):
+    """Return the tensors in a nested list, tuple or dict `x` keyed by their path, i.e. {'1.0': tensor}."""
+    if isinstance(x, torch.Tensor):
+        return {prefix: x}
+    items = x.items() if isinstance(x, dict) else enumerate(x) if isinstance(x, (list, tuple)) else ()
+    return {k: v for i, xi in items for k, v in _flatten(xi, f"{prefix}.{i}" if prefix else str(i)).items()}
+
+
+def _relative_error(y, yf):
+    """Largest absolute difference between the tensors of `y` and `yf` relative to the largest value in `y`."""
+    y, yf = _flatten(y), _flatten(yf)
+    shared = [k for k in y if k in yf and y[k].shape == yf[k].shape]  # deploy heads drop training-only outputs
+    if not shared:
+        return float("nan")
+    return max(((y[k] - yf[k]).abs().max() / y[k].abs().max().clamp(min=1e-6)).item() for k in shared)
+
+
+def _run_timed(m, args, n=10):
+    """Return the output of `m(*args)` and its mean latency in ms over `n` runs, lists are copied as inputs change."""
+    copy = lambda: [a.copy() if isinstance(a, list) else a for a in args]  # i.e. Detect() assigns to its input list
+    y = m(*copy())  # warmup
+    t = time_sync()
+    for _ in range(n):
+        m(*copy())
+    return y, (time_sync() - t) * 1e3 / n
+
+
 @contextlib.contextmanager
 def temporary_modules(modules=None):
     """
@@ -709,6 +842,7 @@ def torch_safe_load(weight):
         )
         ckpt = {"model": ckpt.model}
 
+    MODULES.refresh()  # bind the extra modules imported by unpickling
     return ckpt, file  # load
 
 
@@ -824,6 +958,8 @@ def parse_model(d, ch, verbose=True, warehouse_manager=None):  # model_dict, inp
             m = getattr(torch.nn, m[3:]) if 'nn.' in m else globals()[m]  # get module
         except:
             pass
+        if m is Unloaded:
+            m = MODULES.get(t)  # import extra module on first use
         for j, a in enumerate(args):
             if isinstance(a, str):
                 with contextlib.suppress(ValueError):
@@ -931,6 +1067,8 @@ def parse_model(d, ch, verbose=True, warehouse_manager=None):  # model_dict, inp
         elif m is CBFuse:
             c2 = ch[f[-1]]
         elif isinstance(m, str):
+            import timm
+
             t = m
             if len(args) == 2:        
                 m = timm.create_model(m, pretrained=args[0], pretrained_cfg_overlay={'file':args[1]}, features_only=True)
@@ -1149,6 +1287,7 @@ def guess_model_task(model):
 
     # Guess from PyTorch model
     if isinstance(model, nn.Module):  # PyTorch model
+        MODULES.refresh()  # bind the extra modules the model was built from
         for x in "model.args", "model.model.args", "model.model.model.args":
             with contextlib.suppress(Exception):
                 return eval(x)["task"]
@@ -35,6 +35,11 @@ class Heatmap:
         self.colormap = None
         self.heatmap = None
         self.heatmap_alpha = 0.5
+        self.grid_scale = 1
+        self.render_interval = 1
+        self.heatmap_colored = None
+        self.stamps = {}
+        self.frame_count = 0
 
         # Predict/track information
         self.boxes = None
@@ -81,6 +86,8 @@ class Heatmap:
         line_dist_thresh=15,
         decay_factor=0.99,
         shape="circle",
+        grid_scale=1,
+        render_interval=1,
     ):
         """
         Configures the heatmap colormap, width, height and display parameters.
@@ -102,6 +109,8 @@ class Heatmap:
             line_dist_thresh (int): Euclidean Distance threshold for line counter
             decay_factor (float): value for removing heatmap area after object passed
             shape (str): Heatmap shape, rect or circle shape supported
+            grid_scale (int): Accumulate the heatmap on a grid downsampled by this factor from the frame size
+            render_interval (int): Colorize the heatmap every this many frames, reusing it for the frames in between
         """
         self.imw = imw
         self.imh = imh
@@ -129,7 +138,12 @@ class Heatmap:
                 self.counting_region = Polygon([(20, 400), (1260, 400)])  # dummy points
 
         # Heatmap new frame
-        self.heatmap = np.zeros((int(self.imh), int(self.imw)), dtype=np.float32)
+        self.grid_scale = max(1, int(grid_scale))
+        self.render_interval = max(1, int(render_interval))
+        self.heatmap = np.zeros(self.grid_shape(), dtype=np.float32)
+        self.heatmap_colored = None
+        self.stamps = {}
+        self.frame_count = 0
 
         self.count_txt_thickness = count_txt_thickness
         self.count_txt_color = count_txt_color
@@ -146,6 +160,76 @@ class Heatmap:
             print("Using Circular shape now")
             self.shape = "circle"
 
+    def grid_shape(self):
+        """Returns the (height, width) of the heatmap accumulation grid."""
+        return -(-int(self.imh) // self.grid_scale), -(-int(self.imw) // self.grid_scale)
+
+    def stamp(self, h, w, cx, cy, r):
+        """
+        Returns the cached circle kernel stamp added to the heatmap for a box of a given size, center and radius.
+
+        Args:
+            h (int): Box height on the grid.
+            w (int): Box width on the grid.
+            cx (int): Circle center x relative to the box.
+            cy (int): Circle center y relative to the box.
+            r (int): Circle radius.
+        """
+        key = h, w, cx, cy, r
+        if key not in self.stamps:
+            if len(self.stamps) > 4096:
+                self.stamps.clear()
+            y, x = np.ogrid[0:h, 0:w]
+            self.stamps[key] = 2 * ((x - cx) ** 2 + (y - cy) ** 2 <= r**2).astype(np.float32)
+        return self.stamps[key]
+
+    def accumulate(self, box):
+        """
+        Adds a box to the heatmap accumulation grid.
+
+        Args:
+            box (torch.Tensor): Box in xyxy format in frame pixels.
+        """
+        x1, y1, x2, y2 = (float(b) / self.grid_scale for b in box)
+        x1, y1 = max(int(x1), 0), max(int(y1), 0)
+        region = self.heatmap[y1 : int(y2), x1 : int(x2)]
+        if region.size == 0:
+            return
+        if self.shape == "circle":
+            cx = int(float(box[0] + box[2]) / self.grid_scale // 2)
+            cy = int(float(box[1] + box[3]) / self.grid_scale // 2)
+            r = min(int(x2) - x1, int(y2) - y1) // 2
+            stamp = self.stamp(int(y2) - y1, int(x2) - x1, cx - x1, cy - y1, r)
+            region += stamp[: region.shape[0], : region.shape[1]]
+        else:
+            region += 2
+
+    def render(self):
+        """Returns the colorized heatmap at frame size, only recomputed every render_interval frames."""
+        if self.heatmap_colored is None or self.frame_count % self.render_interval == 0:
+            heatmap_normalized = cv2.normalize(self.heatmap, None, 0, 255, cv2.NORM_MINMAX)
+            self.heatmap_colored = cv2.applyColorMap(heatmap_normalized.astype(np.uint8), self.colormap)
+            if self.grid_scale > 1:
+                size = (int(self.imw), int(self.imh))
+                self.heatmap_colored = cv2.resize(self.heatmap_colored, size, interpolation=cv2.INTER_LINEAR)
+        return self.heatmap_colored
+
+    def export_heatmap(self, file=None):
+        """
+        Exports the accumulated heatmap grid as a compact float16 array for offline analytics.
+
+        Args:
+            file (str | Path, optional): If given, the grid is also saved to this compressed *.npz file together with
+                the grid_scale and the frame size (imh, imw).
+
+        Returns:
+            (np.ndarray): The accumulated heatmap grid.
+        """
+        heatmap = self.heatmap.astype(np.float16)
+        if file is not None:
+            np.savez_compressed(file, heatmap=heatmap, grid_scale=self.grid_scale, shape=(self.imh, self.imw))
+        return heatmap
+
     def extract_results(self, tracks):
         """
         Extracts results from the provided data.
@@ -166,8 +250,10 @@ class Heatmap:
             tracks (list): List of tracks obtained from the object tracking process.
         """
         self.im0 = im0
+        self.frame_count += 1
         if tracks[0].boxes.id is None:
-            self.heatmap = np.zeros((int(self.imh), int(self.imw)), dtype=np.float32)
+            self.heatmap = np.zeros(self.grid_shape(), dtype=np.float32)
+            self.heatmap_colored = None
             if self.view_img and self.env_check:
                 self.display_frames()
             return im0
@@ -183,19 +269,7 @@ class Heatmap:
                 )
 
             for box, cls, track_id in zip(self.boxes, self.clss, self.track_ids):
-                if self.shape == "circle":
-                    center = (int((box[0] + box[2]) // 2), int((box[1] + box[3]) // 2))
-                    radius = min(int(box[2]) - int(box[0]), int(box[3]) - int(box[1])) // 2
-
-                    y, x = np.ogrid[0 : self.heatmap.shape[0], 0 : self.heatmap.shape[1]]
-                    mask = (x - center[0]) ** 2 + (y - center[1]) ** 2 <= radius**2
-
-                    self.heatmap[int(box[1]) : int(box[3]), int(box[0]) : int(box[2])] += (
-                        2 * mask[int(box[1]) : int(box[3]), int(box[0]) : int(box[2])]
-                    )
-
-                else:
-                    self.heatmap[int(box[1]) : int(box[3]), int(box[0]) : int(box[2])] += 2
+                self.accumulate(box)
 
                 # Store tracking hist
                 track_line = self.track_history[track_id]
@@ -222,23 +296,10 @@ class Heatmap:
                             self.in_counts += 1
         else:
             for box, cls in zip(self.boxes, self.clss):
-                if self.shape == "circle":
-                    center = (int((box[0] + box[2]) // 2), int((box[1] + box[3]) // 2))
-                    radius = min(int(box[2]) - int(box[0]), int(box[3]) - int(box[1])) // 2
-
-                    y, x = np.ogrid[0 : self.heatmap.shape[0], 0 : self.heatmap.shape[1]]
-                    mask = (x - center[0]) ** 2 + (y - center[1]) ** 2 <= radius**2
-
-                    self.heatmap[int(box[1]) : int(box[3]), int(box[0]) : int(box[2])] += (
-                        2 * mask[int(box[1]) : int(box[3]), int(box[0]) : int(box[2])]
-                    )
-
-                else:
-                    self.heatmap[int(box[1]) : int(box[3]), int(box[0]) : int(box[2])] += 2
+                self.accumulate(box)
 
         # Normalize, apply colormap to heatmap and combine with original image
-        heatmap_normalized = cv2.normalize(self.heatmap, None, 0, 255, cv2.NORM_MINMAX)
-        heatmap_colored = cv2.applyColorMap(heatmap_normalized.astype(np.uint8), self.colormap)
+        heatmap_colored = self.render()
 
         incount_label = f"In Count : {self.in_counts}"
         outcount_label = f"OutCount : {self.out_counts}"
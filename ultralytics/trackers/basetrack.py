@@ -5,6 +5,8 @@ from collections import OrderedDict
 
 import numpy as np
 
+from ..utils.ops import xywh2ltwh
+
 
 class TrackState:
     """
@@ -103,3 +105,188 @@ class BaseTrack:
     def reset_id():
         """Reset the global track ID counter."""
         BaseTrack._count = 0
+
+
+class TrackTable:
+    """
+    Structure-of-arrays store of tracks or detections, one row each, that the trackers use instead of track objects.
+
+    Every column is a NumPy array indexed by row, so Kalman steps, association costs and bookkeeping run on whole
+    selections of rows at once. Rows in the New state are detections without a Kalman state, their boxes come from
+    `tlwh` until they are activated.
+
+    Attributes:
+        track (type): Track class of the rows, i.e. STrack or BOTrack, for box conversions and row views.
+        rotated (bool): Whether the boxes have an angle column.
+        tlwh (np.ndarray): Nx4 detection boxes (top left x, top left y, width, height).
+        mean (np.ndarray): Nx8 Kalman mean states.
+        covariance (np.ndarray): Nx8x8 Kalman covariances.
+        state (np.ndarray): N TrackState values.
+        track_id (np.ndarray): N track IDs, 0 for detections.
+        is_activated (np.ndarray): N flags of confirmed tracks.
+        score (np.ndarray): N confidence scores.
+        cls (np.ndarray): N class labels.
+        idx (np.ndarray): N indices of the detections last matched to the rows.
+        angle (np.ndarray): N box angles, zeros if not `rotated`.
+        frame_id (np.ndarray): N IDs of the frames the rows were last updated in.
+        start_frame (np.ndarray): N IDs of the frames the tracks started in.
+        tracklet_len (np.ndarray): N numbers of consecutive updates.
+        curr_feat (np.ndarray | None): NxD latest ReID features, None without ReID.
+        smooth_feat (np.ndarray | None): NxD exponential moving averages of the ReID features, None without ReID.
+    """
+
+    columns = (
+        "tlwh",
+        "mean",
+        "covariance",
+        "state",
+        "track_id",
+        "is_activated",
+        "score",
+        "cls",
+        "idx",
+        "angle",
+        "frame_id",
+        "start_frame",
+        "tracklet_len",
+        "curr_feat",
+        "smooth_feat",
+    )
+
+    def __init__(self, track, n=0, rotated=False):
+        """Initialize a table of `n` empty rows of `track` class."""
+        self.track = track
+        self.rotated = rotated
+        self.tlwh = np.zeros((n, 4), dtype=np.float32)
+        self.mean = np.zeros((n, 8))
+        self.covariance = np.zeros((n, 8, 8))
+        self.state = np.full(n, TrackState.New)
+        self.track_id = np.zeros(n, dtype=int)
+        self.is_activated = np.zeros(n, dtype=bool)
+        self.score = np.zeros(n, dtype=np.float32)
+        self.cls = np.zeros(n, dtype=np.float32)
+        self.idx = np.zeros(n, dtype=np.float32)
+        self.angle = np.zeros(n, dtype=np.float32)
+        self.frame_id = np.zeros(n, dtype=int)
+        self.start_frame = np.zeros(n, dtype=int)
+        self.tracklet_len = np.zeros(n, dtype=int)
+        self.curr_feat = None
+        self.smooth_feat = None
+
+    @classmethod
+    def from_detections(cls, track, dets, scores, classes, feats=None):
+        """
+        Build a table of detections.
+
+        Args:
+            track (type): Track class of the rows.
+            dets (np.ndarray): Nx5 xywh+idx or Nx6 xywha+idx boxes.
+            scores (np.ndarray): N confidence scores.
+            classes (np.ndarray): N class labels.
+            feats (np.ndarray, optional): NxD ReID features.
+
+        Returns:
+            (TrackTable): Table of the detections in the New state.
+        """
+        dets = np.asarray(dets)
+        table = cls(track, len(dets), rotated=dets.ndim == 2 and dets.shape[1] == 6)
+        table.tlwh[:] = xywh2ltwh(dets[:, :4])
+        table.score[:], table.cls[:], table.idx[:] = scores, classes, dets[:, -1]
+        if table.rotated:
+            table.angle[:] = dets[:, 4]
+        if feats is not None:
+            feats = np.asarray(feats, dtype=np.float32)
+            table.curr_feat = feats / np.linalg.norm(feats, axis=1, keepdims=True)
+            table.smooth_feat = table.curr_feat.copy()
+        return table
+
+    def __len__(self):
+        """Return the number of rows."""
+        return len(self.state)
+
+    def select(self, rows):
+        """Return a Tracks selection of `rows`."""
+        return Tracks(self, np.asarray(rows, dtype=int))
+
+    def take(self, rows):
+        """Return a new table of `rows`, in their order."""
+        table = TrackTable(self.track, rotated=self.rotated)
+        for c in self.columns:
+            x = getattr(self, c)
+            setattr(table, c, None if x is None else x[rows])
+        return table
+
+    def append(self, other, rows):
+        """Append `rows` of table `other` in place and return their row indices in this table."""
+        n, m = len(self), len(rows)
+        self.rotated = other.rotated if n == 0 else self.rotated
+        for c in self.columns:
+            a, b = getattr(self, c), getattr(other, c)
+            if a is None and b is None:
+                continue
+            if a is None:  # ReID features of tracks started before the encoder
+                a = np.zeros((n, *b.shape[1:]), dtype=b.dtype)
+            b = np.zeros((m, *a.shape[1:]), dtype=a.dtype) if b is None else b[rows]
+            setattr(self, c, np.concatenate([a, b]))
+        return np.arange(n, n + m)
+
+    def coords(self, rows):
+        """Return the Nx4 xyxy boxes of `rows`, or their Nx5 xywha boxes if `rotated`."""
+        tlwh = self.tlwh[rows].astype(float)
+        tracked = self.state[rows] != TrackState.New  # Kalman state, detections use their boxes
+        tlwh[tracked] = self.track.mean_to_tlwh(self.mean[rows][tracked])
+        if self.rotated:
+            tlwh[:, :2] += tlwh[:, 2:] / 2  # xywh
+            return np.concatenate([tlwh, self.angle[rows, None]], axis=1)
+        tlwh[:, 2:] += tlwh[:, :2]  # xyxy
+        return tlwh
+
+    def gmc(self, rows, H=np.eye(2, 3)):
+        """Apply the 2x3 global motion compensation transform `H` to the Kalman states of `rows`."""
+        if len(rows) == 0:
+            return
+        R8x8 = np.kron(np.eye(4, dtype=float), H[:2, :2])
+        mean = self.mean[rows] @ R8x8.T
+        mean[:, :2] += H[:2, 2]
+        self.mean[rows], self.covariance[rows] = mean, R8x8 @ self.covariance[rows] @ R8x8.T
+
+    def results(self, rows):
+        """Return the Nx8 (xyxy, id, score, cls, idx) or Nx9 (xywha, id, score, cls, idx) float32 results of `rows`."""
+        columns = (self.track_id[rows], self.score[rows], self.cls[rows], self.idx[rows])
+        return np.column_stack([self.coords(rows), *columns]).astype(np.float32)
+
+
+class Tracks:
+    """
+    Selection of rows of a TrackTable, passed to association cost functions in place of a list of tracks.
+
+    Column attributes, e.g. `score`, return the column values of the selected rows.
+
+    Attributes:
+        table (TrackTable): Table the rows belong to.
+        rows (np.ndarray): Selected row indices.
+    """
+
+    def __init__(self, table, rows):
+        """Initialize the selection of `rows` of `table`."""
+        self.table = table
+        self.rows = rows
+
+    def __len__(self):
+        """Return the number of selected rows."""
+        return len(self.rows)
+
+    def __getattr__(self, name):
+        """Return the values of column `name` for the selected rows."""
+        if name in TrackTable.columns:
+            x = getattr(self.table, name)
+            return None if x is None else x[self.rows]
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __iter__(self):
+        """Iterate over track views of the selected rows."""
+        return (self.table.track(self.table, r) for r in self.rows)
+
+    def coords(self):
+        """Return the xyxy or xywha boxes of the selected rows."""
+        return self.table.coords(self.rows)
@@ -1,10 +1,8 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
-from collections import deque
-
 import numpy as np
 
-from .basetrack import TrackState
+from .basetrack import TrackTable
 from .byte_tracker import BYTETracker, STrack
 from .utils import matching
 from .utils.gmc import GMC
@@ -15,110 +13,66 @@ class BOTrack(STrack):
     """
     An extended version of the STrack class for YOLOv8, adding object tracking features.
 
+    Tracks are views of TrackTable rows, whose `curr_feat` and `smooth_feat` columns hold the ReID features.
+
     Attributes:
-        shared_kalman (KalmanFilterXYWH): A shared Kalman filter for all instances of BOTrack.
-        smooth_feat (np.ndarray): Smoothed feature vector.
-        curr_feat (np.ndarray): Current feature vector.
-        features (deque): A deque to store feature vectors with a maximum length defined by `feat_history`.
+        shared_kalman (KalmanFilterXYWH): Kalman filter class of the tracks, (center x, center y, width, height).
+        velocity (slice): Mean state dimensions zeroed by predictions of tracks that are not Tracked.
         alpha (float): Smoothing factor for the exponential moving average of features.
-        mean (np.ndarray): The mean state of the Kalman filter.
-        covariance (np.ndarray): The covariance matrix of the Kalman filter.
+        smooth_feat (np.ndarray | None): Smoothed feature vector.
+        curr_feat (np.ndarray | None): Current feature vector.
 
     Methods:
-        update_features(feat): Update features vector and smooth it using exponential moving average.
-        predict(): Predicts the mean and covariance using Kalman filter.
-        re_activate(new_track, frame_id, new_id): Reactivates a track with updated features and optionally new ID.
-        update(new_track, frame_id): Update the YOLOv8 instance with new track and frame ID.
-        tlwh: Property that gets the current position in tlwh format `(top left x, top left y, width, height)`.
-        multi_predict(stracks): Predicts the mean and covariance of multiple object tracks using shared Kalman filter.
+        update_features(table, rows, feat): Update the features of table rows and smooth them with an EMA.
+        mean_to_tlwh(mean): Convert Kalman mean states to tlwh format `(top left x, top left y, width, height)`.
         convert_coords(tlwh): Converts tlwh bounding box coordinates to xywh format.
         tlwh_to_xywh(tlwh): Convert bounding box to xywh format `(center x, center y, width, height)`.
 
     Usage:
-        bo_track = BOTrack(tlwh, score, cls, feat)
-        bo_track.predict()
-        bo_track.update(new_track, frame_id)
+        table = TrackTable.from_detections(BOTrack, dets, scores, cls, feats)
+        bo_track = BOTrack(table, 0)
+        bo_track = BOTrack(xywh, score, cls, feat)  # a single detection in a new one-row table
     """
 
     shared_kalman = KalmanFilterXYWH()
+    velocity = slice(6, 8)  # width and height velocities
+    alpha = 0.9
 
-    def __init__(self, tlwh, score, cls, feat=None, feat_history=50):
-        """Initialize YOLOv8 object with temporal parameters, such as feature history, alpha and current features."""
-        super().__init__(tlwh, score, cls)
-
-        self.smooth_feat = None
-        self.curr_feat = None
-        if feat is not None:
-            self.update_features(feat)
-        self.features = deque([], maxlen=feat_history)
-        self.alpha = 0.9
-
-    def update_features(self, feat):
-        """Update features vector and smooth it using exponential moving average."""
-        feat /= np.linalg.norm(feat)
-        self.curr_feat = feat
-        if self.smooth_feat is None:
-            self.smooth_feat = feat
-        else:
-            self.smooth_feat = self.alpha * self.smooth_feat + (1 - self.alpha) * feat
-        self.features.append(feat)
-        self.smooth_feat /= np.linalg.norm(self.smooth_feat)
-
-    def predict(self):
-        """Predicts the mean and covariance using Kalman filter."""
-        mean_state = self.mean.copy()
-        if self.state != TrackState.Tracked:
-            mean_state[6] = 0
-            mean_state[7] = 0
-
-        self.mean, self.covariance = self.kalman_filter.predict(mean_state, self.covariance)
-
-    def re_activate(self, new_track, frame_id, new_id=False):
-        """Reactivates a track with updated features and optionally assigns a new ID."""
-        if new_track.curr_feat is not None:
-            self.update_features(new_track.curr_feat)
-        super().re_activate(new_track, frame_id, new_id)
-
-    def update(self, new_track, frame_id):
-        """Update the YOLOv8 instance with new track and frame ID."""
-        if new_track.curr_feat is not None:
-            self.update_features(new_track.curr_feat)
-        super().update(new_track, frame_id)
+    @property
+    def smooth_feat(self):
+        """Smoothed feature vector, None without ReID."""
+        return None if self.table.smooth_feat is None else self.table.smooth_feat[self.row]
 
     @property
-    def tlwh(self):
-        """Get current position in bounding box format `(top left x, top left y, width, height)`."""
-        if self.mean is None:
-            return self._tlwh.copy()
-        ret = self.mean[:4].copy()
-        ret[:2] -= ret[2:] / 2
-        return ret
+    def curr_feat(self):
+        """Current feature vector, None without ReID."""
+        return None if self.table.curr_feat is None else self.table.curr_feat[self.row]
+
+    @classmethod
+    def update_features(cls, table, rows, feat):
+        """Update the features of `rows` of `table` and smooth them using an exponential moving average."""
+        feat = feat / np.linalg.norm(feat, axis=1, keepdims=True)
+        smooth = cls.alpha * table.smooth_feat[rows] + (1 - cls.alpha) * feat
+        table.curr_feat[rows] = feat
+        table.smooth_feat[rows] = smooth / np.linalg.norm(smooth, axis=1, keepdims=True)
 
     @staticmethod
-    def multi_predict(stracks):
-        """Predicts the mean and covariance of multiple object tracks using shared Kalman filter."""
-        if len(stracks) <= 0:
-            return
-        multi_mean = np.asarray([st.mean.copy() for st in stracks])
-        multi_covariance = np.asarray([st.covariance for st in stracks])
-        for i, st in enumerate(stracks):
-            if st.state != TrackState.Tracked:
-                multi_mean[i][6] = 0
-                multi_mean[i][7] = 0
-        multi_mean, multi_covariance = BOTrack.shared_kalman.multi_predict(multi_mean, multi_covariance)
-        for i, (mean, cov) in enumerate(zip(multi_mean, multi_covariance)):
-            stracks[i].mean = mean
-            stracks[i].covariance = cov
-
-    def convert_coords(self, tlwh):
-        """Converts Top-Left-Width-Height bounding box coordinates to X-Y-Width-Height format."""
-        return self.tlwh_to_xywh(tlwh)
+    def mean_to_tlwh(mean):
+        """Convert (..., 8) Kalman mean states to format `(top left x, top left y, width, height)`."""
+        ret = mean[..., :4].copy()
+        ret[..., :2] -= ret[..., 2:] / 2
+        return ret
+
+    @classmethod
+    def convert_coords(cls, tlwh):
+        """Converts (..., 4) Top-Left-Width-Height bounding box coordinates to X-Y-Width-Height format."""
+        return cls.tlwh_to_xywh(tlwh)
 
     @staticmethod
     def tlwh_to_xywh(tlwh):
-        """Convert bounding box to format `(center x, center y, width, height)`."""
+        """Convert (..., 4) bounding boxes to format `(center x, center y, width, height)`."""
         ret = np.asarray(tlwh).copy()
-        ret[:2] += ret[2:] / 2
+        ret[..., :2] += ret[..., 2:] / 2
         return ret
 
 
@@ -136,18 +90,19 @@ class BOTSORT(BYTETracker):
     Methods:
         get_kalmanfilter(): Returns an instance of KalmanFilterXYWH for object tracking.
         init_track(dets, scores, cls, img): Initialize track with detections, scores, and classes.
+        compensate(img): Apply the camera motion of a frame without detections to the tracks.
         get_dists(tracks, detections): Get distances between tracks and detections using IoU and (optionally) ReID.
-        multi_predict(tracks): Predict and track multiple objects with YOLOv8 model.
 
     Usage:
         bot_sort = BOTSORT(args, frame_rate)
-        bot_sort.init_track(dets, scores, cls, img)
-        bot_sort.multi_predict(tracks)
+        bot_sort.update(results, img)
 
     Note:
         The class is designed to work with the YOLOv8 object detection model and supports ReID only if enabled via args.
     """
 
+    track = BOTrack
+
     def __init__(self, args, frame_rate=30):
         """Initialize YOLOv8 object with ReID module and GMC algorithm."""
         super().__init__(args, frame_rate)
@@ -158,7 +113,12 @@ class BOTSORT(BYTETracker):
         if args.with_reid:
             # Haven't supported BoT-SORT(reid) yet
             self.encoder = None
-        self.gmc = GMC(method=args.gmc_method)
+        self.gmc = GMC(
+            method=args.gmc_method,
+            downscale=args.get("gmc_downscale", 2),
+            interval=args.get("gmc_interval", 1),
+            use_thread=args.get("gmc_thread", False),
+        )
 
     def get_kalmanfilter(self):
         """Returns an instance of KalmanFilterXYWH for object tracking."""
@@ -166,13 +126,15 @@ class BOTSORT(BYTETracker):
 
     def init_track(self, dets, scores, cls, img=None):
         """Initialize track with detections, scores, and classes."""
-        if len(dets) == 0:
-            return []
-        if self.args.with_reid and self.encoder is not None:
+        if self.args.with_reid and self.encoder is not None and len(dets):
             features_keep = self.encoder.inference(img, dets)
-            return [BOTrack(xyxy, s, c, f) for (xyxy, s, c, f) in zip(dets, scores, cls, features_keep)]  # detections
-        else:
-            return [BOTrack(xyxy, s, c) for (xyxy, s, c) in zip(dets, scores, cls)]  # detections
+            return TrackTable.from_detections(BOTrack, dets, scores, cls, features_keep)  # detections
+        return TrackTable.from_detections(BOTrack, dets, scores, cls)  # detections
+
+    def compensate(self, img):
+        """Apply the camera motion of a frame without detections to the tracks, e.g. an estimate started by submit()."""
+        warp = self.gmc.apply(img)
+        self.table.gmc(np.concatenate([self.tracked, self.lost]), warp)
 
     def get_dists(self, tracks, detections):
         """Get distances between tracks and detections using IoU and (optionally) ReID embeddings."""
@@ -190,10 +152,6 @@ class BOTSORT(BYTETracker):
             dists = np.minimum(dists, emb_dists)
         return dists
 
-    def multi_predict(self, tracks):
-        """Predict and track multiple objects with YOLOv8 model."""
-        BOTrack.multi_predict(tracks)
-
     def reset(self):
         """Reset tracker."""
         super().reset()
@@ -2,168 +2,122 @@
 
 import numpy as np
 
-from .basetrack import BaseTrack, TrackState
+from .basetrack import BaseTrack, TrackState, TrackTable
 from .utils import matching
 from .utils.kalman_filter import KalmanFilterXYAH
-from ..utils.ops import xywh2ltwh
 from ..utils import LOGGER
 
 
+class Column:
+    """Descriptor exposing one TrackTable column of a track view's row as an attribute."""
+
+    def __set_name__(self, owner, name):
+        """Store the column name."""
+        self.name = name
+
+    def __get__(self, track, owner=None):
+        """Return the column value of the track's row."""
+        return self if track is None else getattr(track.table, self.name)[track.row]
+
+    def __set__(self, track, value):
+        """Set the column value of the track's row."""
+        getattr(track.table, self.name)[track.row] = value
+
+
 class STrack(BaseTrack):
     """
-    Single object tracking representation that uses Kalman filtering for state estimation.
+    Single object track, a view of one row of a TrackTable that holds the Kalman filter states of all tracks.
 
-    This class is responsible for storing all the information regarding individual tracklets and performs state updates
-    and predictions based on Kalman filter.
+    The class also defines the box conversions of its Kalman filter for the whole table, and which mean state
+    velocities are zeroed when predicting tracks that are not in the Tracked state. Views are valid until the next
+    tracker update, which compacts the table.
 
     Attributes:
-        shared_kalman (KalmanFilterXYAH): Shared Kalman filter that is used across all STrack instances for prediction.
-        _tlwh (np.ndarray): Private attribute to store top-left corner coordinates and width and height of bounding box.
-        kalman_filter (KalmanFilterXYAH): Instance of Kalman filter used for this particular object track.
-        mean (np.ndarray): Mean state estimate vector.
-        covariance (np.ndarray): Covariance of state estimate.
+        shared_kalman (KalmanFilterXYAH): Kalman filter class of the tracks, (center x, center y, aspect ratio, height).
+        velocity (slice): Mean state dimensions zeroed by predictions of tracks that are not Tracked.
+        table (TrackTable): Table holding the track.
+        row (int): Row of the track in the table.
+        mean (np.ndarray | None): Mean state estimate vector, None for detections.
+        covariance (np.ndarray | None): Covariance of the state estimate, None for detections.
         is_activated (bool): Boolean flag indicating if the track has been activated.
         score (float): Confidence score of the track.
         tracklet_len (int): Length of the tracklet.
-        cls (any): Class label for the object.
-        idx (int): Index or identifier for the object.
+        cls (float): Class label for the object.
+        idx (float): Index of the detection last matched to the track.
+        angle (float | None): Box angle of rotated boxes, None otherwise.
         frame_id (int): Current frame ID.
         start_frame (int): Frame where the object was first detected.
 
     Methods:
-        predict(): Predict the next state of the object using Kalman filter.
-        multi_predict(stracks): Predict the next states for multiple tracks.
-        multi_gmc(stracks, H): Update multiple track states using a homography matrix.
-        activate(kalman_filter, frame_id): Activate a new tracklet.
-        re_activate(new_track, frame_id, new_id): Reactivate a previously lost tracklet.
-        update(new_track, frame_id): Update the state of a matched track.
-        convert_coords(tlwh): Convert bounding box to x-y-aspect-height format.
-        tlwh_to_xyah(tlwh): Convert tlwh bounding box to xyah format.
+        convert_coords(tlwh): Convert tlwh boxes to the measurement format of the Kalman filter.
+        tlwh_to_xyah(tlwh): Convert tlwh boxes to xyah format.
+        mean_to_tlwh(mean): Convert Kalman mean states to tlwh boxes.
     """
 
     shared_kalman = KalmanFilterXYAH()
-
-    def __init__(self, xywh, score, cls):
-        """Initialize new STrack instance."""
-        super().__init__()
-        # xywh+idx or xywha+idx
-        assert len(xywh) in [5, 6], f"expected 5 or 6 values but got {len(xywh)}"
-        self._tlwh = np.asarray(xywh2ltwh(xywh[:4]), dtype=np.float32)
-        self.kalman_filter = None
-        self.mean, self.covariance = None, None
-        self.is_activated = False
-
-        self.score = score
-        self.tracklet_len = 0
-        self.cls = cls
-        self.idx = xywh[-1]
-        self.angle = xywh[4] if len(xywh) == 6 else None
-
-    def predict(self):
-        """Predicts mean and covariance using Kalman filter."""
-        mean_state = self.mean.copy()
-        if self.state != TrackState.Tracked:
-            mean_state[7] = 0
-        self.mean, self.covariance = self.kalman_filter.predict(mean_state, self.covariance)
-
-    @staticmethod
-    def multi_predict(stracks):
-        """Perform multi-object predictive tracking using Kalman filter for given stracks."""
-        if len(stracks) <= 0:
-            return
-        multi_mean = np.asarray([st.mean.copy() for st in stracks])
-        multi_covariance = np.asarray([st.covariance for st in stracks])
-        for i, st in enumerate(stracks):
-            if st.state != TrackState.Tracked:
-                multi_mean[i][7] = 0
-        multi_mean, multi_covariance = STrack.shared_kalman.multi_predict(multi_mean, multi_covariance)
-        for i, (mean, cov) in enumerate(zip(multi_mean, multi_covariance)):
-            stracks[i].mean = mean
-            stracks[i].covariance = cov
-
-    @staticmethod
-    def multi_gmc(stracks, H=np.eye(2, 3)):
-        """Update state tracks positions and covariances using a homography matrix."""
-        if len(stracks) > 0:
-            multi_mean = np.asarray([st.mean.copy() for st in stracks])
-            multi_covariance = np.asarray([st.covariance for st in stracks])
-
-            R = H[:2, :2]
-            R8x8 = np.kron(np.eye(4, dtype=float), R)
-            t = H[:2, 2]
-
-            for i, (mean, cov) in enumerate(zip(multi_mean, multi_covariance)):
-                mean = R8x8.dot(mean)
-                mean[:2] += t
-                cov = R8x8.dot(cov).dot(R8x8.transpose())
-
-                stracks[i].mean = mean
-                stracks[i].covariance = cov
-
-    def activate(self, kalman_filter, frame_id):
-        """Start a new tracklet."""
-        self.kalman_filter = kalman_filter
-        self.track_id = self.next_id()
-        self.mean, self.covariance = self.kalman_filter.initiate(self.convert_coords(self._tlwh))
-
-        self.tracklet_len = 0
-        self.state = TrackState.Tracked
-        if frame_id == 1:
-            self.is_activated = True
-        self.frame_id = frame_id
-        self.start_frame = frame_id
-
-    def re_activate(self, new_track, frame_id, new_id=False):
-        """Reactivates a previously lost track with a new detection."""
-        self.mean, self.covariance = self.kalman_filter.update(
-            self.mean, self.covariance, self.convert_coords(new_track.tlwh)
-        )
-        self.tracklet_len = 0
-        self.state = TrackState.Tracked
-        self.is_activated = True
-        self.frame_id = frame_id
-        if new_id:
-            self.track_id = self.next_id()
-        self.score = new_track.score
-        self.cls = new_track.cls
-        self.angle = new_track.angle
-        self.idx = new_track.idx
-
-    def update(self, new_track, frame_id):
+    velocity = slice(7, 8)  # height velocity
+
+    track_id = Column()
+    is_activated = Column()
+    state = Column()
+    score = Column()
+    tracklet_len = Column()
+    cls = Column()
+    idx = Column()
+    frame_id = Column()
+    start_frame = Column()
+
+    def __init__(self, table, row, cls=None, feat=None):
         """
-        Update the state of a matched track.
+        Initialize a view of `row` of `table`, or a detection with `STrack(xywh, score, cls)` in a new one-row table.
 
         Args:
-            new_track (STrack): The new track containing updated information.
-            frame_id (int): The ID of the current frame.
+            table (TrackTable | np.ndarray): Table holding the track, or the xywh+idx or xywha+idx box of a detection.
+            row (int | float): Row of the track in the table, or the confidence score of the detection.
+            cls (float, optional): Class label of the detection, only with a box.
+            feat (np.ndarray, optional): ReID feature of the detection, only with a box.
         """
-        self.frame_id = frame_id
-        self.tracklet_len += 1
+        if not isinstance(table, TrackTable):
+            xywh = np.asarray(table, dtype=np.float32)
+            assert len(xywh) in {5, 6}, f"expected 5 or 6 values but got {len(xywh)}"
+            feats = None if feat is None else np.asarray(feat)[None]
+            table, row = TrackTable.from_detections(type(self), xywh[None], [row], [cls], feats), 0
+        self.table = table
+        self.row = row
 
-        new_tlwh = new_track.tlwh
-        self.mean, self.covariance = self.kalman_filter.update(
-            self.mean, self.covariance, self.convert_coords(new_tlwh)
-        )
-        self.state = TrackState.Tracked
-        self.is_activated = True
+    @property
+    def mean(self):
+        """Mean Kalman state of the track, None for detections."""
+        return None if self.state == TrackState.New else self.table.mean[self.row]
+
+    @property
+    def covariance(self):
+        """Kalman state covariance of the track, None for detections."""
+        return None if self.state == TrackState.New else self.table.covariance[self.row]
 
-        self.score = new_track.score
-        self.cls = new_track.cls
-        self.angle = new_track.angle
-        self.idx = new_track.idx
+    @property
+    def angle(self):
+        """Box angle of the track, None for axis-aligned boxes."""
+        return self.table.angle[self.row] if self.table.rotated else None
 
-    def convert_coords(self, tlwh):
-        """Convert a bounding box's top-left-width-height format to its x-y-aspect-height equivalent."""
-        return self.tlwh_to_xyah(tlwh)
+    @classmethod
+    def convert_coords(cls, tlwh):
+        """Convert (..., 4) top-left-width-height boxes to the x-y-aspect-height measurements of the Kalman filter."""
+        return cls.tlwh_to_xyah(tlwh)
 
     @property
     def tlwh(self):
         """Get current position in bounding box format (top left x, top left y, width, height)."""
         if self.mean is None:
-            return self._tlwh.copy()
-        ret = self.mean[:4].copy()
-        ret[2] *= ret[3]
-        ret[:2] -= ret[2:] / 2
+            return self.table.tlwh[self.row].copy()
+        return self.mean_to_tlwh(self.mean)
+
+    @staticmethod
+    def mean_to_tlwh(mean):
+        """Convert (..., 8) Kalman mean states (center x, center y, aspect ratio, height, ...) to tlwh boxes."""
+        ret = mean[..., :4].copy()
+        ret[..., 2] *= ret[..., 3]
+        ret[..., :2] -= ret[..., 2:] / 2
         return ret
 
     @property
@@ -175,12 +129,10 @@ class STrack(BaseTrack):
 
     @staticmethod
     def tlwh_to_xyah(tlwh):
-        """Convert bounding box to format (center x, center y, aspect ratio, height), where the aspect ratio is width /
-        height.
-        """
+        """Convert (..., 4) tlwh boxes to (center x, center y, aspect ratio, height), the aspect ratio being w / h."""
         ret = np.asarray(tlwh).copy()
-        ret[:2] += ret[2:] / 2
-        ret[2] /= ret[3]
+        ret[..., :2] += ret[..., 2:] / 2
+        ret[..., 2] /= ret[..., 3]
         return ret
 
     @property
@@ -201,8 +153,7 @@ class STrack(BaseTrack):
     @property
     def result(self):
         """Get current tracking results."""
-        coords = self.xyxy if self.angle is None else self.xywha
-        return coords.tolist() + [self.track_id, self.score, self.cls, self.idx]
+        return self.table.results([self.row])[0].tolist()
 
     def __repr__(self):
         """Return a string representation of the BYTETracker object with start and end frames and track ID."""
@@ -215,12 +166,15 @@ class BYTETracker:
 
     The class is responsible for initializing, updating, and managing the tracks for detected objects in a video
     sequence. It maintains the state of tracked, lost, and removed tracks over frames, utilizes Kalman filtering for
-    predicting the new object locations, and performs data association.
+    predicting the new object locations, and performs data association. Tracks are rows of a TrackTable, so the Kalman
+    steps, association costs and list operations run on arrays rather than per track.
 
     Attributes:
-        tracked_stracks (list[STrack]): List of successfully activated tracks.
-        lost_stracks (list[STrack]): List of lost tracks.
-        removed_stracks (list[STrack]): List of removed tracks.
+        track (type): Track class of the table rows.
+        table (TrackTable): Tracked and lost tracks.
+        tracked (np.ndarray): Table rows of the tracked tracks, including unconfirmed ones.
+        lost (np.ndarray): Table rows of the lost tracks.
+        removed_ids (np.ndarray): IDs of the last removed tracks, at most 1000.
         frame_id (int): The current frame ID.
         args (namespace): Command-line arguments.
         max_time_lost (int): The maximum frames for a track to be considered as 'lost'.
@@ -229,20 +183,25 @@ class BYTETracker:
     Methods:
         update(results, img=None): Updates object tracker with new detections.
         get_kalmanfilter(): Returns a Kalman filter object for tracking bounding boxes.
-        init_track(dets, scores, cls, img=None): Initialize object tracking with detections.
+        init_track(dets, scores, cls, img=None): Initialize a table of detections.
         get_dists(tracks, detections): Calculates the distance between tracks and detections.
         multi_predict(tracks): Predicts the location of tracks.
+        update_matched(tracks, detections, matches, activated, refind): Updates matched tracks.
+        activate(detections, rows): Starts new tracks from detections.
         reset_id(): Resets the ID counter of STrack.
-        joint_stracks(tlista, tlistb): Combines two lists of stracks.
-        sub_stracks(tlista, tlistb): Filters out the stracks present in the second list from the first list.
-        remove_duplicate_stracks(stracksa, stracksb): Removes duplicate stracks based on IOU.
+        joint_stracks(rowsa, rowsb): Combines two sets of track rows.
+        sub_stracks(rowsa, rowsb): Filters out the track rows present in the second set from the first set.
+        remove_duplicate_stracks(rowsa, rowsb): Removes duplicate tracks based on IOU.
     """
 
+    track = STrack
+
     def __init__(self, args, frame_rate=30):
         """Initialize a YOLOv8 object to track objects with given arguments and frame rate."""
-        self.tracked_stracks = []  # type: list[STrack]
-        self.lost_stracks = []  # type: list[STrack]
-        self.removed_stracks = []  # type: list[STrack]
+        self.table = TrackTable(self.track)
+        self.tracked = np.zeros(0, dtype=int)
+        self.lost = np.zeros(0, dtype=int)
+        self.removed_ids = np.zeros(0, dtype=int)
 
         self.frame_id = 0
         self.args = args
@@ -250,13 +209,20 @@ class BYTETracker:
         self.kalman_filter = self.get_kalmanfilter()
         self.reset_id()
 
+    @property
+    def tracked_stracks(self):
+        """Views of the tracked tracks, valid until the next update."""
+        return list(self.table.select(self.tracked))
+
+    @property
+    def lost_stracks(self):
+        """Views of the lost tracks, valid until the next update."""
+        return list(self.table.select(self.lost))
+
     def update(self, results, img=None):
         """Updates object tracker with new detections and returns tracked object bounding boxes."""
         self.frame_id += 1
-        activated_stracks = []
-        refind_stracks = []
-        lost_stracks = []
-        removed_stracks = []
+        activated, refind = [], []  # row arrays, in the order tracks are updated
 
         scores = results.conf
         bboxes = results.xywhr if hasattr(results, "xywhr") else results.xywh
@@ -276,101 +242,121 @@ class BYTETracker:
         cls_keep = cls[remain_inds]
         cls_second = cls[inds_second]
 
+        t = self.table
         detections = self.init_track(dets, scores_keep, cls_keep, img)
+        det_rows = np.arange(len(detections))
         # Add newly detected tracklets to tracked_stracks
-        unconfirmed = []
-        tracked_stracks = []  # type: list[STrack]
-        for track in self.tracked_stracks:
-            if not track.is_activated:
-                unconfirmed.append(track)
-            else:
-                tracked_stracks.append(track)
+        confirmed = t.is_activated[self.tracked]
+        unconfirmed, tracked = self.tracked[~confirmed], self.tracked[confirmed]
         # Step 2: First association, with high score detection boxes
-        strack_pool = self.joint_stracks(tracked_stracks, self.lost_stracks)
+        pool = self.joint_stracks(tracked, self.lost)
         # Predict the current location with KF
-        self.multi_predict(strack_pool)
+        self.multi_predict(t.select(pool))
         if hasattr(self, "gmc") and img is not None:
             warp = self.gmc.apply(img, dets)
-            STrack.multi_gmc(strack_pool, warp)
-            STrack.multi_gmc(unconfirmed, warp)
+            t.gmc(pool, warp)
+            t.gmc(unconfirmed, warp)
 
-        dists = self.get_dists(strack_pool, detections)
+        dists = self.get_dists(t.select(pool), detections.select(det_rows))
         matches, u_track, u_detection = matching.linear_assignment(dists, thresh=self.args.match_thresh)
-
-        for itracked, idet in matches:
-            track = strack_pool[itracked]
-            det = detections[idet]
-            if track.state == TrackState.Tracked:
-                track.update(det, self.frame_id)
-                activated_stracks.append(track)
-            else:
-                track.re_activate(det, self.frame_id, new_id=False)
-                refind_stracks.append(track)
+        self.update_matched(t.select(pool), detections.select(det_rows), matches, activated, refind)
         # Step 3: Second association, with low score detection boxes association the untrack to the low score detections
         detections_second = self.init_track(dets_second, scores_second, cls_second, img)
-        r_tracked_stracks = [strack_pool[i] for i in u_track if strack_pool[i].state == TrackState.Tracked]
+        r_tracked = pool[np.asarray(u_track, dtype=int)]
+        r_tracked = r_tracked[t.state[r_tracked] == TrackState.Tracked]
         # TODO
-        dists = matching.iou_distance(r_tracked_stracks, detections_second)
+        dists = matching.iou_distance(t.select(r_tracked), detections_second.select(np.arange(len(dets_second))))
         matches, u_track, u_detection_second = matching.linear_assignment(dists, thresh=0.5)
-        for itracked, idet in matches:
-            track = r_tracked_stracks[itracked]
-            det = detections_second[idet]
-            if track.state == TrackState.Tracked:
-                track.update(det, self.frame_id)
-                activated_stracks.append(track)
-            else:
-                track.re_activate(det, self.frame_id, new_id=False)
-                refind_stracks.append(track)
-
-        for it in u_track:
-            track = r_tracked_stracks[it]
-            if track.state != TrackState.Lost:
-                track.mark_lost()
-                lost_stracks.append(track)
+        self.update_matched(
+            t.select(r_tracked), detections_second.select(np.arange(len(dets_second))), matches, activated, refind
+        )
+
+        lost = r_tracked[np.asarray(u_track, dtype=int)]
+        lost = lost[t.state[lost] != TrackState.Lost]
+        t.state[lost] = TrackState.Lost
         # Deal with unconfirmed tracks, usually tracks with only one beginning frame
-        detections = [detections[i] for i in u_detection]
-        dists = self.get_dists(unconfirmed, detections)
+        det_rows = det_rows[np.asarray(u_detection, dtype=int)]
+        dists = self.get_dists(t.select(unconfirmed), detections.select(det_rows))
         matches, u_unconfirmed, u_detection = matching.linear_assignment(dists, thresh=0.7)
-        for itracked, idet in matches:
-            unconfirmed[itracked].update(detections[idet], self.frame_id)
-            activated_stracks.append(unconfirmed[itracked])
-        for it in u_unconfirmed:
-            track = unconfirmed[it]
-            track.mark_removed()
-            removed_stracks.append(track)
+        self.update_matched(t.select(unconfirmed), detections.select(det_rows), matches, activated, activated)
+        removed = unconfirmed[np.asarray(u_unconfirmed, dtype=int)]
+        t.state[removed] = TrackState.Removed
         # Step 4: Init new stracks
-        for inew in u_detection:
-            track = detections[inew]
-            if track.score < self.args.new_track_thresh:
-                continue
-            track.activate(self.kalman_filter, self.frame_id)
-            activated_stracks.append(track)
+        new = det_rows[np.asarray(u_detection, dtype=int)]
+        activated.append(self.activate(detections, new[detections.score[new] >= self.args.new_track_thresh]))
         # Step 5: Update state
-        for track in self.lost_stracks:
-            if self.frame_id - track.end_frame > self.max_time_lost:
-                track.mark_removed()
-                removed_stracks.append(track)
-
-        self.tracked_stracks = [t for t in self.tracked_stracks if t.state == TrackState.Tracked]
-        self.tracked_stracks = self.joint_stracks(self.tracked_stracks, activated_stracks)
-        self.tracked_stracks = self.joint_stracks(self.tracked_stracks, refind_stracks)
-        self.lost_stracks = self.sub_stracks(self.lost_stracks, self.tracked_stracks)
-        self.lost_stracks.extend(lost_stracks)
-        self.lost_stracks = self.sub_stracks(self.lost_stracks, self.removed_stracks)
-        self.tracked_stracks, self.lost_stracks = self.remove_duplicate_stracks(self.tracked_stracks, self.lost_stracks)
-        self.removed_stracks.extend(removed_stracks)
-        if len(self.removed_stracks) > 1000:
-            self.removed_stracks = self.removed_stracks[-999:]  # clip remove stracks to 1000 maximum
-
-        return np.asarray([x.result for x in self.tracked_stracks if x.is_activated], dtype=np.float32)
+        timed_out = self.lost[self.frame_id - t.frame_id[self.lost] > self.max_time_lost]
+        t.state[timed_out] = TrackState.Removed
+        removed = np.concatenate([removed, timed_out])
+
+        tracked = self.tracked[t.state[self.tracked] == TrackState.Tracked]
+        tracked = self.joint_stracks(tracked, np.concatenate(activated))
+        tracked = self.joint_stracks(tracked, np.concatenate(refind or [np.zeros(0, dtype=int)]))
+        lost = np.concatenate([self.sub_stracks(self.lost, tracked), lost])
+        lost = lost[~np.isin(t.track_id[lost], self.removed_ids)]  # tracks removed before this frame
+        tracked, lost = self.remove_duplicate_stracks(tracked, lost)
+        self.removed_ids = np.concatenate([self.removed_ids, t.track_id[removed]])
+        if len(self.removed_ids) > 1000:
+            self.removed_ids = self.removed_ids[-999:]  # clip remove stracks to 1000 maximum
+
+        results = t.results(tracked[t.is_activated[tracked]])
+        self.table = t.take(np.concatenate([tracked, lost]))  # drop removed tracks
+        self.tracked, self.lost = np.arange(len(tracked)), np.arange(len(tracked), len(self.table))
+        return results
+
+    def update_matched(self, tracks, detections, matches, activated, refind):
+        """
+        Update matched tracks with their detections in one vectorized Kalman step.
+
+        Args:
+            tracks (Tracks): Tracks of the association, rows of the tracker's table.
+            detections (Tracks): Detections of the association.
+            matches (list | np.ndarray): Kx2 (track, detection) index pairs into `tracks` and `detections`.
+            activated (list): Row arrays of updated Tracked tracks, the rows of this update are appended.
+            refind (list): Row arrays of re-activated tracks, the rows of this update are appended.
+        """
+        if len(matches) == 0:
+            return
+        matches = np.asarray(matches, dtype=int)
+        t, d = tracks.table, detections.table
+        rows, det_rows = tracks.rows[matches[:, 0]], detections.rows[matches[:, 1]]
+        re_activate = t.state[rows] != TrackState.Tracked
+        activated.append(rows[~re_activate])
+        refind.append(rows[re_activate])
+
+        measurement = self.track.convert_coords(d.tlwh[det_rows])
+        mean, covariance = self.kalman_filter.multi_update(t.mean[rows], t.covariance[rows], measurement)
+        t.mean[rows], t.covariance[rows] = mean, covariance
+        t.frame_id[rows] = self.frame_id
+        t.tracklet_len[rows] = np.where(re_activate, 0, t.tracklet_len[rows] + 1)
+        t.state[rows] = TrackState.Tracked
+        t.is_activated[rows] = True
+        for c in ("score", "cls", "angle", "idx"):
+            getattr(t, c)[rows] = getattr(d, c)[det_rows]
+        if d.curr_feat is not None:
+            self.track.update_features(t, rows, d.curr_feat[det_rows])
+
+    def activate(self, detections, rows):
+        """Start new tracks from `rows` of table `detections` and return their rows in the tracker's table."""
+        rows = self.table.append(detections, rows)
+        t = self.table
+        for r in rows:
+            t.mean[r], t.covariance[r] = self.kalman_filter.initiate(self.track.convert_coords(t.tlwh[r]))
+            t.track_id[r] = self.track.next_id()
+        t.tracklet_len[rows] = 0
+        t.state[rows] = TrackState.Tracked
+        t.is_activated[rows] = self.frame_id == 1
+        t.frame_id[rows] = self.frame_id
+        t.start_frame[rows] = self.frame_id
+        return rows
 
     def get_kalmanfilter(self):
         """Returns a Kalman filter object for tracking bounding boxes."""
         return KalmanFilterXYAH()
 
     def init_track(self, dets, scores, cls, img=None):
-        """Initialize object tracking with detections and scores using STrack algorithm."""
-        return [STrack(xyxy, s, c) for (xyxy, s, c) in zip(dets, scores, cls)] if len(dets) else []  # detections
+        """Initialize a table of detections from their xywh(a)+idx boxes, scores and classes."""
+        return TrackTable.from_detections(self.track, dets, scores, cls)
 
     def get_dists(self, tracks, detections):
         """Calculates the distance between tracks and detections using IOU and fuses scores."""
@@ -381,8 +367,13 @@ class BYTETracker:
         return dists
 
     def multi_predict(self, tracks):
-        """Returns the predicted tracks using the YOLOv8 network."""
-        STrack.multi_predict(tracks)
+        """Predicts the Kalman states of tracks, with the velocities of tracks that are not Tracked zeroed."""
+        if len(tracks) == 0:
+            return
+        t, rows = tracks.table, tracks.rows
+        mean = t.mean[rows]
+        mean[t.state[rows] != TrackState.Tracked, self.track.velocity] = 0
+        t.mean[rows], t.covariance[rows] = self.kalman_filter.multi_predict(mean, t.covariance[rows])
 
     @staticmethod
     def reset_id():
@@ -391,54 +382,30 @@ class BYTETracker:
 
     def reset(self):
         """Reset tracker."""
-        self.tracked_stracks = []  # type: list[STrack]
-        self.lost_stracks = []  # type: list[STrack]
-        self.removed_stracks = []  # type: list[STrack]
+        self.table = TrackTable(self.track)
+        self.tracked = np.zeros(0, dtype=int)
+        self.lost = np.zeros(0, dtype=int)
+        self.removed_ids = np.zeros(0, dtype=int)
         self.frame_id = 0
         self.kalman_filter = self.get_kalmanfilter()
         self.reset_id()
 
-    @staticmethod
-    def joint_stracks(tlista, tlistb):
-        """Combine two lists of stracks into a single one."""
-        exists = {}
-        res = []
-        for t in tlista:
-            exists[t.track_id] = 1
-            res.append(t)
-        for t in tlistb:
-            tid = t.track_id
-            if not exists.get(tid, 0):
-                exists[tid] = 1
-                res.append(t)
-        return res
-
-    @staticmethod
-    def sub_stracks(tlista, tlistb):
-        """DEPRECATED CODE in https://github.com/ultralytics/ultralytics/pull/1890/
-        stracks = {t.track_id: t for t in tlista}
-        for t in tlistb:
-            tid = t.track_id
-            if stracks.get(tid, 0):
-                del stracks[tid]
-        return list(stracks.values())
-        """
-        track_ids_b = {t.track_id for t in tlistb}
-        return [t for t in tlista if t.track_id not in track_ids_b]
-
-    @staticmethod
-    def remove_duplicate_stracks(stracksa, stracksb):
-        """Remove duplicate stracks with non-maximum IOU distance."""
-        pdist = matching.iou_distance(stracksa, stracksb)
-        pairs = np.where(pdist < 0.15)
-        dupa, dupb = [], []
-        for p, q in zip(*pairs):
-            timep = stracksa[p].frame_id - stracksa[p].start_frame
-            timeq = stracksb[q].frame_id - stracksb[q].start_frame
-            if timep > timeq:
-                dupb.append(q)
-            else:
-                dupa.append(p)
-        resa = [t for i, t in enumerate(stracksa) if i not in dupa]
-        resb = [t for i, t in enumerate(stracksb) if i not in dupb]
-        return resa, resb
+    def joint_stracks(self, rowsa, rowsb):
+        """Combine two arrays of track rows into one, skipping tracks of the second whose IDs are in the first."""
+        ids = self.table.track_id
+        return np.concatenate([rowsa, rowsb[~np.isin(ids[rowsb], ids[rowsa])]])
+
+    def sub_stracks(self, rowsa, rowsb):
+        """Return the track rows of the first array whose IDs are not in the second."""
+        ids = self.table.track_id
+        return rowsa[~np.isin(ids[rowsa], ids[rowsb])]
+
+    def remove_duplicate_stracks(self, rowsa, rowsb):
+        """Remove duplicate tracks with non-maximum IOU distance, keeping the longer-lived track of each pair."""
+        t = self.table
+        pdist = matching.iou_distance(t.select(rowsa), t.select(rowsb))
+        p, q = np.where(pdist < 0.15)
+        timep = t.frame_id[rowsa[p]] - t.start_frame[rowsa[p]]
+        timeq = t.frame_id[rowsb[q]] - t.start_frame[rowsb[q]]
+        dupa, dupb = np.unique(p[timep <= timeq]), np.unique(q[timep > timeq])
+        return np.delete(rowsa, dupa), np.delete(rowsb, dupb)
@@ -3,6 +3,7 @@
 from functools import partial
 from pathlib import Path
 
+import numpy as np
 import torch
 
 from ultralytics.utils import IterableSimpleNamespace, yaml_load
@@ -41,6 +42,20 @@ def on_predict_start(predictor: object, persist: bool = False) -> None:
     predictor.trackers = trackers
 
 
+def on_predict_batch_start(predictor: object) -> None:
+    """
+    Start background global motion compensation of the batch frames, so that it runs while the model does.
+
+    Args:
+        predictor (object): The predictor object with the current batch.
+    """
+    im0s = predictor.batch[1]
+    for i, im0 in zip(predictor.batch_streams(), im0s):
+        tracker = predictor.trackers[i]
+        if hasattr(tracker, "gmc") and isinstance(im0, np.ndarray):
+            tracker.gmc.submit(im0, tracker.gmc.prevDetections)  # detections of the last applied frame
+
+
 def on_predict_postprocess_end(predictor: object, persist: bool = False) -> None:
     """
     Postprocess detected boxes and update with object tracking.
@@ -49,18 +64,20 @@ def on_predict_postprocess_end(predictor: object, persist: bool = False) -> None
         predictor (object): The predictor object containing the predictions.
         persist (bool, optional): Whether to persist the trackers if they already exist. Defaults to False.
     """
-    bs = predictor.dataset.bs
     path, im0s = predictor.batch[:2]
 
     is_obb = predictor.args.task == "obb"
-    for i in range(bs):
-        if not persist and predictor.vid_path[i] != str(predictor.save_dir / Path(path[i]).name):  # new video
-            predictor.trackers[i].reset()
+    for i, s in enumerate(predictor.batch_streams()):  # batch index, stream index
+        if not persist and predictor.vid_path[s] != str(predictor.save_dir / Path(path[i]).name):  # new video
+            predictor.trackers[s].reset()
 
         det = (predictor.results[i].obb if is_obb else predictor.results[i].boxes).cpu().numpy()
         if len(det) == 0:
+            tracker = predictor.trackers[s]
+            if hasattr(tracker, "gmc") and tracker.gmc.executor is not None:
+                tracker.compensate(im0s[i])  # apply every submitted frame, collecting its estimate
             continue
-        tracks = predictor.trackers[i].update(det, im0s[i])
+        tracks = predictor.trackers[s].update(det, im0s[i])
         if len(tracks) == 0:
             continue
         idx = tracks[:, -1].astype(int)
@@ -71,6 +88,19 @@ def on_predict_postprocess_end(predictor: object, persist: bool = False) -> None
         predictor.results[i].update(**update_args)
 
 
+def on_predict_batch_end(predictor: object) -> None:
+    """
+    Add global motion compensation times of the batch to the results speeds.
+
+    Args:
+        predictor (object): The predictor object containing the results.
+    """
+    for i, result in zip(predictor.batch_streams(), predictor.results):
+        tracker = predictor.trackers[i]
+        if hasattr(tracker, "gmc"):
+            result.speed.update(gmc=tracker.gmc.dt, gmc_wait=tracker.gmc.wait)
+
+
 def register_tracker(model: object, persist: bool) -> None:
     """
     Register tracking callbacks to the model for object tracking during prediction.
@@ -80,4 +110,6 @@ def register_tracker(model: object, persist: bool) -> None:
         persist (bool): Whether to persist the trackers if they already exist.
     """
     model.add_callback("on_predict_start", partial(on_predict_start, persist=persist))
+    model.add_callback("on_predict_batch_start", on_predict_batch_start)
     model.add_callback("on_predict_postprocess_end", partial(on_predict_postprocess_end, persist=persist))
+    model.add_callback("on_predict_batch_end", on_predict_batch_end)
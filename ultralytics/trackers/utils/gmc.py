@@ -1,9 +1,14 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
 
 import copy
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import cv2
 import numpy as np
+from scipy.linalg import fractional_matrix_power
 
 from ultralytics.utils import LOGGER
 
@@ -15,36 +20,55 @@ class GMC:
     This class provides methods for tracking and detecting objects based on several tracking algorithms including ORB,
     SIFT, ECC, and Sparse Optical Flow. It also supports downscaling of frames for computational efficiency.
 
+    With interval > 1 motion is only estimated every interval frames, between the last and the current estimated frame.
+    Frames in between get the per-frame step of the last estimate, and the next estimate corrects for the difference,
+    so the warps applied over an interval compose to the estimated motion. Sparse optical flow then also reuses the
+    tracked keypoints instead of detecting new ones every estimate. With use_thread=True the estimate for a frame can be
+    started by submit() in a background thread, e.g. while the model runs, and is collected by apply(). Several frames
+    may be submitted ahead of apply(), e.g. by a pipelined predictor, their estimates run and are collected in order.
+
     Attributes:
         method (str): The method used for tracking. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow', 'none'.
         downscale (int): Factor by which to downscale the frames for processing.
+        interval (int): Estimate motion every interval frames.
         prevFrame (np.array): Stores the previous frame for tracking.
         prevKeyPoints (list): Stores the keypoints from the previous frame.
         prevDescriptors (np.array): Stores the descriptors from the previous frame.
         initializedFirstFrame (bool): Flag to indicate if the first frame has been processed.
+        prevDetections (np.array): Detections of the last applied frame, to submit with the next frame.
+        dt (float): Milliseconds spent estimating the motion of the last frame, 0 for skipped frames.
+        wait (float): Milliseconds apply() waited for the background estimate of the last frame.
 
     Methods:
-        __init__(self, method='sparseOptFlow', downscale=2): Initializes a GMC object with the specified method
-                                                              and downscale factor.
+        __init__(self, method='sparseOptFlow', downscale=2, interval=1, use_thread=False): Initializes a GMC object
+                                                              with the specified method, downscale factor and interval.
+        submit(self, raw_frame, detections=None): Starts estimating the motion of the next frame in the background.
         apply(self, raw_frame, detections=None): Applies the chosen method to a raw frame and optionally uses
                                                  provided detections.
+        estimate(self, raw_frame, detections=None): Runs the chosen method and times it.
         applyEcc(self, raw_frame, detections=None): Applies the ECC algorithm to a raw frame.
         applyFeatures(self, raw_frame, detections=None): Applies feature-based methods like ORB or SIFT to a raw frame.
         applySparseOptFlow(self, raw_frame, detections=None): Applies the Sparse Optical Flow method to a raw frame.
     """
 
-    def __init__(self, method: str = "sparseOptFlow", downscale: int = 2) -> None:
+    def __init__(
+        self, method: str = "sparseOptFlow", downscale: int = 2, interval: int = 1, use_thread: bool = False
+    ) -> None:
         """
         Initialize a video tracker with specified parameters.
 
         Args:
             method (str): The method used for tracking. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow', 'none'.
             downscale (int): Downscale factor for processing frames.
+            interval (int): Estimate motion every interval frames and extrapolate it in between.
+            use_thread (bool): Run estimates started by submit() in a background thread.
         """
         super().__init__()
 
         self.method = method
         self.downscale = max(1, int(downscale))
+        self.interval = max(1, int(interval))
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="gmc") if use_thread else None
 
         if self.method == "orb":
             self.detector = cv2.FastFeatureDetector_create(20)
@@ -76,6 +100,53 @@ class GMC:
         self.prevKeyPoints = None
         self.prevDescriptors = None
         self.initializedFirstFrame = False
+        self.prevDetections = None
+        self.frame_id = 0  # frames applied
+        self.step = np.eye(3)  # per-frame warp of the last estimate
+        self.applied = np.eye(3)  # warps applied since the last estimate
+        self.pending = deque()  # (frame, detections, future) started by submit(), in frame order
+        self.ahead = 0  # frames passed to submit() and not yet to apply()
+        self.lock = threading.Lock()  # submit() and apply() or reset_params() may run in different threads
+        self.dt, self.wait = 0.0, 0.0
+
+    def submit(self, raw_frame: np.array, detections: list = None) -> None:
+        """
+        Start estimating the motion of the next frame passed to apply() in the background thread.
+
+        Does nothing without use_thread or if the next frame is skipped by the interval.
+
+        Args:
+            raw_frame (np.array): The next raw frame to be processed.
+            detections (list): List of detections to be used in the processing, i.e. of the previous frame.
+        """
+        if self.executor is None:
+            return
+        with self.lock:
+            n, self.ahead = self.frame_id + self.ahead, self.ahead + 1
+            if self.method is None or n % self.interval:
+                return
+            # The single worker runs estimates in submission order, as they update the previous frame state
+            self.pending.append((raw_frame, detections, self.executor.submit(self.estimate, raw_frame, detections)))
+
+    def collect(self, raw_frame: np.array = None) -> tuple:
+        """Wait for the pending background estimates up to raw_frame, returns its (H, dt) or None if it has none."""
+        while self.pending:
+            frame, _, future = self.pending.popleft()
+            result = future.result()
+            if frame is raw_frame:
+                return result
+        return None
+
+    def estimate(self, raw_frame: np.array, detections: list = None) -> tuple:
+        """Estimate the motion from the previous estimated frame with the chosen method, returns (H, milliseconds)."""
+        t = time.perf_counter()
+        if self.method in ["orb", "sift"]:
+            H = self.applyFeatures(raw_frame, detections)
+        elif self.method == "ecc":
+            H = self.applyEcc(raw_frame, detections)
+        else:
+            H = self.applySparseOptFlow(raw_frame, detections)
+        return H, (time.perf_counter() - t) * 1e3
 
     def apply(self, raw_frame: np.array, detections: list = None) -> np.array:
         """
@@ -94,14 +165,28 @@ class GMC:
             array([[1, 2, 3],
                    [4, 5, 6]])
         """
-        if self.method in ["orb", "sift"]:
-            return self.applyFeatures(raw_frame, detections)
-        elif self.method == "ecc":
-            return self.applyEcc(raw_frame, detections)
-        elif self.method == "sparseOptFlow":
-            return self.applySparseOptFlow(raw_frame, detections)
-        else:
+        with self.lock:
+            n, self.frame_id, self.ahead = self.frame_id, self.frame_id + 1, max(self.ahead - 1, 0)
+        self.prevDetections = detections
+        if self.method is None:
             return np.eye(2, 3)
+        if n % self.interval:  # skipped frame, extrapolate the last estimate
+            self.dt, self.wait = 0.0, 0.0
+            self.applied = self.step @ self.applied
+            return self.step[:2].copy()
+
+        t = time.perf_counter()
+        result = self.collect(raw_frame)
+        self.wait = (time.perf_counter() - t) * 1e3 if result else 0.0
+        H, self.dt = result or self.estimate(raw_frame, detections)
+        if self.interval == 1:
+            return H
+
+        # Spread the motion over the interval, correcting the warps extrapolated since the last estimate
+        H = np.vstack([H, [0.0, 0.0, 1.0]])
+        self.step = np.real(fractional_matrix_power(H, 1 / self.interval))
+        H, self.applied = H @ np.linalg.inv(self.applied), np.eye(3)
+        return H[:2]
 
     def applyEcc(self, raw_frame: np.array, detections: list = None) -> np.array:
         """
@@ -317,15 +402,16 @@ class GMC:
         if self.downscale > 1.0:
             frame = cv2.resize(frame, (width // self.downscale, height // self.downscale))
 
-        # Find the keypoints
-        keypoints = cv2.goodFeaturesToTrack(frame, mask=None, **self.feature_params)
-
         # Handle first frame
         if not self.initializedFirstFrame:
             self.prevFrame = frame.copy()
-            self.prevKeyPoints = copy.copy(keypoints)
+            self.prevKeyPoints = cv2.goodFeaturesToTrack(frame, mask=None, **self.feature_params)
             self.initializedFirstFrame = True
             return H
+        if self.prevKeyPoints is None:  # no keypoints found in the previous frame
+            self.prevFrame = frame.copy()
+            self.prevKeyPoints = cv2.goodFeaturesToTrack(frame, mask=None, **self.feature_params)
+            return H
 
         # Find correspondences
         matchedKeypoints, status, err = cv2.calcOpticalFlowPyrLK(self.prevFrame, frame, self.prevKeyPoints, None)
@@ -352,6 +438,12 @@ class GMC:
         else:
             LOGGER.warning("WARNING: not enough matching points")
 
+        # Find the keypoints, keep tracking the current ones in interval mode while at least half of them remain
+        if self.interval > 1 and len(currPoints) >= len(self.prevKeyPoints) / 2:
+            keypoints = currPoints
+        else:
+            keypoints = cv2.goodFeaturesToTrack(frame, mask=None, **self.feature_params)
+
         self.prevFrame = frame.copy()
         self.prevKeyPoints = copy.copy(keypoints)
 
@@ -359,7 +451,17 @@ class GMC:
 
     def reset_params(self) -> None:
         """Reset parameters."""
-        self.prevFrame = None
-        self.prevKeyPoints = None
-        self.prevDescriptors = None
-        self.initializedFirstFrame = False
+        with self.lock:  # no frame is submitted until the state is reset
+            ahead = [x[:2] for x in self.pending]
+            self.collect()  # finish the pending estimates before resetting the state they write
+            self.prevFrame = None
+            self.prevKeyPoints = None
+            self.prevDescriptors = None
+            self.initializedFirstFrame = False
+            self.prevDetections = None
+            self.frame_id = 0
+            self.step = np.eye(3)
+            self.applied = np.eye(3)
+            self.dt, self.wait = 0.0, 0.0
+            for frame, detections in ahead:  # frames submitted but not yet applied are estimated again from new state
+                self.pending.append((frame, detections, self.executor.submit(self.estimate, frame, detections)))
@@ -6,6 +6,8 @@ from scipy.spatial.distance import cdist
 
 from ultralytics.utils.metrics import bbox_ioa, batch_probiou
 
+from ..basetrack import Tracks
+
 try:
     import lap  # for linear_assignment
 
@@ -63,19 +65,15 @@ def iou_distance(atracks: list, btracks: list) -> np.ndarray:
     Compute cost based on Intersection over Union (IoU) between tracks.
 
     Args:
-        atracks (list[STrack] | list[np.ndarray]): List of tracks 'a' or bounding boxes.
-        btracks (list[STrack] | list[np.ndarray]): List of tracks 'b' or bounding boxes.
+        atracks (Tracks | list[STrack] | list[np.ndarray]): Tracks 'a' or bounding boxes.
+        btracks (Tracks | list[STrack] | list[np.ndarray]): Tracks 'b' or bounding boxes.
 
     Returns:
         (np.ndarray): Cost matrix computed based on IoU.
     """
 
-    if atracks and isinstance(atracks[0], np.ndarray) or btracks and isinstance(btracks[0], np.ndarray):
-        atlbrs = atracks
-        btlbrs = btracks
-    else:
-        atlbrs = [track.xywha if track.angle is not None else track.xyxy for track in atracks]
-        btlbrs = [track.xywha if track.angle is not None else track.xyxy for track in btracks]
+    atlbrs = _boxes(atracks)
+    btlbrs = _boxes(btracks)
 
     ious = np.zeros((len(atlbrs), len(btlbrs)), dtype=np.float32)
     if len(atlbrs) and len(btlbrs):
@@ -93,13 +91,27 @@ def iou_distance(atracks: list, btracks: list) -> np.ndarray:
     return 1 - ious  # cost matrix
 
 
+def _boxes(tracks):
+    """Return the xyxy or xywha boxes of a Tracks selection or of a list of tracks, and a list of boxes as is."""
+    if isinstance(tracks, Tracks):
+        return tracks.coords()
+    if len(tracks) and isinstance(tracks[0], np.ndarray):
+        return tracks
+    return [t.xyxy if t.angle is None else t.xywha for t in tracks]
+
+
+def _column(tracks, name):
+    """Return the `name` values of a Tracks selection or of a list of tracks as an array."""
+    return getattr(tracks, name) if isinstance(tracks, Tracks) else np.asarray([getattr(t, name) for t in tracks])
+
+
 def embedding_distance(tracks: list, detections: list, metric: str = "cosine") -> np.ndarray:
     """
     Compute distance between tracks and detections based on embeddings.
 
     Args:
-        tracks (list[STrack]): List of tracks.
-        detections (list[BaseTrack]): List of detections.
+        tracks (Tracks | list[STrack]): Tracks.
+        detections (Tracks | list[BaseTrack]): Detections.
         metric (str, optional): Metric for distance computation. Defaults to 'cosine'.
 
     Returns:
@@ -109,10 +121,10 @@ def embedding_distance(tracks: list, detections: list, metric: str = "cosine") -
     cost_matrix = np.zeros((len(tracks), len(detections)), dtype=np.float32)
     if cost_matrix.size == 0:
         return cost_matrix
-    det_features = np.asarray([track.curr_feat for track in detections], dtype=np.float32)
+    det_features = np.asarray(_column(detections, "curr_feat"), dtype=np.float32)
     # for i, track in enumerate(tracks):
     # cost_matrix[i, :] = np.maximum(0.0, cdist(track.smooth_feat.reshape(1,-1), det_features, metric))
-    track_features = np.asarray([track.smooth_feat for track in tracks], dtype=np.float32)
+    track_features = np.asarray(_column(tracks, "smooth_feat"), dtype=np.float32)
     cost_matrix = np.maximum(0.0, cdist(track_features, det_features, metric))  # Normalized features
     return cost_matrix
 
@@ -123,7 +135,7 @@ def fuse_score(cost_matrix: np.ndarray, detections: list) -> np.ndarray:
 
     Args:
         cost_matrix (np.ndarray): The matrix containing cost values for assignments.
-        detections (list[BaseTrack]): List of detections with scores.
+        detections (Tracks | list[BaseTrack]): Detections with scores.
 
     Returns:
         (np.ndarray): Fused similarity matrix.
@@ -132,7 +144,7 @@ def fuse_score(cost_matrix: np.ndarray, detections: list) -> np.ndarray:
     if cost_matrix.size == 0:
         return cost_matrix
     iou_sim = 1 - cost_matrix
-    det_scores = np.array([det.score for det in detections])
+    det_scores = _column(detections, "score")
     det_scores = np.expand_dims(det_scores, axis=0).repeat(cost_matrix.shape[0], axis=0)
     fuse_sim = iou_sim * det_scores
     return 1 - fuse_sim  # fuse_cost
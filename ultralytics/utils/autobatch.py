@@ -1,12 +1,19 @@
 # Ultralytics YOLO 🚀, AGPL-3.0 license
-"""Functions for estimating the best YOLO batch size to use a fraction of the available CUDA memory in PyTorch."""
-
+"""
+Functions for estimating the best YOLO batch size to use a fraction of the available CUDA memory in PyTorch, and for
+tuning the CPU inference batch size and thread count for throughput.
+"""
+
+import os
+import platform
+import time
 from copy import deepcopy
+from pathlib import Path
 
 import numpy as np
 import torch
 
-from ultralytics.utils import DEFAULT_CFG, LOGGER, colorstr
+from ultralytics.utils import DEFAULT_CFG, LOGGER, colorstr, yaml_load, yaml_save
 from ultralytics.utils.torch_utils import profile
 
 
@@ -86,3 +93,131 @@ def autobatch(model, imgsz=640, fraction=0.60, batch_size=DEFAULT_CFG.batch):
     except Exception as e:
         LOGGER.warning(f"{prefix}WARNING ⚠️ error detected: {e},  using default batch-size {batch_size}.")
         return batch_size
+
+
+def runtime_file(weights):
+    """Return the path of the CPU runtime configuration saved next to `weights`, or None if `weights` is not a path."""
+    if not isinstance(weights, (str, Path)) or not str(weights):
+        return None
+    return Path(weights).with_suffix(".runtime.yaml")
+
+
+def autotune_runtime(weights, imgsz=640, batch_sizes=(1, 2, 4, 8), threads=None, n=30, max_latency=0.0, save=True):
+    """
+    Sweep CPU inference batch sizes and thread counts for a model, measuring throughput and p99 latency.
+
+    The best configuration is the one with the highest throughput among those meeting `max_latency`. It is saved to
+    '<weights stem>.runtime.yaml' next to the weights together with the best thread count of every batch size, and
+    BasePredictor applies the thread count tuned for the batch size and imgsz of its source, see apply_runtime().
+
+    Args:
+        weights (str | Path): Path to the model weights, any format supported by AutoBackend.
+        imgsz (int | list): Inference image size as an int or (h, w). Defaults to 640.
+        batch_sizes (tuple): Batch sizes to sweep. Defaults to (1, 2, 4, 8).
+        threads (tuple, optional): torch intra-op thread counts to sweep, defaults to powers of 2 up to the CPU count.
+        n (int): Timed forward passes per configuration. Defaults to 30.
+        max_latency (float): Maximum p99 batch latency in ms of the selected configuration, 0 for no limit.
+        save (bool): Save the best configuration next to the weights. Defaults to True.
+
+    Returns:
+        (dict): The best configuration with 'imgsz', 'batch', 'threads', 'throughput' (images/s), 'latency_p99' (ms)
+            and 'batch_threads', the best thread count for each batch size.
+    """
+    from ultralytics.nn.autobackend import AutoBackend
+
+    prefix = colorstr("AutoRuntime: ")
+    imgsz = [imgsz, imgsz] if isinstance(imgsz, int) else list(imgsz)
+    cores = os.cpu_count() or 1
+    threads = threads or sorted({t for t in (1, 2, 4, 8, 16, 32, cores // 2, cores) if 0 < t <= cores})
+    LOGGER.info(f"{prefix}Tuning {weights} for imgsz={imgsz} on {cores} CPU cores")
+    model = AutoBackend(weights, device=torch.device("cpu"), fuse=True, verbose=False)
+    default = torch.get_num_threads()
+
+    # Profile configurations
+    results = []
+    LOGGER.info(f"{'batch':>12s}{'threads':>12s}{'images/s':>12s}{'p50 (ms)':>12s}{'p99 (ms)':>12s}")
+    with torch.inference_mode():
+        for t in threads:
+            torch.set_num_threads(t)
+            for b in batch_sizes:
+                im = torch.zeros(b, 3, *imgsz)
+                try:
+                    for _ in range(2):  # warmup
+                        model(im)
+                    dt = []
+                    for _ in range(n):
+                        t0 = time.perf_counter()
+                        model(im)
+                        dt.append(time.perf_counter() - t0)
+                except Exception as e:  # i.e. exports with a fixed batch size
+                    LOGGER.info(f"{prefix}batch={b} failed: {e}")
+                    break
+                dt = np.array(dt) * 1e3
+                p50, p99 = (round(float(np.percentile(dt, q)), 2) for q in (50, 99))
+                ips = round(float(b * n * 1e3 / dt.sum()), 2)
+                x = dict(batch=b, threads=t, throughput=ips, latency_p50=p50, latency_p99=p99)
+                LOGGER.info(f"{b:12d}{t:12d}{x['throughput']:12.1f}{x['latency_p50']:12.1f}{x['latency_p99']:12.1f}")
+                results.append(x)
+    torch.set_num_threads(default)
+    if not results:
+        LOGGER.warning(f"{prefix}WARNING ⚠️ no configuration could be profiled for {weights}")
+        return {}
+
+    # Select and save the best configuration
+    valid = [x for x in results if not max_latency or x["latency_p99"] <= max_latency]
+    if not valid:
+        LOGGER.warning(f"{prefix}WARNING ⚠️ no configuration meets max_latency={max_latency}ms, ignoring it")
+    best = dict(imgsz=imgsz, **max(valid or results, key=lambda x: x["throughput"]))
+    best["batch_threads"] = {}  # best thread count per batch size, the batch used at inference is set by the source
+    for x in sorted(valid or results, key=lambda x: x["throughput"]):  # ascending, the fastest of each batch wins
+        best["batch_threads"][x["batch"]] = x["threads"]
+    best.update(cpu_count=cores, machine=platform.machine(), torch=str(torch.__version__))
+    f = runtime_file(weights)
+    if save and f and f.parent.exists():
+        yaml_save(f, best)
+        LOGGER.info(f"{prefix}Saved {f}")
+    LOGGER.info(
+        f"{prefix}Best batch={best['batch']} threads={best['threads']}: {best['throughput']:.1f} images/s, "
+        f"{best['latency_p99']:.1f}ms p99 latency ✅"
+    )
+    return best
+
+
+def apply_runtime(weights, imgsz=None, batch=1, verbose=True):
+    """
+    Apply the CPU thread count saved by autotune_runtime() next to `weights` for the given imgsz and batch size, if any.
+
+    The configuration is skipped if it was tuned on a machine with a different number of CPU cores, for another imgsz,
+    or without the requested batch size.
+
+    Args:
+        weights (str | Path): Path to the model weights.
+        imgsz (list, optional): Inference image size as (h, w), None to accept any tuned imgsz.
+        batch (int): Inference batch size. Defaults to 1.
+        verbose (bool): Log the applied configuration. Defaults to True.
+
+    Returns:
+        (dict | None): The applied configuration, or None if there is none for this machine, imgsz and batch size.
+    """
+    f = runtime_file(weights)
+    if f is None or not f.is_file():
+        return None
+    cfg = yaml_load(f)
+    prefix = colorstr("AutoRuntime: ")
+    if cfg.get("cpu_count") != os.cpu_count():
+        LOGGER.warning(f"{prefix}WARNING ⚠️ {f} was tuned for {cfg.get('cpu_count')} CPU cores, ignoring it")
+        return None
+    if imgsz is not None and list(cfg.get("imgsz") or []) != list(imgsz):
+        LOGGER.warning(f"{prefix}WARNING ⚠️ {f} was tuned for imgsz={cfg.get('imgsz')}, not {list(imgsz)}, ignoring it")
+        return None
+    threads = (cfg.get("batch_threads") or {}).get(batch)
+    if threads is None and cfg.get("batch") == batch:  # files without 'batch_threads'
+        threads = cfg.get("threads")
+    if not threads:
+        if verbose:
+            LOGGER.info(f"{prefix}{f} has no threads tuned for batch={batch}, ignoring it")
+        return None
+    if verbose and threads != torch.get_num_threads():
+        LOGGER.info(f"{prefix}Using threads={threads} tuned for batch={batch} from {f}")
+    torch.set_num_threads(threads)
+    return cfg
@@ -6,6 +6,16 @@ Usage:
     from ultralytics.utils.benchmarks import ProfileModels, benchmark
     ProfileModels(['yolov8n.yaml', 'yolov8s.yaml']).profile()
     benchmark(model='yolov8n.pt', imgsz=160)
+    benchmark_nms(batch_sizes=(1, 8, 32, 64))
+    benchmark_soft_nms(candidates=(1000, 10000))
+    benchmark_tal(gts=(10, 100, 500))
+    benchmark_ap(predictions=(10000, 1000000))
+    benchmark_import(model='yolov8n.pt')
+    benchmark_end2end(model='yolov8n.pt', batch_sizes=(1, 8))
+    benchmark_ort(model='yolov8n.onnx', sessions=(1, 2, 4))
+    benchmark_dynamic_val(model='yolov8n.pt', batch=32)
+    benchmark_prune(model='yolov8n.pt', flops=(0.75, 0.5), epochs=10)
+    benchmark_match(model='yolov8n.pt', max_det=1000)
 
 Format                  | `format=argument`         | Model
 ---                     | ---                       | ---
@@ -31,6 +41,7 @@ from pathlib import Path
 
 import numpy as np
 import torch.cuda
+import torch.nn.functional as F
 
 from ultralytics import YOLO
 from ultralytics.cfg import TASK2DATA, TASK2METRIC
@@ -38,6 +49,9 @@ from ultralytics.engine.exporter import export_formats
 from ultralytics.utils import ASSETS, LINUX, LOGGER, MACOS, TQDM, WEIGHTS_DIR
 from ultralytics.utils.checks import check_requirements, check_yolo
 from ultralytics.utils.files import file_size
+from ultralytics.utils.metrics import ap_per_class
+from ultralytics.utils.ops import Profile, filter_end2end, non_max_suppression
+from ultralytics.utils.tal import TaskAlignedAssigner, make_anchors
 from ultralytics.utils.torch_utils import select_device
 
 
@@ -143,6 +157,553 @@ def benchmark(
     return df
 
 
+def benchmark_nms(batch_sizes=(1, 2, 4, 8, 16, 32, 64), nc=80, imgsz=640, conf=0.25, iou=0.7, device="cpu", runs=10):
+    """
+    Benchmark the per-image and batched non_max_suppression() paths on synthetic YOLOv8 detection head outputs.
+
+    Args:
+        batch_sizes (tuple): Batch sizes to benchmark. Default is (1, 2, 4, 8, 16, 32, 64).
+        nc (int): Number of classes of the synthetic head. Default is 80.
+        imgsz (int): Image size, determines the number of anchors. Default is 640.
+        conf (float): Confidence threshold passed to NMS. Default is 0.25.
+        iou (float): IoU threshold passed to NMS. Default is 0.7.
+        device (str): Device to run the benchmark on, either 'cpu' or 'cuda'. Default is 'cpu'.
+        runs (int): Number of timed runs per batch size. Default is 10.
+
+    Returns:
+        df (pandas.DataFrame): Per batch size timings (ms/batch) of both paths, speedup and whether outputs match.
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_nms
+
+        benchmark_nms(batch_sizes=(1, 32), device='cuda')
+        ```
+    """
+    import pandas as pd
+
+    device = select_device(device, verbose=False)
+    y = []
+    for bs in batch_sizes:
+        preds = _synthetic_head_output(bs, nc, imgsz, conf, 400, device)
+        t = [Profile(device=device), Profile(device=device)]
+        for _ in range(runs):
+            for dt, batched in zip(t, (False, True)):
+                with dt:
+                    out = non_max_suppression(preds.clone(), conf, iou, batched=batched)
+                if batched:
+                    same = all(torch.equal(a, b) for a, b in zip(ref, out))
+                else:
+                    ref = out
+        loop, vec = (dt.t / runs * 1e3 for dt in t)
+        y.append([bs, round(loop, 2), round(vec, 2), round(loop / vec, 2), same])
+
+    df = pd.DataFrame(y, columns=["Batch", "Loop (ms)", "Batched (ms)", "Speedup", "Identical"])
+    LOGGER.info(f"\nNMS benchmark on {device} with nc={nc} at imgsz={imgsz}\n{df}\n")
+    return df
+
+
+def benchmark_soft_nms(
+    candidates=(100, 1000, 5000, 10000), nc=80, imgsz=640, conf=0.25, iou=0.7, device="cpu", runs=10
+):
+    """
+    Benchmark the Soft-NMS modes of non_max_suppression() against hard NMS on synthetic YOLOv8 detection head outputs.
+
+    Args:
+        candidates (tuple): Numbers of candidate boxes above the confidence threshold per image to benchmark.
+        nc (int): Number of classes of the synthetic head. Default is 80.
+        imgsz (int): Image size, determines the number of anchors. Default is 640.
+        conf (float): Confidence threshold passed to NMS. Default is 0.25.
+        iou (float): IoU threshold passed to NMS. Default is 0.7.
+        device (str): Device to run the benchmark on, either 'cpu' or 'cuda'. Default is 'cpu'.
+        runs (int): Number of timed runs per setting. Default is 10.
+
+    Returns:
+        df (pandas.DataFrame): Per candidate count latency (ms/image) of every NMS mode and IoU type.
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_soft_nms
+
+        benchmark_soft_nms(candidates=(1000, 10000), device='cuda')
+        ```
+    """
+    import pandas as pd
+
+    pd.options.display.width = 120
+    device = select_device(device, verbose=False)
+    modes = ("hard", "iou"), ("soft", "iou"), ("soft-linear", "iou"), ("soft", "diou"), ("soft", "ciou")
+    y = []
+    for n in candidates:
+        preds = _synthetic_head_output(1, nc, imgsz, conf, n, device)
+        row = [n]
+        for nms_mode, nms_iou in modes:
+            dt = Profile(device=device)
+            for _ in range(runs):
+                with dt:
+                    non_max_suppression(preds.clone(), conf, iou, nms_mode=nms_mode, nms_iou=nms_iou)
+            row.append(round(dt.t / runs * 1e3, 2))
+        y.append(row)
+
+    columns = ["Candidates"] + [m if u == "iou" else f"{m} {u}" for m, u in modes]
+    df = pd.DataFrame(y, columns=columns)
+    LOGGER.info(f"\nSoft-NMS benchmark (ms/im) on {device} with nc={nc} at imgsz={imgsz}\n{df}\n")
+    return df
+
+
+def benchmark_tal(gts=(10, 50, 100, 200, 500), batch=8, nc=80, imgsz=640, chunk=64, device="cpu", runs=5):
+    """
+    Benchmark the dense and sparse TaskAlignedAssigner modes on synthetic crowded targets across ground truth counts.
+
+    Args:
+        gts (tuple): Maximum numbers of ground truths per image to benchmark, the first image always has the maximum.
+        batch (int): Batch size. Default is 8.
+        nc (int): Number of classes. Default is 80.
+        imgsz (int): Image size, determines the number of anchors. Default is 640.
+        chunk (int): Number of ground truths per chunk of the sparse mode. Default is 64.
+        device (str): Device to run the benchmark on, either 'cpu' or 'cuda'. Default is 'cpu'.
+        runs (int): Number of timed runs per setting. Default is 5.
+
+    Returns:
+        df (pandas.DataFrame): Per ground truth count timings (ms/batch) and peak CUDA memory (MB) of both modes, and
+            whether their targets match.
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_tal
+
+        benchmark_tal(gts=(100, 1000), device='cuda')
+        ```
+    """
+    import pandas as pd
+
+    device = select_device(device, verbose=False)
+    feats = [torch.empty(batch, 0, imgsz // s, imgsz // s, device=device) for s in (8, 16, 32)]
+    anchor_points, stride_tensor = make_anchors(feats, torch.tensor([8.0, 16.0, 32.0], device=device))
+    anchor_points *= stride_tensor
+    na = len(anchor_points)
+    y = []
+    for n in gts:
+        pd_scores = torch.rand(batch, na, nc, device=device)
+        xy, wh = torch.rand(batch, na, 2, device=device) * imgsz, torch.rand(batch, na, 2, device=device) * 64 + 4
+        pd_bboxes = torch.cat((xy - wh / 2, xy + wh / 2), -1)
+        counts = torch.randint(0, n + 1, (batch, 1), device=device)
+        counts[0] = n
+        mask_gt = (torch.arange(n, device=device) < counts)[..., None].float()
+        xy, wh = torch.rand(batch, n, 2, device=device) * imgsz, torch.rand(batch, n, 2, device=device) * 48 + 4
+        gt_bboxes = torch.cat((xy - wh / 2, xy + wh / 2), -1) * mask_gt
+        gt_labels = torch.randint(0, nc, (batch, n, 1), device=device).float() * mask_gt
+        args = pd_scores, pd_bboxes, anchor_points, gt_labels, gt_bboxes, mask_gt
+
+        row = [n]
+        for mode in (0, chunk):
+            assigner = TaskAlignedAssigner(topk=10, num_classes=nc, alpha=0.5, beta=6.0, chunk=mode)
+            if device.type == "cuda":
+                torch.cuda.reset_peak_memory_stats(device)
+            dt = Profile(device=device)
+            for _ in range(runs):
+                with dt:
+                    out = assigner(*args)
+            mem = torch.cuda.max_memory_allocated(device) / 2**20 if device.type == "cuda" else float("nan")
+            row += [round(dt.t / runs * 1e3, 2), round(mem, 1)]
+            if mode:
+                row.append(all(torch.equal(a, b) for a, b in zip(ref, out)))
+            ref = out
+        y.append(row)
+
+    columns = ["GTs", "Dense (ms)", "Dense (MB)", "Sparse (ms)", "Sparse (MB)", "Identical"]
+    df = pd.DataFrame(y, columns=columns)
+    LOGGER.info(f"\nTaskAlignedAssigner benchmark on {device} with batch={batch} at imgsz={imgsz}\n{df}\n")
+    return df
+
+
+def benchmark_ap(predictions=(10000, 100000, 1000000), nc=(1, 10, 80), runs=3):
+    """
+    Benchmark ap_per_class() on synthetic validation statistics across prediction and class counts.
+
+    Args:
+        predictions (tuple): Total numbers of predictions to benchmark.
+        nc (tuple): Numbers of classes to benchmark.
+        runs (int): Number of timed runs per setting. Default is 3.
+
+    Returns:
+        df (pandas.DataFrame): Latency (ms) per prediction count (rows) and class count (columns).
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_ap
+
+        benchmark_ap(predictions=(10000, 1000000), nc=(80,))
+        ```
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    y = []
+    for n in predictions:
+        row = [n]
+        for c in nc:
+            conf = rng.random(n).astype(np.float32)
+            pred_cls = rng.integers(0, c, n).astype(np.float32)
+            tp = rng.random((n, 10)) < conf[:, None] * np.linspace(0.9, 0.2, 10)  # 10 IoU thresholds
+            target_cls = rng.integers(0, c, max(n // 5, c)).astype(np.float32)
+            names = {i: str(i) for i in range(c)}
+            dt = Profile()
+            for _ in range(runs):
+                with dt:
+                    ap_per_class(tp, conf, pred_cls, target_cls, names=names)
+            row.append(round(dt.t / runs * 1e3, 1))
+        y.append(row)
+
+    df = pd.DataFrame(y, columns=["Predictions"] + [f"nc={c} (ms)" for c in nc])
+    LOGGER.info(f"\nap_per_class() benchmark\n{df}\n")
+    return df
+
+
+def benchmark_import(model="yolov8n.pt", source=ASSETS / "bus.jpg", imgsz=640, runs=3):
+    """
+    Benchmark 'import ultralytics' and the time to first prediction in fresh Python processes.
+
+    Every run starts a new interpreter so module caches are cold apart from the OS file cache, the first run is used
+    as warmup.
+
+    Args:
+        model (str): Model weights or YAML to predict with. Default is 'yolov8n.pt'.
+        source (str | Path): Image to predict on. Default is ASSETS / 'bus.jpg'.
+        imgsz (int): Inference image size. Default is 640.
+        runs (int): Number of timed runs per step. Default is 3.
+
+    Returns:
+        df (pandas.DataFrame): Median wall time (s) of the import and of import plus first prediction.
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_import
+
+        benchmark_import(model='yolov8n.pt')
+        ```
+    """
+    import subprocess
+    import sys
+
+    import pandas as pd
+
+    predict = f"YOLO({str(model)!r}).predict({str(source)!r}, imgsz={imgsz}, verbose=False)"
+    steps = {"import ultralytics": "import ultralytics", "first prediction": f"from ultralytics import YOLO; {predict}"}
+    y = []
+    for name, cmd in steps.items():
+        t = []
+        for i in range(runs + 1):
+            t0 = time.perf_counter()
+            subprocess.run([sys.executable, "-c", cmd], check=True, capture_output=True)
+            if i:  # first run is warmup
+                t.append(time.perf_counter() - t0)
+        y.append([name, round(float(np.median(t)), 2), round(min(t), 2)])
+
+    df = pd.DataFrame(y, columns=["Step", "Median (s)", "Min (s)"])
+    LOGGER.info(f"\nImport benchmark for {model}\n{df}\n")
+    return df
+
+
+def benchmark_end2end(
+    model="yolov8n.pt", source=ASSETS / "bus.jpg", imgsz=640, batch_sizes=(1,), conf=0.25, iou=0.7, runs=20
+):
+    """
+    Benchmark CPU ONNX Runtime latency of a plain ONNX export plus Python NMS against an end2end=True export.
+
+    The plain export takes float32 input and runs non_max_suppression() on its raw output, the end2end export takes
+    uint8 input and only drops its padding rows, both include the host-side input conversion.
+
+    Args:
+        model (str): Detection model weights or YAML to export. Default is 'yolov8n.pt'.
+        source (str | Path): Image to run on, letterboxed to 'imgsz'. Default is ASSETS / 'bus.jpg'.
+        imgsz (int): Export and inference image size. Default is 640.
+        batch_sizes (tuple): Static export batch sizes to benchmark. Default is (1,).
+        conf (float): Confidence threshold of both paths. Default is 0.25.
+        iou (float): IoU threshold of both paths. Default is 0.7.
+        runs (int): Number of timed runs per batch size. Default is 20.
+
+    Returns:
+        df (pandas.DataFrame): Per batch size latency (ms/batch) of both paths, speedup and detections of each path.
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_end2end
+
+        benchmark_end2end(model='yolov8n.pt', batch_sizes=(1, 8))
+        ```
+    """
+    import cv2
+    import pandas as pd
+
+    check_requirements("onnxruntime")
+    import onnxruntime
+
+    from ultralytics.data.augment import LetterBox
+
+    im = LetterBox(imgsz, auto=False)(image=cv2.imread(str(source)))[..., ::-1].transpose(2, 0, 1)  # BGR to RGB, CHW
+    y = []
+    for bs in batch_sizes:
+        files = []
+        for end2end in (False, True):
+            f = Path(YOLO(model).export(format="onnx", imgsz=imgsz, batch=bs, conf=conf, iou=iou, end2end=end2end))
+            files.append(f.rename(f.with_name(f"{f.stem}_b{bs}{'_end2end' if end2end else ''}.onnx")))
+        sessions = [onnxruntime.InferenceSession(str(f), providers=["CPUExecutionProvider"]) for f in files]
+        x = np.ascontiguousarray(np.stack([im] * bs))  # uint8 (bs, 3, imgsz, imgsz)
+        t, n = [Profile(), Profile()], [0, 0]
+        for i in range(runs + 1):
+            for j, (dt, session) in enumerate(zip(t, sessions)):
+                feed = {session.get_inputs()[0].name: x if j else x.astype(np.float32) / 255}
+                if i == 1:
+                    dt.t = 0.0  # discard the warmup run
+                with dt:
+                    preds = torch.from_numpy(session.run(None, feed)[0])
+                    preds = filter_end2end(preds, conf) if j else non_max_suppression(preds, conf, iou)
+                n[j] = sum(len(p) for p in preds)
+        plain, end2end = (dt.t / runs * 1e3 for dt in t)
+        y.append([bs, round(plain, 2), round(end2end, 2), round(plain / end2end, 2), *n])
+
+    df = pd.DataFrame(y, columns=["Batch", "ONNX + NMS (ms)", "end2end (ms)", "Speedup", "Boxes", "Boxes end2end"])
+    LOGGER.info(f"\nend2end ONNX benchmark on CPU for {model} at imgsz={imgsz}\n{df}\n")
+    return df
+
+
+def benchmark_ort(model="yolov8n.onnx", imgsz=640, batch=1, sessions=(1, 2, 4), opt="all", runs=50):
+    """
+    Benchmark CPU ONNX Runtime throughput of AutoBackend with IOBinding and with session pools serving several threads.
+
+    A pool of n sessions is driven by n threads and splits the CPU cores between its sessions, the first row is the
+    default single session without IOBinding.
+
+    Args:
+        model (str): ONNX model to load. Default is 'yolov8n.onnx'.
+        imgsz (int): Inference image size, must match static exports. Default is 640.
+        batch (int): Batch size of every call, must match static exports. Default is 1.
+        sessions (tuple): Session pool sizes to benchmark with IOBinding. Default is (1, 2, 4).
+        opt (str): Graph optimization level, i.e. 'disable', 'basic', 'extended' or 'all'. Default is 'all'.
+        runs (int): Number of timed calls per thread. Default is 50.
+
+    Returns:
+        df (pandas.DataFrame): Throughput (images/s), mean session latency (ms/call) and output allocations per call.
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_ort
+
+        benchmark_ort(model='yolov8n.onnx', sessions=(1, 2, 4))
+        ```
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    import pandas as pd
+
+    from ultralytics.nn.autobackend import AutoBackend
+
+    im = torch.rand(batch, 3, imgsz, imgsz)
+    y = []
+    for n, iobinding in [(1, False)] + [(n, True) for n in sessions]:
+        m = AutoBackend(model, ort=dict(sessions=n, iobinding=iobinding, opt=opt), verbose=False)
+
+        def run(calls):
+            """Call the model 'calls' times."""
+            for _ in range(calls):
+                m(im)
+
+        with ThreadPoolExecutor(n) as pool:
+            list(pool.map(run, [2] * n))  # warmup, allocates the IOBinding buffers of every thread
+            m.ort_stats.update(calls=0, allocations=0, latency_ms=0.0)
+            t = time.perf_counter()
+            list(pool.map(run, [runs] * n))
+            t = time.perf_counter() - t
+        s = m.ort_stats
+        ips, latency = n * runs * batch / t, s["latency_ms"] / s["calls"]
+        y.append([n, iobinding, round(ips, 1), round(latency, 2), round(s["allocations"] / s["calls"], 2)])
+
+    df = pd.DataFrame(y, columns=["Sessions", "IOBinding", "Images/s", "Latency (ms)", "Allocations/call"])
+    LOGGER.info(f"\nONNX Runtime benchmark on CPU for {model} at batch={batch}, imgsz={imgsz}\n{df}\n")
+    return df
+
+
+def benchmark_dynamic_val(model="yolov8n.pt", data=None, imgsz=640, batch=16, rect=False, device="cpu", tol=0.005):
+    """
+    Benchmark validation of a dynamic=True ONNX export at batch=1 and at 'batch', checking its metric against PyTorch.
+
+    Args:
+        model (str): Model weights to validate and export. Default is 'yolov8n.pt'.
+        data (str, optional): Dataset to evaluate on, inherited from TASK2DATA if not passed. Default is None.
+        imgsz (int): Validation and export image size. Default is 640.
+        batch (int): Batch size of the batched validation runs. Default is 16.
+        rect (bool): Validate the batched runs with rectangular batches. Default is False.
+        device (str): Device to run the benchmark on, either 'cpu' or 'cuda'. Default is 'cpu'.
+        tol (float): Maximum absolute metric difference to the PyTorch model of the same batch and rect settings.
+
+    Returns:
+        df (pandas.DataFrame): Metric, validation wall time (s) and inference time (ms/im) of every run, and whether
+            the metric matches the PyTorch model.
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_dynamic_val
+
+        benchmark_dynamic_val(model='yolov8n.pt', data='coco128.yaml', batch=32)
+        ```
+    """
+    import pandas as pd
+
+    pd.options.display.width = 120
+    model = YOLO(model)
+    data = data or TASK2DATA[model.task]
+    key = TASK2METRIC[model.task]
+    f = model.export(format="onnx", imgsz=imgsz, dynamic=True, device=device, verbose=False)
+    rects = (False, True) if rect else (False,)
+    runs = [("PyTorch", r, batch) for r in rects] + [("ONNX", False, 1)] + [("ONNX", r, batch) for r in rects]
+    y, ref = [], {}
+    for name, r, b in runs:
+        m = model if name == "PyTorch" else YOLO(f, task=model.task)
+        t = time.perf_counter()
+        results = m.val(data=data, batch=b, imgsz=imgsz, rect=r, device=device, plots=False, verbose=False)
+        t = time.perf_counter() - t
+        metric = results.results_dict[key]
+        ref.setdefault(r, metric)  # PyTorch runs first, square letterboxing does not depend on the batch size
+        same = abs(metric - ref[r]) <= tol
+        y.append([name, b, r, round(metric, 4), round(t, 2), round(results.speed["inference"], 2), same])
+        if not same:
+            LOGGER.warning(f"WARNING ⚠️ {name} batch={b} rect={r} {key}={metric:.4f} differs from PyTorch")
+
+    df = pd.DataFrame(y, columns=["Format", "Batch", "Rect", key, "Val time (s)", "Inference (ms/im)", "Matches"])
+    LOGGER.info(f"\nDynamic batch validation benchmark for {model.ckpt_path} on {data} at imgsz={imgsz}\n{df}\n")
+    return df
+
+
+def benchmark_prune(model="yolov8n.pt", data=None, flops=(0.75, 0.5), method="bn", epochs=0, imgsz=640, device="cpu"):
+    """
+    Benchmark channel pruning of a detection model to several FLOPs budgets, optionally with fine-tuning.
+
+    Args:
+        model (str): Model weights to prune. Default is 'yolov8n.pt'.
+        data (str, optional): Dataset to evaluate and fine-tune on, inherited from TASK2DATA if not passed.
+        flops (tuple): Target GFLOPs as fractions of the unpruned model's. Default is (0.75, 0.5).
+        method (str): Channel importance, 'bn' or 'taylor'. Default is 'bn'.
+        epochs (int): Fine-tuning epochs after pruning, 0 validates the pruned models as they are. Default is 0.
+        imgsz (int): Pruning, fine-tuning and validation image size. Default is 640.
+        device (str): Device to run the benchmark on, either 'cpu' or 'cuda'. Default is 'cpu'.
+
+    Returns:
+        df (pandas.DataFrame): GFLOPs, parameters, fused latency (ms) and metric of the unpruned and pruned models.
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_prune
+
+        benchmark_prune(model='yolov8n.pt', data='coco128.yaml', flops=(0.5,), method='taylor', epochs=10)
+        ```
+    """
+    import pandas as pd
+
+    from ultralytics.utils.prune import get_gflops, get_latency
+
+    pd.options.display.width = 120
+    data = data or TASK2DATA["detect"]
+    key = TASK2METRIC["detect"]
+    device = select_device(device, verbose=False)
+    y = []
+    for ratio in (1.0, *flops):
+        m = YOLO(model)
+        m.model.to(device)
+        if ratio < 1:
+            m.prune(flops=ratio, method=method, epochs=epochs, data=data, imgsz=imgsz, device=device, plots=False)
+        n = sum(p.numel() for p in m.model.parameters())
+        gflops, ms = get_gflops(m.model, imgsz), get_latency(m.model, imgsz)
+        metric = m.val(data=data, imgsz=imgsz, device=device, plots=False, verbose=False).results_dict[key]
+        y.append([ratio, round(gflops, 2), n, round(ms, 2), round(metric, 4)])
+
+    df = pd.DataFrame(y, columns=["FLOPs target", "GFLOPs", "Parameters", "Latency (ms)", key])
+    LOGGER.info(f"\nPruning benchmark for {model} with '{method}' importance and {epochs} epochs on {data}\n{df}\n")
+    return df
+
+
+def benchmark_match(model="yolov8n.pt", data=None, imgsz=640, batch=16, conf=0.001, max_det=1000, device="cpu"):
+    """
+    Benchmark validation with the single pass greedy matcher against the per-threshold matching loop.
+
+    Both runs use the same model and settings, the loop run forces BaseValidator.match_predictions() onto the loop for
+    every image. The default conf=0.001 and max_det=1000 keep up to 1000 low confidence detections per image, the
+    setting where matching cost matters most.
+
+    Args:
+        model (str): Detection model weights to validate. Default is 'yolov8n.pt'.
+        data (str, optional): Dataset to evaluate on, inherited from TASK2DATA if not passed. Default is None.
+        imgsz (int): Validation image size. Default is 640.
+        batch (int): Validation batch size. Default is 16.
+        conf (float): Validation confidence threshold. Default is 0.001.
+        max_det (int): Maximum detections per image. Default is 1000.
+        device (str): Device to run the benchmark on, either 'cpu' or 'cuda'. Default is 'cpu'.
+
+    Returns:
+        df (pandas.DataFrame): Matching time (ms/im), validation wall time (s) and metric of both matchers, and whether
+            the metric matches the loop.
+
+    Example:
+        ```python
+        from ultralytics.utils.benchmarks import benchmark_match
+
+        benchmark_match(model='yolov8n.pt', data='coco128.yaml', max_det=1000)
+        ```
+    """
+    import pandas as pd
+
+    pd.options.display.width = 120
+    model = YOLO(model)
+    data = data or TASK2DATA[model.task]
+    key = TASK2METRIC[model.task]
+    device = select_device(device, verbose=False)
+    base = model._smart_load("validator")
+    y, ref = [], None
+    for name, loop in (("Per-threshold loop", True), ("Single pass", False)):
+        dt, calls = Profile(device=device), []
+
+        def match_predictions(self, *args, **kwargs):
+            """Time match_predictions() of the validator."""
+            calls.append(1)
+            with dt:
+                return base.match_predictions(self, *args, **kwargs)
+
+        attrs = dict(match_predictions=match_predictions)
+        if loop:
+            attrs["has_tied_labels"] = staticmethod(lambda iou: True)  # every image takes the loop
+        t = time.perf_counter()
+        results = model.val(
+            validator=type(base.__name__, (base,), attrs),
+            data=data,
+            imgsz=imgsz,
+            batch=batch,
+            conf=conf,
+            max_det=max_det,
+            device=device,
+            plots=False,
+            verbose=False,
+        )
+        t = time.perf_counter() - t
+        metric = results.results_dict[key]
+        ref = metric if ref is None else ref
+        y.append([name, round(dt.t / max(len(calls), 1) * 1e3, 2), round(t, 2), round(metric, 4), metric == ref])
+
+    df = pd.DataFrame(y, columns=["Matcher", "Match (ms/im)", "Val time (s)", key, "Same metric"])
+    LOGGER.info(f"\nMatching benchmark for {model.ckpt_path} on {data} at conf={conf}, max_det={max_det}\n{df}\n")
+    return df
+
+
+def _synthetic_head_output(bs, nc, imgsz, conf, candidates, device):
+    """Random (bs, 4 + nc, anchors) detection head output with about 'candidates' anchors per image above 'conf'."""
+    na = sum((imgsz // s) ** 2 for s in (8, 16, 32))  # number of anchors
+    xy = torch.rand(bs, 2, na, device=device) * imgsz
+    wh = torch.rand(bs, 2, na, device=device) * imgsz / 4 + 2
+    scores = torch.rand(bs, nc, na, device=device) * conf  # background below the confidence threshold
+    hit = torch.rand(bs, 1, na, device=device) < min(candidates / na, 1.0)
+    scores += hit * F.one_hot(torch.randint(nc, (bs, na), device=device), nc).permute(0, 2, 1) * (1 - conf)
+    return torch.cat((xy, wh, scores), 1)
+
+
 class ProfileModels:
     """
     ProfileModels class for profiling different models on ONNX and TensorRT.
@@ -170,6 +170,28 @@ def check_imgsz(imgsz, stride=32, min_dim=1, max_dim=2, floor=0):
     return sz
 
 
+def check_end2end(end2end, conf, iou):
+    """
+    Warn if a model exported with end2end=True is run with thresholds its embedded NMS cannot honour.
+
+    Args:
+        end2end (dict | bool): The 'end2end' export metadata with the export 'conf' and 'iou', which is None for
+            NMS-free heads, or True for exports that did not record them.
+        conf (float): Requested confidence threshold.
+        iou (float): Requested NMS IoU threshold.
+    """
+    if not isinstance(end2end, dict):
+        return
+    if conf < end2end["conf"]:
+        LOGGER.warning(
+            f"WARNING ⚠️ conf={conf} is below the conf={end2end['conf']} of this end2end export, whose NMS has already "
+            f"removed lower confidence detections. Metrics such as mAP are underestimated, re-export with the lower "
+            f"'conf' for validation, i.e. 'yolo export end2end=True conf=0.001'."
+        )
+    if end2end["iou"] is not None and iou != end2end["iou"]:
+        LOGGER.warning(f"WARNING ⚠️ iou={iou} has no effect, this end2end export's NMS uses iou={end2end['iou']}.")
+
+
 def check_version(
     current: str = "0.0.0",
     required: str = "0.0.0",
@@ -315,9 +315,10 @@ class v8DetectionLoss:
 
         self.use_dfl = m.reg_max > 1
 
-        self.assigner = TaskAlignedAssigner(topk=tal_topk, num_classes=self.nc, alpha=0.5, beta=6.0)
+        chunk = getattr(h, "tal_chunk", 0)  # sparse assignment in chunks of gts, 0 for dense
+        self.assigner = TaskAlignedAssigner(topk=tal_topk, num_classes=self.nc, alpha=0.5, beta=6.0, chunk=chunk)
         if hasattr(m, 'dfl_aux'):
-            self.assigner_aux = TaskAlignedAssigner(topk=13, num_classes=self.nc, alpha=0.5, beta=6.0)
+            self.assigner_aux = TaskAlignedAssigner(topk=13, num_classes=self.nc, alpha=0.5, beta=6.0, chunk=chunk)
             self.aux_loss_ratio = 0.25
         # self.assigner = ATSSAssigner(9, num_classes=self.nc)
         self.bbox_loss = BboxLoss(m.reg_max - 1, use_dfl=self.use_dfl).to(device)
@@ -974,7 +975,9 @@ class v8ClassificationLoss:
 class v8OBBLoss(v8DetectionLoss):
     def __init__(self, model):  # model must be de-paralleled
         super().__init__(model)
-        self.assigner = RotatedTaskAlignedAssigner(topk=10, num_classes=self.nc, alpha=0.5, beta=6.0)
+        self.assigner = RotatedTaskAlignedAssigner(
+            topk=10, num_classes=self.nc, alpha=0.5, beta=6.0, chunk=self.assigner.chunk
+        )
         self.bbox_loss = RotatedBboxLoss(self.reg_max - 1, use_dfl=self.use_dfl).to(self.device)
 
     def preprocess(self, targets, batch_size, scale_tensor):
@@ -942,23 +942,55 @@ class ConfusionMatrix:
             gt_bboxes (Array[M, 4]): Ground truth bounding boxes with xyxy format.
             gt_cls (Array[M]): The class labels.
         """
+        if detections is not None:
+            detections = detections[detections[:, 4] > self.conf]
         if gt_cls.shape[0] == 0:  # Check if labels is empty
             if detections is not None:
-                detections = detections[detections[:, 4] > self.conf]
-                detection_classes = detections[:, 5].int()
-                for dc in detection_classes:
-                    self.matrix[dc, self.nc] += 1  # false positives
+                detection_classes = detections[:, 5].long()
+                self.update_matrix(detection_classes, torch.full_like(detection_classes, self.nc))  # false positives
             return
-        if detections is None:
-            gt_classes = gt_cls.int()
-            for gc in gt_classes:
-                self.matrix[self.nc, gc] += 1  # background FN
+        gt_classes = gt_cls.long().view(-1)
+        if detections is None or detections.shape[0] == 0:
+            self.update_matrix(torch.full_like(gt_classes, self.nc), gt_classes)  # background FN
             return
 
-        detections = detections[detections[:, 4] > self.conf]
-        gt_classes = gt_cls.int()
-        detection_classes = detections[:, 5].int()
+        detection_classes = detections[:, 5].long()
         iou = box_iou(gt_bboxes, detections[:, :4])
+        gt_matched, gt_det = self.match(iou * (iou > self.iou_thres))
+        n = iou.shape[1]
+
+        # Correct (or wrong class) for matched gts, true background for the others
+        self.update_matrix(detection_classes[gt_det].masked_fill(~gt_matched, self.nc), gt_classes)
+
+        # Predicted background for unmatched detections, only counted if the image has matches
+        if gt_matched.any():
+            unmatched = torch.ones(n, dtype=torch.bool, device=iou.device)
+            unmatched[gt_det[gt_matched]] = False
+            dc = detection_classes[unmatched]
+            self.update_matrix(dc, torch.full_like(dc, self.nc))
+
+    def match(self, iou):
+        """
+        Match gts and detections, every detection takes its highest IoU gt and every gt keeps its highest IoU detection.
+
+        Ties are broken by the order of an unstable numpy argsort over all matches, so only images without ties are
+        matched on the device of the inputs, the others by the original loop.
+
+        Args:
+            iou (torch.Tensor): An MxN tensor of IoU values between gts and detections, zero unless above iou_thres.
+
+        Returns:
+            gt_matched (torch.Tensor): Whether every gt is matched, shape (M,).
+            gt_det (torch.Tensor): Index of the detection matched to every gt, shape (M,).
+        """
+        m, n = iou.shape
+        best = iou.amax(0)  # best IoU of every detection
+        pairs = torch.zeros_like(iou)
+        pairs[iou.argmax(0), torch.arange(n, device=iou.device)] = best
+        tied = (((iou == best) & (iou > 0)).sum(0) > 1).any()  # detections with several best gts
+        tied = tied or (((pairs == pairs.amax(1, keepdim=True)) & (pairs > 0)).sum(1) > 1).any()  # and gts
+        if not tied:
+            return pairs.amax(1) > 0, pairs.argmax(1)
 
         x = torch.where(iou > self.iou_thres)
         if x[0].shape[0]:
@@ -970,20 +1002,16 @@ class ConfusionMatrix:
                 matches = matches[np.unique(matches[:, 0], return_index=True)[1]]
         else:
             matches = np.zeros((0, 3))
+        m0, m1 = torch.as_tensor(matches[:, :2].astype(int), device=iou.device).T
+        gt_matched, gt_det = torch.zeros(m, dtype=torch.bool, device=iou.device), torch.zeros_like(pairs[:, 0]).long()
+        gt_matched[m0], gt_det[m0] = True, m1
+        return gt_matched, gt_det
 
-        n = matches.shape[0] > 0
-        m0, m1, _ = matches.transpose().astype(int)
-        for i, gc in enumerate(gt_classes):
-            j = m0 == i
-            if n and sum(j) == 1:
-                self.matrix[detection_classes[m1[j]], gc] += 1  # correct
-            else:
-                self.matrix[self.nc, gc] += 1  # true background
-
-        if n:
-            for i, dc in enumerate(detection_classes):
-                if not any(m1 == i):
-                    self.matrix[dc, self.nc] += 1  # predicted background
+    def update_matrix(self, pred, true):
+        """Adds one count at every (pred, true) class pair with a single bincount on the device of the inputs."""
+        size = self.matrix.shape[1]
+        counts = torch.bincount(pred * size + true, minlength=self.matrix.size)
+        self.matrix += counts.view(self.matrix.shape).cpu().numpy()
 
     def matrix(self):
         """Returns the confusion matrix."""
@@ -1111,36 +1139,49 @@ def compute_ap(recall, precision):
     Compute the average precision (AP) given the recall and precision curves.
 
     Args:
-        recall (list): The recall curve.
-        precision (list): The precision curve.
+        recall (np.ndarray): The recall curve, shape (n,) or (n, k) for k curves, e.g. one per IoU threshold.
+        precision (np.ndarray): The precision curve, same shape as recall.
 
     Returns:
-        (float): Average precision.
+        (float | np.ndarray): Average precision, shape (k,) for 2D inputs.
         (np.ndarray): Precision envelope curve.
         (np.ndarray): Modified recall curve with sentinel values added at the beginning and end.
     """
 
     # Append sentinel values to beginning and end
-    mrec = np.concatenate(([0.0], recall, [1.0]))
-    mpre = np.concatenate(([1.0], precision, [0.0]))
+    pad = [(1, 1)] + [(0, 0)] * (np.ndim(recall) - 1)
+    mrec = np.pad(np.asarray(recall, dtype=float), pad, constant_values=(0.0, 1.0))
+    mpre = np.pad(np.asarray(precision, dtype=float), pad, constant_values=(1.0, 0.0))
 
     # Compute the precision envelope
-    mpre = np.flip(np.maximum.accumulate(np.flip(mpre)))
+    mpre = np.flip(np.maximum.accumulate(np.flip(mpre, 0), 0), 0)
 
     # Integrate area under curve
     method = "interp"  # methods: 'continuous', 'interp'
     if method == "interp":
         x = np.linspace(0, 1, 101)  # 101-point interp (COCO)
-        ap = np.trapz(np.interp(x, mrec, mpre), x)  # integrate
+        if mrec.ndim == 1:
+            ap = np.trapz(np.interp(x, mrec, mpre), x)  # integrate
+        else:
+            ap = np.trapz(np.stack([np.interp(x, r, p) for r, p in zip(mrec.T, mpre.T)]), x)  # integrate
     else:  # 'continuous'
-        i = np.where(mrec[1:] != mrec[:-1])[0]  # points where x-axis (recall) changes
-        ap = np.sum((mrec[i + 1] - mrec[i]) * mpre[i + 1])  # area under curve
+        ap = np.sum((mrec[1:] - mrec[:-1]) * mpre[1:], 0)  # area under curve, zero where recall does not change
 
     return ap, mpre, mrec
 
 
 def ap_per_class(
-    tp, conf, pred_cls, target_cls, plot=False, on_plot=None, save_dir=Path(), names=(), eps=1e-16, prefix=""
+    tp,
+    conf,
+    pred_cls,
+    target_cls,
+    plot=False,
+    on_plot=None,
+    save_dir=Path(),
+    names=(),
+    eps=1e-16,
+    prefix="",
+    npred=None,
 ):
     """
     Computes the average precision per class for object detection evaluation.
@@ -1156,6 +1197,8 @@ def ap_per_class(
         names (tuple, optional): Tuple of class names to plot PR curves. Defaults to an empty tuple.
         eps (float, optional): A small value to avoid division by zero. Defaults to 1e-16.
         prefix (str, optional): A prefix string for saving the plot files. Defaults to an empty string.
+        npred (np.ndarray, optional): Number of predictions each row stands for, with tp holding the number of true
+            positives among them, e.g. the compressed rows of StatsAccumulator. Defaults to one prediction per row.
 
     Returns:
         (tuple): A tuple of six arrays and one array of unique classes, where:
@@ -1173,43 +1216,51 @@ def ap_per_class(
             prec_values: Precision values at mAP@0.5 for each class. Shape: (nc, 1000).
     """
 
-    # Sort by objectness
+    # Sort by objectness, then group by class keeping the objectness order (radix sort for int16 classes)
     i = np.argsort(-conf)
-    tp, conf, pred_cls = tp[i], conf[i], pred_cls[i]
+    c = pred_cls[i]
+    i = i[np.argsort(c.astype(np.int16) if len(c) and 0 <= c.min() and c.max() < 2**15 else c, kind="stable")]
+    conf, pred_cls = conf[i], pred_cls[i]
+    npred = np.ones(len(conf)) if npred is None else npred[i]
 
     # Find unique classes
     unique_classes, nt = np.unique(target_cls, return_counts=True)
     nc = unique_classes.shape[0]  # number of classes, number of detections
 
+    # Accumulate TPs and predictions over all classes once, per class cumulative sums are differences of these
+    tpc_all = np.zeros((tp.shape[1], len(i) + 1), dtype=tp.dtype)  # (niou, n + 1), contiguous along predictions
+    np.take(tp.T, i, axis=1, out=tpc_all[:, 1:])
+    tpc_all = tpc_all.cumsum(1).T
+    npc_all = np.pad(npred, (1, 0)).cumsum()
+    start, end = np.searchsorted(pred_cls, unique_classes, "left"), np.searchsorted(pred_cls, unique_classes, "right")
+
     # Create Precision-Recall curve and compute AP for each class
     x, prec_values = np.linspace(0, 1, 1000), []
 
     # Average precision, precision and recall curves
     ap, p_curve, r_curve = np.zeros((nc, tp.shape[1])), np.zeros((nc, 1000)), np.zeros((nc, 1000))
-    for ci, c in enumerate(unique_classes):
-        i = pred_cls == c
+    for ci, (s, e) in enumerate(zip(start, end)):
         n_l = nt[ci]  # number of labels
-        n_p = i.sum()  # number of predictions
+        n_p = e - s  # number of predictions
         if n_p == 0 or n_l == 0:
             continue
 
         # Accumulate FPs and TPs
-        fpc = (1 - tp[i]).cumsum(0)
-        tpc = tp[i].cumsum(0)
+        tpc = tpc_all[s + 1 : e + 1] - tpc_all[s]
+        fpc = (npc_all[s + 1 : e + 1] - npc_all[s])[:, None] - tpc
 
         # Recall
         recall = tpc / (n_l + eps)  # recall curve
-        r_curve[ci] = np.interp(-x, -conf[i], recall[:, 0], left=0)  # negative x, xp because xp decreases
+        r_curve[ci] = np.interp(-x, -conf[s:e], recall[:, 0], left=0)  # negative x, xp because xp decreases
 
         # Precision
         precision = tpc / (tpc + fpc)  # precision curve
-        p_curve[ci] = np.interp(-x, -conf[i], precision[:, 0], left=1)  # p at pr_score
+        p_curve[ci] = np.interp(-x, -conf[s:e], precision[:, 0], left=1)  # p at pr_score
 
-        # AP from recall-precision curve
-        for j in range(tp.shape[1]):
-            ap[ci, j], mpre, mrec = compute_ap(recall[:, j], precision[:, j])
-            if plot and j == 0:
-                prec_values.append(np.interp(x, mrec, mpre))  # precision at mAP@0.5
+        # AP from recall-precision curve, all IoU thresholds at once
+        ap[ci], mpre, mrec = compute_ap(recall, precision)
+        if plot:
+            prec_values.append(np.interp(x, mrec[:, 0], mpre[:, 0]))  # precision at mAP@0.5
 
     prec_values = np.array(prec_values)  # (nc, 1000)
 
@@ -1230,6 +1281,135 @@ def ap_per_class(
     return tp, fp, p, r, f1, ap, unique_classes.astype(int), p_curve, r_curve, f1_curve, x, prec_values
 
 
+class StatsAccumulator:
+    """
+    Streaming accumulator of validation statistics with bounded memory, mergeable across workers.
+
+    Instead of keeping the statistics of every prediction until the end of validation, predictions are counted per
+    class in equal-width confidence bins, together with their true positives per IoU threshold and their summed
+    confidence. stats() returns one row per non-empty (class, bin) with the mean confidence of the bin, which
+    ap_per_class() consumes through its npred argument. Predictions within a bin are treated as tied, so precision and
+    recall are sampled at bin edges. The top prediction of every class is kept exactly, as the AP interpolation at
+    recall 0 depends on it. With the default 1000 bins, mAP50, mAP50-95, P and R are within about 1e-3 of the exact
+    values. Memory is nc * bins * (niou + 2) counters per true positive key plus a flush buffer of buffer_size
+    predictions.
+
+    Attributes:
+        nc (int): Number of classes.
+        niou (int): Number of IoU thresholds.
+        bins (int): Number of confidence bins.
+        tp (dict): True positive counts (nc, bins, niou) for every true positive key, i.e. 'tp' and 'tp_m' or 'tp_p'.
+        n (np.ndarray): Prediction counts (nc, bins).
+        conf (np.ndarray): Summed prediction confidences (nc, bins).
+        nt (np.ndarray): Target counts (nc,).
+        top_conf (np.ndarray): Confidence of the top prediction of every class (nc,), -1 if none.
+        top_tp (dict): True positives (nc, niou) of the top prediction of every class for every true positive key.
+
+    Methods:
+        update(conf, pred_cls, target_cls, **tp): Adds the statistics of one image.
+        merge(other): Adds the counts of another accumulator, e.g. of a parallel worker.
+        stats(): Returns the compressed statistics for the metrics process() methods.
+    """
+
+    def __init__(self, nc, niou=10, keys=("tp",), bins=1000, buffer_size=1 << 16):
+        """Initializes empty counters for nc classes, niou IoU thresholds and the given true positive keys."""
+        self.nc, self.niou, self.bins, self.buffer_size = nc, niou, bins, buffer_size
+        self.tp = {k: np.zeros((nc, bins, niou), dtype=np.int64) for k in keys}
+        self.n = np.zeros((nc, bins), dtype=np.int64)
+        self.conf = np.zeros((nc, bins), dtype=np.float64)
+        self.nt = np.zeros(nc, dtype=np.int64)
+        self.top_conf = np.full(nc, -1.0)
+        self.top_tp = {k: np.zeros((nc, niou), dtype=bool) for k in keys}
+        self.buffer, self.buffered = [], 0
+
+    def keys(self):
+        """Returns the statistics keys, like the per-image statistics lists of the validators."""
+        return [*self.tp, "conf", "pred_cls", "target_cls"]
+
+    def __len__(self):
+        """Returns the number of statistics keys."""
+        return len(self.keys())
+
+    def update(self, conf, pred_cls, target_cls, **tp):
+        """
+        Adds the statistics of one image.
+
+        Args:
+            conf (torch.Tensor): Confidences of the predictions (N,).
+            pred_cls (torch.Tensor): Classes of the predictions (N,).
+            target_cls (torch.Tensor): Classes of the targets (M,).
+            **tp (torch.Tensor): Boolean true positives of the predictions (N, niou) for every key.
+        """
+        self.buffer.append(dict(conf=conf, pred_cls=pred_cls, target_cls=target_cls, **tp))
+        self.buffered += len(conf)
+        if self.buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Adds the buffered statistics to the counters, concatenated to count them with a few bincounts."""
+        if not self.buffer:
+            return
+        x = {k: torch.cat([b[k] for b in self.buffer], 0).cpu().numpy() for k in self.buffer[0]}
+        self.buffer, self.buffered = [], 0
+        self.nt += np.bincount(x["target_cls"].astype(int), minlength=self.nc)[: self.nc]
+        if not len(x["conf"]):
+            return
+        size = self.nc * self.bins
+        b = np.clip((x["conf"] * self.bins).astype(int), 0, self.bins - 1)
+        i = x["pred_cls"].astype(int) * self.bins + b  # flat (class, bin) index
+        self.n += np.bincount(i, minlength=size).reshape(self.nc, self.bins)
+        self.conf += np.bincount(i, weights=x["conf"], minlength=size).reshape(self.nc, self.bins)
+        j = i[:, None] * self.niou + np.arange(self.niou)  # flat (class, bin, iou) index
+        for k in self.tp:
+            self.tp[k] += np.bincount(j[x[k]], minlength=size * self.niou).reshape(self.nc, self.bins, self.niou)
+
+        # Top prediction per class
+        order = np.lexsort((x["conf"], x["pred_cls"]))
+        c = x["pred_cls"][order].astype(int)
+        last = order[np.r_[c[1:] != c[:-1], True]]  # highest confidence of every class
+        self.update_top(x["pred_cls"][last].astype(int), x["conf"][last], {k: x[k][last] for k in self.tp})
+
+    def update_top(self, c, conf, tp):
+        """Replaces the top predictions of classes c where conf is higher."""
+        higher = conf > self.top_conf[c]
+        c = c[higher]
+        self.top_conf[c] = conf[higher]
+        for k in self.tp:
+            self.top_tp[k][c] = tp[k][higher]
+
+    def merge(self, other):
+        """Adds the counts of another accumulator with the same classes, bins and keys, returns self."""
+        self.flush()
+        other.flush()
+        for k in self.tp:
+            self.tp[k] += other.tp[k]
+        self.n += other.n
+        self.conf += other.conf
+        self.nt += other.nt
+        self.update_top(np.arange(self.nc), other.top_conf, other.top_tp)
+        return self
+
+    def stats(self):
+        """Returns the compressed statistics, one row per non-empty (class, bin), with npred predictions per row."""
+        self.flush()
+        n, conf, tp = self.n.copy(), self.conf.copy(), {k: v.copy() for k, v in self.tp.items()}
+        ct = np.nonzero(self.top_conf >= 0)[0]  # classes with predictions, their top one is a separate row
+        bt = np.clip((self.top_conf[ct] * self.bins).astype(int), 0, self.bins - 1)
+        n[ct, bt] -= 1
+        conf[ct, bt] -= self.top_conf[ct]
+        for k in tp:
+            tp[k][ct, bt] -= self.top_tp[k][ct]
+        c, b = np.nonzero(n)
+        stats = {k: np.concatenate([v[c, b], self.top_tp[k][ct]]) for k, v in tp.items()}
+        stats.update(
+            conf=np.concatenate([conf[c, b] / n[c, b], self.top_conf[ct]]),
+            pred_cls=np.concatenate([c, ct]).astype(np.float32),
+            target_cls=np.repeat(np.arange(self.nc), self.nt).astype(np.float32),
+            npred=np.concatenate([n[c, b], np.ones(len(ct), dtype=np.int64)]),
+        )
+        return stats
+
+
 class Metric(SimpleClass):
     """
     Class for computing evaluation metrics for YOLOv8 model.
@@ -1444,7 +1624,7 @@ class DetMetrics(SimpleClass):
         self.speed = {"preprocess": 0.0, "inference": 0.0, "loss": 0.0, "postprocess": 0.0}
         self.task = "detect"
 
-    def process(self, tp, conf, pred_cls, target_cls):
+    def process(self, tp, conf, pred_cls, target_cls, npred=None):
         """Process predicted results for object detection and update metrics."""
         results = ap_per_class(
             tp,
@@ -1455,6 +1635,7 @@ class DetMetrics(SimpleClass):
             save_dir=self.save_dir,
             names=self.names,
             on_plot=self.on_plot,
+            npred=npred,
         )[2:]
         self.box.nc = len(self.names)
         self.box.update(results)
@@ -1543,7 +1724,7 @@ class SegmentMetrics(SimpleClass):
         self.speed = {"preprocess": 0.0, "inference": 0.0, "loss": 0.0, "postprocess": 0.0}
         self.task = "segment"
 
-    def process(self, tp, tp_m, conf, pred_cls, target_cls):
+    def process(self, tp, tp_m, conf, pred_cls, target_cls, npred=None):
         """
         Processes the detection and segmentation metrics over the given set of predictions.
 
@@ -1553,6 +1734,7 @@ class SegmentMetrics(SimpleClass):
             conf (list): List of confidence scores.
             pred_cls (list): List of predicted classes.
             target_cls (list): List of target classes.
+            npred (list, optional): Number of predictions per row for compressed statistics.
         """
 
         results_mask = ap_per_class(
@@ -1565,6 +1747,7 @@ class SegmentMetrics(SimpleClass):
             save_dir=self.save_dir,
             names=self.names,
             prefix="Mask",
+            npred=npred,
         )[2:]
         self.seg.nc = len(self.names)
         self.seg.update(results_mask)
@@ -1578,6 +1761,7 @@ class SegmentMetrics(SimpleClass):
             save_dir=self.save_dir,
             names=self.names,
             prefix="Box",
+            npred=npred,
         )[2:]
         self.box.nc = len(self.names)
         self.box.update(results_box)
@@ -1685,7 +1869,7 @@ class PoseMetrics(SegmentMetrics):
         self.speed = {"preprocess": 0.0, "inference": 0.0, "loss": 0.0, "postprocess": 0.0}
         self.task = "pose"
 
-    def process(self, tp, tp_p, conf, pred_cls, target_cls):
+    def process(self, tp, tp_p, conf, pred_cls, target_cls, npred=None):
         """
         Processes the detection and pose metrics over the given set of predictions.
 
@@ -1695,6 +1879,7 @@ class PoseMetrics(SegmentMetrics):
             conf (list): List of confidence scores.
             pred_cls (list): List of predicted classes.
             target_cls (list): List of target classes.
+            npred (list, optional): Number of predictions per row for compressed statistics.
         """
 
         results_pose = ap_per_class(
@@ -1707,6 +1892,7 @@ class PoseMetrics(SegmentMetrics):
             save_dir=self.save_dir,
             names=self.names,
             prefix="Pose",
+            npred=npred,
         )[2:]
         self.pose.nc = len(self.names)
         self.pose.update(results_pose)
@@ -1720,6 +1906,7 @@ class PoseMetrics(SegmentMetrics):
             save_dir=self.save_dir,
             names=self.names,
             prefix="Box",
+            npred=npred,
         )[2:]
         self.box.nc = len(self.names)
         self.box.update(results_box)
@@ -1843,7 +2030,7 @@ class OBBMetrics(SimpleClass):
         self.box = Metric()
         self.speed = {"preprocess": 0.0, "inference": 0.0, "loss": 0.0, "postprocess": 0.0}
 
-    def process(self, tp, conf, pred_cls, target_cls):
+    def process(self, tp, conf, pred_cls, target_cls, npred=None):
         """Process predicted results for object detection and update metrics."""
         results = ap_per_class(
             tp,
@@ -1854,6 +2041,7 @@ class OBBMetrics(SimpleClass):
             save_dir=self.save_dir,
             names=self.names,
             on_plot=self.on_plot,
+            npred=npred,
         )[2:]
         self.box.nc = len(self.names)
         self.box.update(results)
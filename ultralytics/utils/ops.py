@@ -257,37 +257,79 @@ def bbox_iou_for_nms(box1, box2, xywh=False, GIoU=False, DIoU=False, CIoU=False,
         return iou - (c_area - union) / c_area  # GIoU https://arxiv.org/pdf/1902.09630.pdf
     return iou  # IoU
 
-def soft_nms(bboxes, scores, iou_thresh=0.5, sigma=0.5,score_threshold=0.25):
-    
-    order = torch.arange(0, scores.size(0)).to(bboxes.device)
-    keep = []
-    
-    while order.numel() > 1:
-        if order.numel() == 1:
-            keep.append(order[0])
-            break
-        else:
-            i = order[0]
-            keep.append(i)
-        
-        iou = bbox_iou_for_nms(bboxes[i:i+1], bboxes[order[1:]], GIoU=False, DIoU=False, CIoU=False, EIoU=False, SIoU=False, ShapeIoU=False, scale=0.0).squeeze()
-        
-        idx = (iou > iou_thresh).nonzero().squeeze()
-        if idx.numel() > 0: 
-            iou = iou[idx] 
-            newScores = torch.exp(-torch.pow(iou,2)/sigma)
-            scores[order[idx+1]] *= newScores
-        
-        newOrder = (scores[order[1:]] > score_threshold).nonzero().squeeze() 
-        if newOrder.numel() == 0: 
-            break
-        else:
-            maxScoreIndex = torch.argmax(scores[order[newOrder+1]]) 
-            if maxScoreIndex != 0: 
-                newOrder[[0,maxScoreIndex],] = newOrder[[maxScoreIndex,0],]
-            order = order[newOrder+1]
-    
-    return torch.LongTensor(keep)
+def soft_nms(boxes, scores, iou_thres=0.5, score_thres=0.25, sigma=0.5, method="gaussian", iou_type="iou", idxs=None):
+    """
+    Matrix Soft-NMS, decays the scores of overlapping boxes in parallel instead of one kept box at a time.
+
+    Boxes are sorted by score and the upper-triangular IoU matrix between higher and lower scored boxes is built once,
+    per class and in column blocks to bound memory. Following Matrix NMS (https://arxiv.org/abs/2003.10152), the decay
+    of box j is the minimum over all higher scored boxes i of f(iou_ij) / f(iou_i), where iou_i is the largest IoU of
+    box i with any box scored above it, which approximates the sequential Soft-NMS decay without a Python loop over kept
+    boxes.
+
+    Args:
+        boxes (torch.Tensor): (N, 4), xyxy.
+        scores (torch.Tensor): (N, ).
+        iou_thres (float): Only overlaps above this IoU decay scores.
+        score_thres (float): Boxes with a decayed score below this threshold are removed.
+        sigma (float): Gaussian decay parameter.
+        method (str): Decay function, 'gaussian' or 'linear'.
+        iou_type (str): Overlap measure, one of 'iou', 'diou', 'ciou' or 'shapeiou', see bbox_iou_for_nms().
+        idxs (torch.Tensor, optional): (N, ) class indices, boxes of different classes never decay each other.
+
+    Returns:
+        (Tuple[torch.Tensor, torch.Tensor]): Indices of the kept boxes sorted by decayed score, and the decayed scores.
+    """
+    assert method in {"gaussian", "linear"}, f"Invalid Soft-NMS method '{method}', valid methods are gaussian, linear"
+    assert iou_type in {"iou", "diou", "ciou", "shapeiou"}, f"Invalid Soft-NMS IoU type '{iou_type}'"
+    kw = dict(DIoU=iou_type == "diou", CIoU=iou_type == "ciou", ShapeIoU=iou_type == "shapeiou")
+    n = boxes.shape[0]
+    order = scores.argsort(descending=True)
+    if not n:
+        return order, scores
+    if idxs is not None:  # group by class, keeping the score order within each class
+        g = idxs.unique(return_inverse=True)[1][order]
+        order = order[(g * n + torch.arange(n, device=g.device)).argsort()]
+        counts = torch.bincount(g).tolist()
+    else:
+        counts = [n]
+    boxes, scores = boxes[order], scores[order]
+    block = 2 ** 22  # IoUs per block, bounds the memory of the IoU matrix and its temporaries
+    g, m = len(counts), max(counts)
+    if g * m * m <= block:  # all classes at once, as a zero-padded (classes, m, m) IoU matrix
+        counts = torch.tensor(counts, device=boxes.device)
+        gi = torch.repeat_interleave(torch.arange(g, device=boxes.device), counts)  # class group of every box
+        pos = torch.arange(n, device=boxes.device) - (counts.cumsum(0) - counts)[gi]  # position within its group
+        b = boxes.new_zeros(g, m, 4)  # zero-size padding boxes have no overlap
+        b[gi, pos] = boxes
+        iou = bbox_iou_for_nms(b[:, :, None], b[:, None], **kw).squeeze(-1).clamp_(0)
+        iou = iou.triu_(diagonal=1)  # only pairs where the row box is scored above the column box
+        iou *= iou > iou_thres
+        decay = _soft_nms_decay(iou, iou.amax(1)[..., None], method, sigma).amin(1)[gi, pos]
+    else:  # class by class, in column blocks
+        decay = torch.ones(n, device=boxes.device)
+        for b, d in zip(boxes.split(counts, 0), decay.split(counts, 0)):
+            comp = torch.zeros(len(b), device=b.device)  # max IoU of every box with any higher scored box of its class
+            step = max(block // len(b), 1)
+            for j in range(0, len(b), step):
+                e = min(j + step, len(b))
+                iou = bbox_iou_for_nms(b[:e, None], b[None, j:e], **kw).squeeze(-1).clamp_(0)  # (e, e - j)
+                iou = iou.triu_(diagonal=1 - j)
+                iou *= iou > iou_thres
+                comp[j:e] = iou.amax(0)
+                d[j:e] = _soft_nms_decay(iou, comp[:e, None], method, sigma).amin(0)
+    scores = scores * decay
+    i = scores.argsort(descending=True)
+    i = i[scores[i] > score_thres]
+    return order[i], scores[i]
+
+
+def _soft_nms_decay(iou, comp, method, sigma):
+    """Matrix Soft-NMS decay factors f(iou) / f(comp) for IoUs 'iou' and row compensation IoUs 'comp'."""
+    if method == "gaussian":
+        return torch.exp(-(iou ** 2 - comp ** 2) / sigma)
+    return (1 - iou) / (1 - comp).clamp_(1e-7)
+
 
 def non_max_suppression(
     prediction,
@@ -303,6 +345,9 @@ def non_max_suppression(
     max_nms=30000,
     max_wh=7680,
     rotated=False,
+    batched=False,
+    nms_mode="hard",
+    nms_iou="iou",
 ):
     """
     Perform non-maximum suppression (NMS) on a set of boxes, with support for masks and multiple labels per box.
@@ -327,6 +372,11 @@ def non_max_suppression(
         max_time_img (float): The maximum time (seconds) for processing one image.
         max_nms (int): The maximum number of boxes into torchvision.ops.nms().
         max_wh (int): The maximum box width and height in pixels
+        batched (bool): If True, filter and suppress boxes for the whole batch at once instead of looping over images.
+            Produces the same detections as the per-image loop. Not supported for rotated boxes.
+        nms_mode (str): 'hard' for standard NMS, 'soft' or 'soft-linear' for Gaussian or linear Matrix Soft-NMS,
+            where the kept boxes carry their decayed confidences. Soft modes are not supported for rotated boxes.
+        nms_iou (str): Overlap measure used by the Soft-NMS modes, one of 'iou', 'diou', 'ciou' or 'shapeiou'.
 
     Returns:
         (List[torch.Tensor]): A list of length batch_size, where each element is a tensor of
@@ -337,6 +387,7 @@ def non_max_suppression(
     # Checks
     assert 0 <= conf_thres <= 1, f"Invalid Confidence threshold {conf_thres}, valid values are between 0.0 and 1.0"
     assert 0 <= iou_thres <= 1, f"Invalid IoU {iou_thres}, valid values are between 0.0 and 1.0"
+    assert nms_mode in {"hard", "soft", "soft-linear"}, f"Invalid NMS mode '{nms_mode}', use hard, soft or soft-linear"
     if isinstance(prediction, (list, tuple)):  # YOLOv8 model in validation model, output = (inference_out, loss_out)
         prediction = prediction[0]  # select only inference output
 
@@ -355,6 +406,24 @@ def non_max_suppression(
     if not rotated:
         prediction[..., :4] = xywh2xyxy(prediction[..., :4])  # xywh to xyxy
 
+    if batched and not rotated and prediction.device.type != "mps":  # MPS has no float64 for the batch offsets
+        return _batched_non_max_suppression(
+            prediction,
+            xc,
+            conf_thres,
+            iou_thres,
+            classes,
+            agnostic,
+            multi_label,
+            labels,
+            max_det,
+            nc,
+            max_nms,
+            max_wh,
+            nms_mode,
+            nms_iou,
+        )
+
     t = time.time()
     output = [torch.zeros((0, 6 + nm), device=prediction.device)] * bs
     for xi, x in enumerate(prediction):  # image index, image inference
@@ -403,8 +472,7 @@ def non_max_suppression(
             i = nms_rotated(boxes, scores, iou_thres)
         else:
             boxes = x[:, :4] + c  # boxes (offset by class)
-            i = torchvision.ops.nms(boxes, scores, iou_thres)  # NMS
-            # i = soft_nms(boxes, scores, iou_thres)
+            i = _nms(x, boxes, scores, conf_thres, iou_thres, nms_mode, nms_iou, agnostic)  # NMS
         i = i[:max_det]  # limit detections
 
         # # Experimental
@@ -427,6 +495,170 @@ def non_max_suppression(
     return output
 
 
+def _batched_non_max_suppression(
+    prediction,
+    xc,
+    conf_thres,
+    iou_thres,
+    classes,
+    agnostic,
+    multi_label,
+    labels,
+    max_det,
+    nc,
+    max_nms,
+    max_wh,
+    nms_mode,
+    nms_iou,
+):
+    """
+    Vectorized body of non_max_suppression() that filters the candidates of all images of a batch at once.
+
+    Candidates of every image are flattened into one tensor together with their image index. On accelerators boxes are
+    offset by class (as in the per-image loop) and additionally by image, so that a single torchvision.ops.nms() call
+    never suppresses boxes across images. On CPU, where NMS cost grows quadratically with the number of boxes, and for
+    Soft-NMS, NMS is run per image on the pre-filtered candidates instead. The per-image max_nms and max_det limits are
+    applied with a rank-within-image computed from a grouped sort, which keeps the score ordering of the per-image loop.
+
+    Args:
+        prediction (torch.Tensor): Predictions of shape (batch_size, num_boxes, 4 + nc + nm) with xyxy boxes.
+        xc (torch.Tensor): Boolean candidate mask of shape (batch_size, num_boxes).
+        conf_thres, iou_thres, classes, agnostic, multi_label, labels, max_det, nc, max_nms, max_wh, nms_mode,
+            nms_iou: See non_max_suppression().
+
+    Returns:
+        (List[torch.Tensor]): A list of length batch_size with tensors of shape (num_boxes, 6 + num_masks).
+    """
+    bs, device = prediction.shape[0], prediction.device
+    nm = prediction.shape[2] - nc - 4
+    x = prediction[xc]  # candidates of all images, (n, 4 + nc + nm)
+    bi = xc.nonzero(as_tuple=True)[0]  # image index of each candidate
+
+    # Cat apriori labels if autolabelling
+    if labels and any(len(lb) for lb in labels):
+        v, vi = [x], [bi]
+        for xi, lb in enumerate(labels):
+            if len(lb):
+                t = torch.zeros((len(lb), nc + nm + 4), device=device)
+                t[:, :4] = xywh2xyxy(lb[:, 1:5])  # box
+                t[range(len(lb)), lb[:, 0].long() + 4] = 1.0  # cls
+                v.append(t)
+                vi.append(torch.full((len(lb),), xi, dtype=bi.dtype, device=device))
+        x, bi = torch.cat(v, 0), torch.cat(vi, 0)
+
+    # Detections matrix nx6 (xyxy, conf, cls)
+    box, cls, mask = x.split((4, nc, nm), 1)
+    if multi_label:
+        i, j = torch.where(cls > conf_thres)
+        x = torch.cat((box[i], x[i, 4 + j, None], j[:, None].float(), mask[i]), 1)
+        bi = bi[i]
+    else:  # best class only
+        conf, j = cls.max(1, keepdim=True)
+        keep = conf.view(-1) > conf_thres
+        x, bi = torch.cat((box, conf, j.float(), mask), 1)[keep], bi[keep]
+
+    # Filter by class
+    if classes is not None:
+        keep = (x[:, 5:6] == torch.tensor(classes, device=device)).any(1)
+        x, bi = x[keep], bi[keep]
+
+    if not x.shape[0]:  # no boxes
+        return [torch.zeros((0, 6 + nm), device=device)] * bs
+
+    # Limit boxes per image
+    if torch.bincount(bi, minlength=bs).max() > max_nms:  # excess boxes
+        k = _rank_within_image(bi, x[:, 4].argsort(descending=True))
+        x, bi = x[k[0]][k[1] < max_nms], bi[k[0]][k[1] < max_nms]
+
+    # Batched NMS
+    c = x[:, 5:6] * (0 if agnostic else max_wh)  # classes
+    boxes, scores = x[:, :4] + c, x[:, 4]  # boxes (offset by class), scores
+    if device.type == "cpu" or nms_mode != "hard":  # CPU NMS cost grows quadratically with boxes, go image by image
+        order = _rank_within_image(bi, torch.arange(len(bi), device=device))[0]  # group candidates by image
+        x, bi, boxes, scores = x[order], bi[order], boxes[order], scores[order]
+        n = torch.bincount(bi, minlength=bs).tolist()
+        output = []
+        for xi, bxi, si in zip(x.split(n, 0), boxes.split(n, 0), scores.split(n, 0)):
+            i = _nms(xi, bxi, si, conf_thres, iou_thres, nms_mode, nms_iou, agnostic)[:max_det]  # NMS, limit detections
+            output.append(xi[i])
+        return output
+
+    # Boxes offset by image as well, float64 keeps the offset boxes exact for large batches
+    offset = max_wh * (1 if agnostic else nc + 1)  # per-image offset, larger than any class offset
+    i = torchvision.ops.nms(boxes.double() + (bi[:, None] * offset).double(), scores.double(), iou_thres)
+
+    # Limit detections per image and split into a list
+    order, rank = _rank_within_image(bi, i)
+    order = order[rank < max_det]
+    n = torch.bincount(bi[order], minlength=bs).tolist()
+    return list(x[order].split(n, 0))
+
+
+def _nms(x, boxes, scores, conf_thres, iou_thres, nms_mode="hard", nms_iou="iou", agnostic=False):
+    """
+    Run hard or Soft-NMS on class-offset boxes, writing Soft-NMS decayed confidences into column 4 of x in place.
+
+    Returns:
+        (torch.Tensor): Indices of the kept boxes sorted by decreasing confidence.
+    """
+    if nms_mode == "hard":
+        return torchvision.ops.nms(boxes, scores, iou_thres)
+    method = "linear" if nms_mode == "soft-linear" else "gaussian"
+    idxs = None if agnostic else x[:, 5]  # class-aware decay
+    i, s = soft_nms(boxes, scores, iou_thres, conf_thres, method=method, iou_type=nms_iou, idxs=idxs)
+    x[i, 4] = s.to(x.dtype)
+    return i
+
+
+def _rank_within_image(bi, order):
+    """
+    Group indices by image while preserving their relative order.
+
+    Args:
+        bi (torch.Tensor): Image index of every box, shape (n,).
+        order (torch.Tensor): Box indices in the desired within-image order (i.e. by decreasing score), shape (m,).
+
+    Returns:
+        (Tuple[torch.Tensor, torch.Tensor]): Box indices sorted by image then by 'order', and the rank of every index
+            within its image.
+    """
+    m = order.shape[0]
+    pos = torch.arange(m, device=order.device)
+    order = order[(bi[order] * m + pos).argsort()]  # unique keys, so any sort is stable
+    b = bi[order]
+    first = torch.zeros_like(pos)
+    first[1:] = (b[1:] != b[:-1]).long()
+    start = (pos * first).cummax(0)[0]  # position of the first index of each image group
+    return order, pos - start
+
+
+def filter_end2end(prediction, conf_thres=0.25, classes=None, max_det=300):
+    """
+    Filter the output of a model exported with end2end=True, which already contains NMS, into per-image detections.
+
+    Args:
+        prediction (torch.Tensor): Detections of shape (batch_size, max_det, 6) as (x1, y1, x2, y2, conf, cls), with
+            all-zero padding rows.
+        conf_thres (float): The confidence threshold below which detections are filtered out. Values below the
+            export-time threshold have no effect.
+        classes (List[int]): A list of class indices to keep. If None, all classes are kept.
+        max_det (int): The maximum number of detections to keep per image.
+
+    Returns:
+        (List[torch.Tensor]): A list of length batch_size with (num_boxes, 6) tensors as returned by
+            non_max_suppression().
+    """
+    if isinstance(prediction, (list, tuple)):
+        prediction = prediction[0]
+    output = []
+    for x in prediction:
+        x = x[x[:, 4] > conf_thres]
+        if classes is not None:
+            x = x[(x[:, 5:6] == torch.tensor(classes, device=x.device)).any(1)]
+        output.append(x[:max_det])  # rows are sorted by decreasing confidence
+    return output
+
+
 def clip_boxes(boxes, shape):
     """
     Takes a list of bounding boxes and a shape (height, width) and clips the bounding boxes to the shape.
@@ -0,0 +1,407 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""
+Structured channel pruning for YOLOv8 detection models.
+
+Output channels of Conv blocks are removed physically, i.e. the convolution, its BatchNorm and every convolution that
+reads the channels are sliced, so the pruned model is a smaller dense model that runs and exports like any other. The
+channel dependencies are derived from the layers built by `parse_model`: `Concat` and `nn.Upsample` pass channels on
+to their consumers at an offset, C2f and SPPF read them through `cv1` and Detect through the first Conv of each branch.
+Inside C2f the hidden channels of each Bottleneck are pruned, inside SPPF the `cv1` channels that `cv2` reads four
+times, and inside Detect the channels between the three layers of each branch. The `cv1` split of C2f and channels
+read by modules of unknown structure are kept.
+
+Usage:
+    from ultralytics import YOLO
+    from ultralytics.utils.prune import prune
+
+    model = YOLO('yolov8n.pt')
+    prune(model.model, flops=0.5, method='taylor', data='coco128.yaml')  # halve FLOPs
+    model.train(data='coco128.yaml', epochs=30)  # fine-tune to recover accuracy
+
+    model = YOLO('yolov8n.pt')
+    model.prune(flops=0.5, data='coco128.yaml', epochs=30)  # same as above, best.pt loads with YOLO('best.pt')
+"""
+
+import time
+from copy import deepcopy
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from ultralytics.nn.modules import C2f, SPPF, Bottleneck, Concat, Conv, Detect
+from ultralytics.utils import DEFAULT_CFG, LOGGER, colorstr
+from ultralytics.utils.torch_utils import de_parallel
+
+PREFIX = colorstr("Prune: ")
+
+
+class Group:
+    """
+    Output channels of one Conv block together with the convolutions that read them.
+
+    Attributes:
+        name (str): Name of the producing Conv block in the model.
+        producer (Conv): Conv block whose `conv` output channels and `bn` features are pruned.
+        consumers (list): (nn.Conv2d, offset) pairs, the producer's channel `c` is input channel `offset + c`.
+    """
+
+    def __init__(self, name, producer, consumers):
+        """Initialize a group from its producing Conv block and consuming convolutions."""
+        self.name = name
+        self.producer = producer
+        self.consumers = consumers
+
+    @property
+    def channels(self):
+        """Number of output channels of the producer."""
+        return self.producer.conv.out_channels
+
+
+def _is_plain(m):
+    """Return True if `m` is an unfused, ungrouped Conv block."""
+    return type(m) is Conv and hasattr(m, "bn") and m.conv.groups == 1
+
+
+def _inputs(model):
+    """Return the absolute indices of the layers each layer of a parse_model Sequential reads from."""
+    return [[j if j >= 0 else i + j for j in ([m.f] if isinstance(m.f, int) else m.f)] for i, m in enumerate(model)]
+
+
+def _channels(model, imgsz):
+    """Return the number of output channels of each layer of a parse_model Sequential from a forward pass."""
+    ch = {}
+
+    def width(m, x, y, i):
+        if isinstance(y, torch.Tensor):
+            ch[i] = y.shape[1]
+
+    hooks = [m.register_forward_hook(lambda m, x, y, i=i: width(m, x, y, i)) for i, m in enumerate(model)]
+    try:
+        _forward(model, imgsz)
+    finally:
+        for h in hooks:
+            h.remove()
+    return [ch.get(i, 0) for i in range(len(model))]
+
+
+@torch.no_grad()
+def _forward(model, imgsz):
+    """Run a parse_model Sequential in eval mode on an empty `imgsz` image the way BaseModel._predict_once does."""
+    p = next(model.parameters())
+    x, y, training = torch.zeros(1, 3, imgsz, imgsz, device=p.device, dtype=p.dtype), [], model.training
+    model.eval()  # keep BatchNorm statistics
+    try:
+        for m in model:
+            if m.f != -1:
+                x = y[m.f] if isinstance(m.f, int) else [x if j == -1 else y[j] for j in m.f]
+            x = m(x)
+            y.append(x)
+    finally:
+        model.train(training)
+    return x
+
+
+def _entries(m, k):
+    """Return the convolutions reading input `k` of layer `m` at offset 0, or None if `m` is not understood."""
+    if _is_plain(m) and k == 0:
+        return [m.conv]
+    if type(m) in (C2f, SPPF) and k == 0 and _is_plain(m.cv1):
+        return [m.cv1.conv]
+    if type(m) is Detect and all(_is_plain(b[0]) for b in (*m.cv2, *m.cv3)):
+        return [m.cv2[k][0].conv, m.cv3[k][0].conv]
+    return None
+
+
+def _consumers(model, inputs, ch, i, offset=0):
+    """Return the (conv, offset) pairs reading the output of layer `i`, or None if any consumer is not understood."""
+    consumers = []
+    for j, m in enumerate(model):
+        for k in (k for k, x in enumerate(inputs[j]) if x == i):
+            if type(m) is Concat and m.d == 1:
+                c = _consumers(model, inputs, ch, j, offset + sum(ch[x] for x in inputs[j][:k]))
+            elif type(m) is nn.Upsample:
+                c = _consumers(model, inputs, ch, j, offset)
+            else:
+                c = _entries(m, k)
+                c = c and [(x, offset) for x in c]
+            if c is None:
+                return None
+            consumers.extend(c)
+    return consumers
+
+
+def dependency_groups(model, imgsz=64):
+    """
+    Build the prunable channel groups of a detection model.
+
+    Args:
+        model (DetectionModel): Unfused detection model built by `parse_model`.
+        imgsz (int): Size of the random input image used to read the layer widths. Defaults to 64.
+
+    Returns:
+        (List[Group]): Prunable groups, each pruned as a unit.
+    """
+    layers = de_parallel(model).model
+    inputs, ch = _inputs(layers), _channels(layers, imgsz)
+    groups = []
+    for i, m in enumerate(layers):
+        name = f"model.{i}"
+        producer = m if type(m) is Conv else m.cv2 if type(m) in (C2f, SPPF) else None
+        if producer is not None and _is_plain(producer):
+            consumers = _consumers(layers, inputs, ch, i)
+            if consumers and all(c.groups == 1 for c, _ in consumers):
+                groups.append(Group(name if producer is m else f"{name}.cv2", producer, consumers))
+        if type(m) is C2f:
+            for n, b in enumerate(m.m):
+                if type(b) is Bottleneck and _is_plain(b.cv1) and _is_plain(b.cv2):
+                    groups.append(Group(f"{name}.m.{n}.cv1", b.cv1, [(b.cv2.conv, 0)]))
+        elif type(m) is SPPF and _is_plain(m.cv1) and _is_plain(m.cv2):
+            c_ = m.cv1.conv.out_channels
+            groups.append(Group(f"{name}.cv1", m.cv1, [(m.cv2.conv, k * c_) for k in range(4)]))
+        elif type(m) is Detect:
+            for b, branch in (("cv2", m.cv2), ("cv3", m.cv3)):
+                for k, s in enumerate(branch):
+                    if _is_plain(s[0]) and _is_plain(s[1]):
+                        groups.append(Group(f"{name}.{b}.{k}.0", s[0], [(s[1].conv, 0)]))
+                        groups.append(Group(f"{name}.{b}.{k}.1", s[1], [(s[2], 0)]))
+    return groups
+
+
+def _loader(model, data, imgsz, batch):
+    """Return an un-augmented dataloader over the 'data' train images for Taylor importance."""
+    from ultralytics.cfg import get_cfg
+    from ultralytics.data import build_dataloader, build_yolo_dataset
+    from ultralytics.data.utils import check_det_dataset
+
+    data = check_det_dataset(data or DEFAULT_CFG.data or "coco128.yaml")
+    cfg = get_cfg(DEFAULT_CFG, dict(imgsz=imgsz, batch=batch))
+    stride = max(int(de_parallel(model).stride.max()), 32)
+    dataset = build_yolo_dataset(cfg, data.get("train") or data["val"], batch, data, mode="val", stride=stride)
+    return build_dataloader(dataset, batch, workers=0, shuffle=True)
+
+
+def importance(model, groups, method="bn", loader=None, batches=8):
+    """
+    Score every output channel of every group, higher is more important.
+
+    'bn' scores a channel by the magnitude of its BatchNorm scale. 'taylor' accumulates the first-order Taylor estimate
+    of the loss change when the channel is removed, |γ·∂L/∂γ + β·∂L/∂β|, over `batches` batches of `loader`.
+
+    Args:
+        model (DetectionModel): Model the groups belong to.
+        groups (List[Group]): Groups to score.
+        method (str): 'bn' or 'taylor'. Defaults to 'bn'.
+        loader (torch.utils.data.DataLoader, optional): Training batches, required for 'taylor'.
+        batches (int): Number of batches for 'taylor'. Defaults to 8.
+
+    Returns:
+        (List[torch.Tensor]): Channel scores of each group.
+    """
+    if method == "bn":
+        return [g.producer.bn.weight.detach().abs().float() for g in groups]
+    assert method == "taylor", f"Unsupported importance method '{method}', choose from 'bn' or 'taylor'."
+    assert loader is not None, "Taylor importance requires training batches, i.e. prune(..., data='coco128.yaml')."
+    from ultralytics.cfg import get_cfg
+
+    model = de_parallel(model)
+    args, criterion, training = getattr(model, "args", None), vars(model).pop("criterion", None), model.training
+    model.args = get_cfg(DEFAULT_CFG)  # loss gains as a namespace, the criterion is built from them on first use
+    params = [p for g in groups for p in (g.producer.bn.weight, g.producer.bn.bias)]
+    grads = {p: [p.requires_grad, torch.zeros_like(p)] for p in params}
+    device = next(model.parameters()).device
+    model.eval()  # BatchNorm statistics stay frozen, Detect also returns its raw feature maps for the loss
+    try:
+        for p in grads:
+            p.requires_grad_(True)
+        for i, batch in enumerate(loader):
+            if i >= batches:
+                break
+            batch = {k: v.to(device) if isinstance(v, torch.Tensor) else v for k, v in batch.items()}
+            batch["img"] = batch["img"].float() / 255
+            model.zero_grad()
+            model.loss(batch)[0].backward()
+            for p, (_, g) in grads.items():
+                if p.grad is not None:
+                    g += p.detach() * p.grad  # summed over batches, signed per channel
+    finally:
+        model.zero_grad()
+        for p, (requires_grad, _) in grads.items():
+            p.requires_grad_(requires_grad)
+        vars(model).pop("criterion", None)
+        model.args = args
+        if criterion is not None:
+            model.criterion = criterion
+        model.train(training)
+    return [(grads[g.producer.bn.weight][1] + grads[g.producer.bn.bias][1]).abs().float() for g in groups]
+
+
+def _select(groups, scores, ratio, min_channels=8, round_to=8):
+    """Return the indices of the channels to keep in each group after pruning `ratio` of all channels globally."""
+    norm = [s / (s.mean() + 1e-12) for s in scores]  # comparable across layers of different scale
+    total = sum(g.channels for g in groups)
+    ranked = torch.cat(norm).sort().values
+    threshold = ranked[min(int(ratio * total), total - 1)]
+    keep = []
+    for g, s, n in zip(groups, scores, norm):
+        c = g.channels
+        k = int((n > threshold).sum())
+        if c % round_to == 0 and k < c:
+            k = round(k / round_to) * round_to  # widths stay multiples of round_to for vectorized kernels
+        k = min(c, max(k, min(min_channels, c)))
+        keep.append(s.argsort(descending=True)[:k].sort().values)
+    return keep
+
+
+@torch.no_grad()
+def prune_groups(groups, keep):
+    """
+    Remove the output channels of each group that are not in its `keep` indices, in place.
+
+    Groups are pruned together since the groups of a Concat share their consumers at offsets into the unpruned inputs.
+
+    Args:
+        groups (List[Group]): Groups to prune, built from the current model.
+        keep (List[torch.Tensor]): Sorted indices of the output channels to keep in each group.
+    """
+    masks = {}
+    for g, k in zip(groups, keep):  # consumer input masks first, offsets refer to the unpruned widths
+        dropped = torch.ones(g.channels, dtype=torch.bool, device=k.device)
+        dropped[k] = False
+        for consumer, offset in g.consumers:
+            mask = masks.setdefault(consumer, torch.ones(consumer.in_channels, dtype=torch.bool, device=k.device))
+            mask[offset : offset + g.channels] &= ~dropped
+    for g, k in zip(groups, keep):
+        conv, bn = g.producer.conv, g.producer.bn
+        conv.weight = nn.Parameter(conv.weight[k].clone())
+        if conv.bias is not None:
+            conv.bias = nn.Parameter(conv.bias[k].clone())
+        conv.out_channels = len(k)
+        bn.weight, bn.bias = nn.Parameter(bn.weight[k].clone()), nn.Parameter(bn.bias[k].clone())
+        bn.running_mean, bn.running_var = bn.running_mean[k].clone(), bn.running_var[k].clone()
+        bn.num_features = len(k)
+    for consumer, mask in masks.items():
+        consumer.weight = nn.Parameter(consumer.weight[:, mask].clone())
+        consumer.in_channels = int(mask.sum())
+
+
+def get_gflops(model, imgsz=640):
+    """Return the convolution GFLOPs of a model for one `imgsz` image."""
+    n = []
+
+    def count(m, x, y):
+        n.append(2 * y.numel() * m.in_channels // m.groups * m.kernel_size[0] * m.kernel_size[1])
+
+    model = de_parallel(model)
+    hooks = [m.register_forward_hook(count) for m in model.modules() if isinstance(m, nn.Conv2d)]
+    try:
+        _forward(model.model, imgsz)
+    finally:
+        for h in hooks:
+            h.remove()
+    return sum(n) / 1e9
+
+
+def get_latency(model, imgsz=640, n=10):
+    """Return the median latency in ms of a fused copy of a model on one `imgsz` image."""
+    model = deepcopy(de_parallel(model)).fuse(verbose=False).eval()
+    p = next(model.parameters())
+    im = torch.zeros(1, 3, imgsz, imgsz, device=p.device, dtype=p.dtype)
+    t = []
+    with torch.no_grad():
+        for i in range(n + 2):  # 2 warmup runs
+            t0 = time.perf_counter()
+            model(im)
+            t.append(time.perf_counter() - t0)
+    return float(np.median(t[2:]) * 1e3)
+
+
+def prune(
+    model,
+    flops=0.5,
+    latency=None,
+    method="bn",
+    data=None,
+    imgsz=640,
+    step=0.05,
+    batches=8,
+    batch=8,
+    min_channels=8,
+    round_to=8,
+    verbose=True,
+):
+    """
+    Prune a detection model's channels in place until it meets a FLOPs and optionally a latency budget.
+
+    Every round scores all prunable channels, removes the `step` fraction ranked lowest across all groups with each
+    group's scores normalized by their mean, and re-measures the model. The pruned model is flagged `pruned`, so the
+    DetectionTrainer fine-tunes it as is instead of rebuilding it from its YAML, and it saves and loads like any other
+    checkpoint.
+
+    Args:
+        model (DetectionModel): Unfused detection model, pruned in place.
+        flops (float): Target GFLOPs as a fraction of the model's GFLOPs. Defaults to 0.5.
+        latency (float, optional): Target CPU/GPU latency in ms of the fused model on one image, measured on the
+            model's device. Defaults to None, i.e. FLOPs only.
+        method (str): Channel importance, 'bn' for BatchNorm scale or 'taylor' for first-order Taylor. Defaults to 'bn'.
+        data (str, optional): Dataset YAML for 'taylor' importance. Defaults to None, i.e. 'coco128.yaml'.
+        imgsz (int): Image size for FLOPs, latency and Taylor batches. Defaults to 640.
+        step (float): Fraction of the remaining prunable channels removed per round. Defaults to 0.05.
+        batches (int): Number of Taylor batches per round. Defaults to 8.
+        batch (int): Taylor batch size. Defaults to 8.
+        min_channels (int): Minimum channels kept per group. Defaults to 8.
+        round_to (int): Kept channels are rounded up to a multiple of this for groups that are multiples of it.
+            Defaults to 8.
+        verbose (bool): Log a per-round and a per-group summary. Defaults to True.
+
+    Returns:
+        (dict): GFLOPs, parameters and latency in ms before and after pruning, and kept/original channels per group.
+
+    Raises:
+        TypeError: If the model has fused Conv blocks or nothing can be pruned.
+    """
+    model = de_parallel(model)
+    if not any(_is_plain(m) for m in model.modules()):
+        raise TypeError(f"{PREFIX}model has no unfused Conv blocks, prune the model before fusing it.")
+    widths = {g.name: g.channels for g in dependency_groups(model)}
+    if not widths:
+        raise TypeError(f"{PREFIX}no prunable channels found in {type(model).__name__}.")
+    loader = _loader(model, data, imgsz, batch) if method == "taylor" else None
+    t = get_latency(model, imgsz) if latency else None
+    f0, p0 = get_gflops(model, imgsz), sum(p.numel() for p in model.parameters())
+    stats = {"gflops": [f0, f0], "params": [p0, p0], "latency": [t, t]}
+    if verbose:
+        t_str = f", {t:.1f} ms" if t else ""
+        LOGGER.info(f"{PREFIX}pruning {len(widths)} groups with '{method}' importance, {f0:.2f} GFLOPs{t_str}")
+
+    f, r, ratio = f0, 0, step
+    while f > flops * f0 or (latency and t > latency):
+        groups = dependency_groups(model)
+        scores = importance(model, groups, method, loader, batches)
+        keep = _select(groups, scores, ratio, min_channels, round_to)
+        if all(len(k) == g.channels for g, k in zip(groups, keep)):  # rounding kept every group, prune more
+            if ratio == 1:
+                LOGGER.warning(f"{PREFIX}WARNING ⚠️ stopped at {f:.2f} GFLOPs, all groups are at their minimum width.")
+                break
+            ratio = min(2 * ratio, 1)
+            continue
+        prune_groups(groups, keep)
+        ratio = step
+        f, r = get_gflops(model, imgsz), r + 1
+        t = get_latency(model, imgsz) if latency else None
+        if verbose:
+            t_str = f", {t:.1f} ms" if t else ""
+            LOGGER.info(f"{PREFIX}round {r}: {f:.2f} GFLOPs ({f / f0:.0%}){t_str}")
+
+    model.pruned = True
+    stats["gflops"][1], stats["params"][1], stats["latency"][1] = f, sum(p.numel() for p in model.parameters()), t
+    stats["channels"] = {g.name: (g.channels, widths[g.name]) for g in dependency_groups(model)}
+    if verbose:
+        LOGGER.info(
+            f"{PREFIX}{r} rounds, GFLOPs {f0:.2f} → {f:.2f}, parameters {p0:,} → {stats['params'][1]:,}"
+            + (f", latency {stats['latency'][0]:.1f} → {t:.1f} ms" if t else "")
+        )
+        LOGGER.info(
+            "\n".join(f"  {k:<20} {c:>5}/{c0:<5}" for k, (c, c0) in stats["channels"].items() if c != c0)
+        )
+    return stats
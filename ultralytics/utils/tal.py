@@ -8,6 +8,7 @@ from .metrics import bbox_iou, probiou, wasserstein_loss
 from .ops import xywhr2xyxyxyxy
 
 TORCH_1_10 = check_version(torch.__version__, "1.10.0")
+TORCH_1_12 = check_version(torch.__version__, "1.12.0")
 
 
 class TaskAlignedAssigner(nn.Module):
@@ -23,9 +24,10 @@ class TaskAlignedAssigner(nn.Module):
         alpha (float): The alpha parameter for the classification component of the task-aligned metric.
         beta (float): The beta parameter for the localization component of the task-aligned metric.
         eps (float): A small value to prevent division by zero.
+        chunk (int): Number of ground truths per chunk in the sparse mode, 0 to use the dense mode.
     """
 
-    def __init__(self, topk=13, num_classes=80, alpha=1.0, beta=6.0, eps=1e-9):
+    def __init__(self, topk=13, num_classes=80, alpha=1.0, beta=6.0, eps=1e-9, chunk=0):
         """Initialize a TaskAlignedAssigner object with customizable hyperparameters."""
         super().__init__()
         self.topk = topk
@@ -34,6 +36,7 @@ class TaskAlignedAssigner(nn.Module):
         self.alpha = alpha
         self.beta = beta
         self.eps = eps
+        self.chunk = chunk
 
     @torch.no_grad()
     def forward(self, pd_scores, pd_bboxes, anc_points, gt_labels, gt_bboxes, mask_gt):
@@ -69,6 +72,14 @@ class TaskAlignedAssigner(nn.Module):
                 torch.zeros_like(pd_scores[..., 0]).to(device),
             )
 
+        if self.chunk > 0 and TORCH_1_12:
+            target_gt_idx, fg_mask, norm_align_metric = self.sparse_assign(
+                pd_scores, pd_bboxes, anc_points, gt_labels, gt_bboxes, mask_gt
+            )
+            target_labels, target_bboxes, target_scores = self.get_targets(gt_labels, gt_bboxes, target_gt_idx, fg_mask)
+            target_scores = target_scores * norm_align_metric
+            return target_labels, target_bboxes, target_scores, fg_mask.bool(), target_gt_idx
+
         mask_pos, align_metric, overlaps = self.get_pos_mask(
             pd_scores, pd_bboxes, gt_labels, gt_bboxes, anc_points, mask_gt
         )
@@ -87,6 +98,85 @@ class TaskAlignedAssigner(nn.Module):
 
         return target_labels, target_bboxes, target_scores, fg_mask.bool(), target_gt_idx
 
+    def sparse_assign(self, pd_scores, pd_bboxes, anc_points, gt_labels, gt_bboxes, mask_gt):
+        """
+        Memory-bounded task-aligned assignment producing the same targets as the dense path.
+
+        Only valid ground truths are processed, in chunks of self.chunk. Box metrics are computed for the anchors inside
+        each ground truth only and kept as a flat list of (gt, anchor) pairs, so no (b, max_num_obj, h*w) tensor is
+        allocated. Ties are resolved like the dense path: an anchor claimed by several ground truths goes to the one
+        with the highest overlap, the lowest index on equal overlaps.
+
+        Args:
+            pd_scores (Tensor): shape(bs, num_total_anchors, num_classes)
+            pd_bboxes (Tensor): shape(bs, num_total_anchors, 4)
+            anc_points (Tensor): shape(num_total_anchors, 2)
+            gt_labels (Tensor): shape(bs, n_max_boxes, 1)
+            gt_bboxes (Tensor): shape(bs, n_max_boxes, 4)
+            mask_gt (Tensor): shape(bs, n_max_boxes, 1)
+
+        Returns:
+            target_gt_idx (Tensor): shape(bs, num_total_anchors)
+            fg_mask (Tensor): shape(bs, num_total_anchors)
+            norm_align_metric (Tensor): shape(bs, num_total_anchors, 1)
+        """
+        na, nb, device = pd_bboxes.shape[-2], self.n_max_boxes, pd_bboxes.device
+        target_gt_idx = torch.zeros(self.bs * na, dtype=torch.long, device=device)
+        fg_mask = torch.zeros(self.bs * na, dtype=pd_scores.dtype, device=device)
+        norm_align_metric = torch.zeros(self.bs * na, dtype=pd_scores.dtype, device=device)
+        valid = mask_gt.view(-1).nonzero().squeeze(1)  # flat indices of valid gts
+        if not len(valid):
+            return target_gt_idx.view(self.bs, na), fg_mask.view(self.bs, na), norm_align_metric.view(self.bs, na, 1)
+
+        boxes, labels = gt_bboxes.view(-1, gt_bboxes.shape[-1]), gt_labels.view(-1).long()
+        gts, anchors, overlaps, metrics, pos = [], [], [], [], []
+        for c in valid.split(self.chunk):
+            b = c // nb
+            mask_in_gts = self.select_candidates_in_gts(anc_points, boxes[c][None])[0].bool()  # (chunk, h*w)
+            g, a = mask_in_gts.nonzero().unbind(1)
+
+            # Chunk-sized rows of the dense path for the metric and top-k
+            overlap = torch.zeros(mask_in_gts.shape, dtype=pd_bboxes.dtype, device=device)
+            bbox_scores = torch.zeros(mask_in_gts.shape, dtype=pd_scores.dtype, device=device)
+            overlap[g, a] = self.iou_calculation(boxes[c[g]], pd_bboxes[b[g], a])
+            bbox_scores[g, a] = pd_scores[b[g], a, labels[c[g]]]
+            align_metric = bbox_scores.pow(self.alpha) * overlap.pow(self.beta)
+            topk_idxs = torch.topk(align_metric, self.topk, dim=-1)[1]
+            mask_topk = torch.zeros_like(mask_in_gts).scatter_(-1, topk_idxs, True)
+
+            gts.append(c[g])
+            anchors.append(b[g] * na + a)  # flat anchor index
+            overlaps.append(overlap[g, a])
+            metrics.append(align_metric[g, a])
+            pos.append(mask_topk[g, a])
+        gts, anchors, overlaps, metrics, pos = (torch.cat(x) for x in (gts, anchors, overlaps, metrics, pos))
+
+        # Anchors assigned to multiple gts take the gt with the highest overlap among all gts containing them
+        count = torch.zeros(self.bs * na, dtype=torch.long, device=device).index_add_(
+            0, anchors[pos], torch.ones_like(anchors[pos])
+        )
+        multi = count[anchors] > 1
+        single = pos & ~multi
+        i = multi.nonzero().squeeze(1)
+        i = i[torch.argsort(gts[i], stable=True)]  # lowest gt first on equal overlaps
+        i = i[torch.argsort(overlaps[i], descending=True, stable=True)]
+        i = i[torch.argsort(anchors[i], stable=True)]
+        i = i[torch.cat((torch.ones_like(i[:1], dtype=torch.bool), anchors[i[1:]] != anchors[i[:-1]]))]  # best pair
+        best_gts = torch.where(overlaps[i] > 0, gts[i], gts[i] - gts[i] % nb)  # argmax of all-zero overlaps is 0
+
+        gts = torch.cat((gts[single], best_gts))
+        anchors, overlaps, metrics = (torch.cat((x[single], x[i])) for x in (anchors, overlaps, metrics))
+        target_gt_idx[anchors] = gts % nb
+        fg_mask[anchors] = 1
+
+        # Normalize
+        pos_align_metrics = torch.zeros(self.bs * nb, dtype=metrics.dtype, device=device)
+        pos_align_metrics.scatter_reduce_(0, gts, metrics, "amax")
+        pos_overlaps = torch.zeros(self.bs * nb, dtype=overlaps.dtype, device=device)
+        pos_overlaps.scatter_reduce_(0, gts, overlaps, "amax")
+        norm_align_metric[anchors] = metrics * pos_overlaps[gts] / (pos_align_metrics[gts] + self.eps)
+        return target_gt_idx.view(self.bs, na), fg_mask.view(self.bs, na), norm_align_metric.view(self.bs, na, 1)
+
     def get_pos_mask(self, pd_scores, pd_bboxes, gt_labels, gt_bboxes, anc_points, mask_gt):
         """Get in_gts mask, (b, max_num_obj, h*w)."""
         mask_in_gts = self.select_candidates_in_gts(anc_points, gt_bboxes)